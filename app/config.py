@@ -1,6 +1,7 @@
 
 
 import os
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,6 +14,18 @@ AWS_BUCKET_NAME = os.getenv("AWS_BUCKET_NAME")
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
+# Shared rate-limit counters; falls back to bounded per-process memory when unset.
+REDIS_URL = os.getenv("REDIS_URL")
+RATE_LIMIT_STORAGE_URI = REDIS_URL or "bounded-memory://"
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# Level for the sqlalchemy.engine logger (e.g. INFO logs every statement); unset = silent.
+SQLALCHEMY_LOG_LEVEL = os.getenv("SQLALCHEMY_LOG_LEVEL")
+
+# Set to 1 when DATABASE_URL points at PgBouncer in transaction mode; asyncpg's
+# prepared-statement caches must be off because statements can land on any server connection.
+DATABASE_PGBOUNCER = os.getenv("DATABASE_PGBOUNCER") == "1"
+
 
 FORUM_MEDIA_CDN_BASE = os.getenv(
     "FORUM_MEDIA_CDN_BASE",
@@ -28,17 +41,12 @@ FORUM_IMAGE_MAX_H = int(os.getenv("FORUM_IMAGE_MAX_H", "1024"))
 FORUM_GIF_MAX_W   = int(os.getenv("FORUM_GIF_MAX_W", "512"))
 FORUM_GIF_MAX_H   = int(os.getenv("FORUM_GIF_MAX_H", "512"))
 
-FORUM_ALLOWED_IMG_HOSTS = {
+FORUM_CDN_NETLOC = urlparse(FORUM_MEDIA_CDN_BASE).netloc.lower()
+
+FORUM_ALLOWED_IMG_HOSTS = frozenset(
     h.strip().lower()
     for h in os.getenv("FORUM_ALLOWED_IMG_HOSTS", "").split(",")
     if h.strip()
-}
-# Fallback: derive host from CDN base
-if not FORUM_ALLOWED_IMG_HOSTS:
-    from urllib.parse import urlparse
-    try:
-        FORUM_ALLOWED_IMG_HOSTS = {urlparse(FORUM_MEDIA_CDN_BASE).netloc.lower()}
-    except Exception:
-        FORUM_ALLOWED_IMG_HOSTS = set()
+) or frozenset({FORUM_CDN_NETLOC})  # Fallback: derive host from CDN base
 
 FORUM_MEDIA_UPLOAD_RATE = os.getenv("FORUM_MEDIA_UPLOAD_RATE", "5/minute;60/day")
\ No newline at end of file
@@ -1,16 +1,70 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import DATABASE_URL
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import DeclarativeBase
+from app.config import DATABASE_PGBOUNCER, DATABASE_URL, SQLALCHEMY_LOG_LEVEL
 from typing import AsyncGenerator
 
+POOL_SIZE = 20
+POOL_MAX_OVERFLOW = 10
+# Warn once when this share of the pool is checked out, again after it drains below it.
+POOL_WARN_RATIO = 0.8
+
 engine = create_async_engine(
     DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
-    echo=True,
-    future=True
+    echo=False,
+    pool_size=POOL_SIZE,
+    max_overflow=POOL_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    # Fail fast with a pool error instead of queueing requests behind a burst.
+    pool_timeout=5,
+    pool_recycle=1800,
+    connect_args=(
+        {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        if DATABASE_PGBOUNCER
+        else {}
+    ),
 )
 
-AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-Base = declarative_base()
+# Statement logging goes through the logger level instead of echo, so it costs nothing when unset.
+if SQLALCHEMY_LOG_LEVEL:
+    logging.basicConfig()
+    logging.getLogger("sqlalchemy.engine").setLevel(SQLALCHEMY_LOG_LEVEL.upper())
+
+logger = logging.getLogger(__name__)
+_pool_warn_at = max(1, int((POOL_SIZE + POOL_MAX_OVERFLOW) * POOL_WARN_RATIO))
+_pool_pressure = {"warned": False}
+
+
+def _check_pool_pressure(checked_out: int) -> None:
+    if checked_out >= _pool_warn_at and not _pool_pressure["warned"]:
+        _pool_pressure["warned"] = True
+        logger.warning(
+            "DB pool at %d/%d connections checked out; requests will fail after pool_timeout",
+            checked_out,
+            POOL_SIZE + POOL_MAX_OVERFLOW,
+        )
+    elif checked_out < _pool_warn_at:
+        _pool_pressure["warned"] = False
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_checkout(*_args) -> None:
+    _check_pool_pressure(engine.pool.checkedout())
+
+
+@event.listens_for(engine.sync_engine, "checkin")
+def _on_checkin(*_args) -> None:
+    _check_pool_pressure(engine.pool.checkedout())
+
+
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+
+class Base(DeclarativeBase):
+    pass
+
 
 # Dependency for FastAPI routes
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
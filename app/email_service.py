@@ -1,20 +1,32 @@
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from dotenv import load_dotenv
 
-load_dotenv()
+# Resolved lazily on first send so importing the app doesn't pay for dotenv/SMTP setup.
+_smtp_settings: dict = {}
 
-SMTP_HOST = os.getenv("SMTP_HOST")
-SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
-SMTP_USERNAME = os.getenv("SMTP_USERNAME")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-FROM_EMAIL = os.getenv("FROM_EMAIL")
 
+def _get_smtp_settings() -> dict:
+    if not _smtp_settings:
+        from dotenv import load_dotenv
 
-def send_verification_email(to_email: str, token: str):
-    verify_url = f"https://www.toonranks.com/verify-email?token={token}"
+        load_dotenv()
+        _smtp_settings.update(
+            host=os.getenv("SMTP_HOST"),
+            port=int(os.getenv("SMTP_PORT", 587)),
+            username=os.getenv("SMTP_USERNAME"),
+            password=os.getenv("SMTP_PASSWORD"),
+            from_email=os.getenv("FROM_EMAIL"),
+        )
+    return _smtp_settings
+
+
+async def send_verification_email(to_email: str, token: str):
+    import aiosmtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+
+    settings = _get_smtp_settings()
+
+    verify_url = f"https://www.toonranks.com/verify-email?token={token}"
     subject = "Toon Ranks --> Verify your email address"
     text = f"""
     Hi Ranker,
@@ -27,16 +39,20 @@ def send_verification_email(to_email: str, token: str):
     """
 
     msg = MIMEMultipart()
-    msg["From"] = FROM_EMAIL
+    msg["From"] = settings["from_email"]
     msg["To"] = to_email
     msg["Subject"] = subject
     msg.attach(MIMEText(text, "plain"))
 
     try:
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
-            server.sendmail(FROM_EMAIL, to_email, msg.as_string())
+        await aiosmtplib.send(
+            msg,
+            hostname=settings["host"],
+            port=settings["port"],
+            username=settings["username"],
+            password=settings["password"],
+            start_tls=True,
+        )
     except Exception as e:
         print("SMTP send failed:", e)
         raise
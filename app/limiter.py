@@ -1,4 +1,44 @@
+from limits.storage import MemoryStorage
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-limiter = Limiter(key_func=get_remote_address)
+from app.config import RATE_LIMIT_MAX_KEYS, RATE_LIMIT_STORAGE_URI
+
+
+class BoundedMemoryStorage(MemoryStorage):
+    """
+    In-process limit storage with a hard cap on tracked keys.
+
+    MemoryStorage already drops keys once their window expires; the cap keeps
+    memory flat when a burst of distinct IPs lands inside one window.
+    The oldest keys are evicted first.
+    """
+
+    STORAGE_SCHEME = ["bounded-memory"]
+
+    def __init__(self, uri=None, wrap_exceptions=False, max_keys=RATE_LIMIT_MAX_KEYS, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        # at least one slot, otherwise incr would evict forever on an empty store
+        self.max_keys = max(1, int(max_keys))
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        if key not in self.storage:
+            while len(self.storage) >= self.max_keys:
+                try:
+                    oldest = next(iter(self.storage))
+                except (StopIteration, RuntimeError):
+                    # emptied or mutated by the expiry thread; re-check the size
+                    continue
+                self.clear(oldest)
+        return super().incr(key, expiry, amount)
+
+
+# Counters live in Redis when REDIS_URL is set so every worker shares them;
+# the sliding-window counter keeps two integers per key and has no window-edge burst.
+# If Redis is unreachable, limits fall back to per-process memory instead of failing requests.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy="sliding-window-counter",
+    in_memory_fallback_enabled=True,
+)
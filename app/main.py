@@ -1,29 +1,39 @@
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-import asyncio
-
+import os
+from contextlib import asynccontextmanager
 
-from sqlalchemy import text
+from fastapi import FastAPI, Request
+from sqlalchemy.orm import configure_mappers
 
 from app.routes import series_routes, auth, series_detail, reading_list_routes, issues_routes, forum_routes, \
     forum_media_routes
 
-from fastapi.responses import RedirectResponse, JSONResponse
-from app.routes import series_routes, auth, series_detail
+from fastapi.responses import JSONResponse, ORJSONResponse
 
-from app.database import Base, engine
+from app.middleware import EdgeMiddleware
+from app.migrations import run_migrations
 
 # 🔒 Rate limiting setup
 
 from app.limiter import limiter
 from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+from slowapi.middleware import SlowAPIASGIMiddleware
 from app.routes import sitemap
 
-app = FastAPI(title="Toon Ranks API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resolve all mapper relationships once at boot instead of on the first query.
+    configure_mappers()
+    # Schema DDL is a deploy step; regular workers skip it unless RUN_MIGRATIONS=1.
+    if os.getenv("RUN_MIGRATIONS") == "1":
+        await run_migrations()
+    yield
+
+
+# orjson renders response bodies (datetimes included) in C
+app = FastAPI(title="Toon Ranks API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.state.limiter = limiter
-app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(SlowAPIASGIMiddleware)
 
 @app.get("/health", tags=["health"])
 async def health_check():
@@ -36,33 +46,15 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
         content={"detail": "Too many requests. Please slow down."}
     )
 
-# Redirect bare toonranks.com -> www.toonranks.com for canonical consistency.
-@app.middleware("http")
-async def redirect_www(request: Request, call_next):
-    host = request.headers.get("host", "")
-    path = request.url.path
-
-    # Do NOT redirect sitemap endpoints (let Amplify proxy succeed)
-    if path.startswith("/sitemap") or path.startswith("/sitemaps/"):
-        return await call_next(request)
-
-    if host == "toonranks.com":
-        new_url = request.url.replace(netloc="www.toonranks.com")
-        return RedirectResponse(str(new_url), status_code=301)
-    return await call_next(request)
-
-# ✅ Enable CORS
+# Single pure-ASGI layer for CORS + bare-domain -> www redirect.
 app.add_middleware(
-    CORSMiddleware,
+    EdgeMiddleware,
     allow_origins=[
         "http://localhost:5173",
         "http://127.0.0.1:5173",
         "https://toonranks.com",
         "https://www.toonranks.com",
     ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
 )
 
 # ✅ Include your routers
@@ -75,72 +67,3 @@ app.include_router(forum_routes.router)
 app.include_router(sitemap.router)
 app.include_router(forum_media_routes.router)
 
-# ✅ Run DB init on startup
-@app.on_event("startup")
-async def on_startup():
-    # Tiny retry so a momentary DB disconnect doesn't crash the app.
-    for attempt in range(2):
-        try:
-            async with engine.begin() as conn:
-                # Ensure schema exists
-                await conn.execute(text('CREATE SCHEMA IF NOT EXISTS "man_review";'))
-                await conn.run_sync(Base.metadata.create_all)
-                await conn.execute(
-                    text(
-                        """
-                        ALTER TABLE IF EXISTS man_review.reading_list_items
-                        ADD COLUMN IF NOT EXISTS left_off_chapter VARCHAR(50)
-                        """
-                    )
-                )
-                await conn.execute(
-                    text(
-                        """
-                        ALTER TABLE IF EXISTS man_review.series
-                        ADD COLUMN IF NOT EXISTS approval_status VARCHAR(20)
-                        """
-                    )
-                )
-                await conn.execute(
-                    text(
-                        """
-                        ALTER TABLE IF EXISTS man_review.series
-                        ADD COLUMN IF NOT EXISTS submitted_by_id INTEGER
-                        """
-                    )
-                )
-                await conn.execute(
-                    text(
-                        """
-                        ALTER TABLE IF EXISTS man_review.series
-                        ADD COLUMN IF NOT EXISTS approved_by_id INTEGER
-                        """
-                    )
-                )
-                await conn.execute(
-                    text(
-                        """
-                        ALTER TABLE IF EXISTS man_review.series
-                        ADD COLUMN IF NOT EXISTS approved_at VARCHAR(40)
-                        """
-                    )
-                )
-                await conn.execute(
-                    text(
-                        """
-                        UPDATE man_review.series
-                        SET approval_status = 'APPROVED'
-                        WHERE approval_status IS NULL
-                        """
-                    )
-                )
-            break  # success
-        except Exception as e:
-            if attempt == 0:
-                # Log + retry once after a short pause
-                print(f"[startup] DB init failed, retrying once: {e!r}")
-                await asyncio.sleep(0.5)
-            else:
-                # On the second failure, don't crash the app.
-                # Tables should already exist from previous runs.
-                print(f"[startup] Skipping DB init due to error: {e!r}")
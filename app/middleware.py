@@ -0,0 +1,141 @@
+# app/middleware.py
+from typing import Iterable, Optional
+
+CORS_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+CORS_MAX_AGE = b"600"
+# Custom response headers browser JS may read (keyset pagination cursors).
+CORS_EXPOSE_HEADERS = b"X-Next-Cursor"
+
+# Headers we own on CORS responses; any copy set by a route is replaced.
+_CORS_RESPONSE_HEADERS = {
+    b"access-control-allow-origin",
+    b"access-control-allow-credentials",
+    b"access-control-expose-headers",
+}
+
+
+class EdgeMiddleware:
+    """
+    One pure-ASGI pass for the edge concerns every request goes through:
+      - CORS: answer preflights directly, add allow-origin headers for allowed origins
+      - redirect bare toonranks.com -> www.toonranks.com (sitemaps excluded)
+
+    Request headers are scanned once; requests that need neither a redirect
+    nor CORS headers go straight to the app.
+    """
+
+    def __init__(
+        self,
+        app,
+        allow_origins: Iterable[str],
+        bare_host: str = "toonranks.com",
+        canonical_host: str = "www.toonranks.com",
+    ):
+        self.app = app
+        self.allow_origins = frozenset(o.encode("latin-1") for o in allow_origins)
+        self.bare_host = bare_host.encode("latin-1")
+        # Location prefixes built once; a redirect only appends path + query bytes.
+        self.location_prefixes = {
+            scheme: f"{scheme}://{canonical_host}".encode("latin-1")
+            for scheme in ("http", "https")
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        host = origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"host":
+                host = value
+            elif name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if scope["method"] == "OPTIONS" and origin is not None and request_method is not None:
+            return await self._preflight(origin, request_headers, send)
+
+        cors_headers = self._cors_headers(origin)
+
+        path = scope["path"]
+        # Do NOT redirect sitemap endpoints (let Amplify proxy succeed)
+        if host == self.bare_host and not (
+            path.startswith("/sitemap") or path.startswith("/sitemaps/")
+        ):
+            return await self._redirect_www(scope, cors_headers, send)
+
+        if not cors_headers:
+            return await self.app(scope, receive, send)
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                headers = []
+                vary = None
+                for name, value in message.get("headers", ()):
+                    if name in _CORS_RESPONSE_HEADERS:
+                        continue
+                    if name == b"vary":
+                        vary = value
+                        continue
+                    headers.append((name, value))
+                headers.extend(cors_headers)
+                headers.append((b"access-control-expose-headers", CORS_EXPOSE_HEADERS))
+                headers.append((b"vary", vary + b", Origin" if vary else b"Origin"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    def _cors_headers(self, origin: Optional[bytes]) -> list:
+        if origin is None or origin not in self.allow_origins:
+            return []
+        return [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+        ]
+
+    async def _preflight(self, origin: bytes, request_headers: Optional[bytes], send) -> None:
+        if origin not in self.allow_origins:
+            body = b"Disallowed CORS origin"
+            await send({
+                "type": "http.response.start",
+                "status": 400,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"vary", b"Origin"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        headers = self._cors_headers(origin) + [
+            (b"access-control-allow-methods", CORS_ALLOW_METHODS),
+            (b"access-control-max-age", CORS_MAX_AGE),
+            (b"vary", b"Origin"),
+        ]
+        if request_headers:
+            headers.append((b"access-control-allow-headers", request_headers))
+        await send({"type": "http.response.start", "status": 204, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _redirect_www(self, scope, cors_headers: list, send) -> None:
+        scheme = scope.get("scheme", "http")
+        prefix = self.location_prefixes.get(scheme) or self.location_prefixes["http"]
+        location = prefix + (scope.get("raw_path") or scope["path"].encode("utf-8"))
+        query = scope.get("query_string")
+        if query:
+            location += b"?" + query
+        await send({
+            "type": "http.response.start",
+            "status": 301,
+            "headers": [
+                (b"location", location),
+                (b"content-length", b"0"),
+                *cors_headers,
+            ],
+        })
+        await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,305 @@
+# app/migrations.py
+"""
+Idempotent schema setup: CREATE SCHEMA, create_all, then additive ALTERs.
+
+Normal workers don't run this; it only runs from the app lifespan when
+RUN_MIGRATIONS=1, or once per deploy as a one-shot job:
+
+    python -m app.migrations
+
+Runs are serialized with a Postgres advisory lock and recorded in
+man_review.schema_versions, so a database already at SCHEMA_VERSION is
+skipped after one lookup. Bump SCHEMA_VERSION whenever the models or
+SCHEMA_STATEMENTS change.
+"""
+import asyncio
+
+from sqlalchemy import CheckConstraint, text
+
+from app.database import Base, engine
+
+# Import models so create_all sees every table when run standalone.
+from app.models import (  # noqa: F401
+    forum_media_model,
+    forum_model,
+    issue,
+    reading_list,
+    series_detail,
+    series_model,
+    user_model,
+    user_vote,
+)
+
+SCHEMA_VERSION = 13
+
+# Arbitrary app-wide key for pg_advisory_xact_lock.
+MIGRATION_LOCK_KEY = 7_305_001
+
+SCHEMA_VERSIONS_DDL = """
+CREATE TABLE IF NOT EXISTS man_review.schema_versions (
+    version INTEGER PRIMARY KEY,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+
+# Additive, re-runnable statements applied after create_all.
+SCHEMA_STATEMENTS = [
+    """
+    ALTER TABLE IF EXISTS man_review.reading_list_items
+    ADD COLUMN IF NOT EXISTS left_off_chapter VARCHAR(50)
+    """,
+    """
+    ALTER TABLE IF EXISTS man_review.series
+    ADD COLUMN IF NOT EXISTS approval_status VARCHAR(20)
+    """,
+    """
+    ALTER TABLE IF EXISTS man_review.series
+    ADD COLUMN IF NOT EXISTS submitted_by_id INTEGER
+    """,
+    """
+    ALTER TABLE IF EXISTS man_review.series
+    ADD COLUMN IF NOT EXISTS approved_by_id INTEGER
+    """,
+    """
+    ALTER TABLE IF EXISTS man_review.series
+    ADD COLUMN IF NOT EXISTS approved_at VARCHAR(40)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_forum_threads_updated_id
+    ON man_review.forum_threads (updated_at, id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_forum_threads_last_post_id
+    ON man_review.forum_threads (last_post_at, id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_forum_posts_thread_created_id
+    ON man_review.forum_posts (thread_id, created_at, id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_forum_posts_thread_parent_created_id
+    ON man_review.forum_posts (thread_id, parent_id, created_at, id)
+    """,
+    # superseded by the *_created_id indexes above, which also cover the keyset tiebreak
+    "DROP INDEX IF EXISTS man_review.ix_forum_posts_thread_created",
+    "DROP INDEX IF EXISTS man_review.ix_forum_posts_thread_parent_created",
+    """
+    CREATE INDEX IF NOT EXISTS ix_forum_series_refs_thread_header
+    ON man_review.forum_series_refs (thread_id)
+    WHERE post_id IS NULL
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_forum_media_thread_created
+    ON man_review.forum_media (thread_id, created_at)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_issues_created_id
+    ON man_review.issues (created_at, id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_user_votes_series_category_user
+    ON man_review.user_votes (series_id, category, user_id) INCLUDE (score)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_users_email_lower
+    ON man_review.users (lower(email))
+    """,
+    """
+    UPDATE man_review.series
+    SET approval_status = 'APPROVED'
+    WHERE approval_status IS NULL
+    """,
+    """
+    ALTER TABLE IF EXISTS man_review.users
+    ADD COLUMN IF NOT EXISTS thread_count INTEGER NOT NULL DEFAULT 0
+    """,
+    """
+    UPDATE man_review.users u
+    SET thread_count = c.n
+    FROM (
+        SELECT author_id, count(*) AS n
+        FROM man_review.forum_threads
+        WHERE author_id IS NOT NULL
+        GROUP BY author_id
+    ) c
+    WHERE c.author_id = u.id AND u.thread_count <> c.n
+    """,
+    """
+    UPDATE man_review.forum_posts p
+    SET heart_count = coalesce(c.n, 0)
+    FROM man_review.forum_posts p2
+    LEFT JOIN (
+        SELECT post_id, count(*) AS n
+        FROM man_review.forum_reactions
+        WHERE kind = 'HEART'
+        GROUP BY post_id
+    ) c ON c.post_id = p2.id
+    WHERE p2.id = p.id AND p.heart_count IS DISTINCT FROM coalesce(c.n, 0)
+    """,
+]
+
+# Tables whose primary key used to carry a redundant index=True (ix_man_review_<table>_id).
+PK_DUPLICATE_INDEX_TABLES = [
+    "forum_media",
+    "forum_posts",
+    "forum_series_refs",
+    "forum_threads",
+    "issues",
+    "reading_list_items",
+    "reading_lists",
+    "series",
+    "series_details",
+    "user_votes",
+    "users",
+]
+
+SCHEMA_STATEMENTS += [
+    f"DROP INDEX IF EXISTS man_review.ix_man_review_{table}_id"
+    for table in PK_DUPLICATE_INDEX_TABLES
+]
+
+# Columns that used to be native PG enums and are now VARCHAR + CHECK.
+ENUM_TO_VARCHAR_COLUMNS = [
+    ("series", "type"),
+    ("series", "status"),
+    ("issues", "type"),
+    ("issues", "status"),
+]
+
+
+def _enum_to_varchar_statements() -> list[str]:
+    return [
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = 'man_review' AND table_name = '{table}'
+                  AND column_name = '{column}' AND data_type = 'USER-DEFINED'
+            ) THEN
+                ALTER TABLE man_review.{table}
+                ALTER COLUMN {column} TYPE VARCHAR(16) USING {column}::text;
+            END IF;
+        END $$
+        """
+        for table, column in ENUM_TO_VARCHAR_COLUMNS
+    ]
+
+
+def _check_constraint_statements() -> list[str]:
+    # create_all only adds CHECKs to new tables; add any missing ones to existing tables.
+    statements = []
+    for table in Base.metadata.sorted_tables:
+        for constraint in table.constraints:
+            if not isinstance(constraint, CheckConstraint) or not constraint.name:
+                continue
+            statements.append(
+                f"""
+                DO $$
+                BEGIN
+                    IF NOT EXISTS (
+                        SELECT 1 FROM pg_constraint
+                        WHERE conname = '{constraint.name}'
+                          AND conrelid = '{table.fullname}'::regclass
+                    ) THEN
+                        ALTER TABLE {table.fullname}
+                        ADD CONSTRAINT {constraint.name} CHECK ({constraint.sqltext});
+                    END IF;
+                END $$
+                """
+            )
+    return statements
+
+
+# Columns searched with ILIKE '%q%'; a pg_trgm GIN index lets the planner skip the seq scan.
+TRIGRAM_INDEX_COLUMNS = [
+    ("forum_threads", "title"),
+    ("issues", "description"),
+    ("issues", "title"),
+    ("series", "title"),
+]
+
+
+def _trigram_index_statements() -> list[str]:
+    # Creating the extension needs privileges some hosts don't grant; without it,
+    # skip the indexes rather than fail the whole migration.
+    statements = [
+        """
+        DO $$
+        BEGIN
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        EXCEPTION WHEN insufficient_privilege THEN
+            RAISE NOTICE 'pg_trgm unavailable; skipping trigram indexes';
+        END $$
+        """
+    ]
+    for table, column in TRIGRAM_INDEX_COLUMNS:
+        statements.append(
+            f"""
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+                    CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm
+                    ON man_review.{table} USING gin ({column} gin_trgm_ops);
+                END IF;
+            END $$
+            """
+        )
+    return statements
+
+
+SCHEMA_STATEMENTS += (
+    _enum_to_varchar_statements()
+    + _check_constraint_statements()
+    + _trigram_index_statements()
+)
+
+
+async def apply_migrations(conn) -> bool:
+    """Run schema setup on an open transaction; returns False if already at SCHEMA_VERSION."""
+    # Concurrent runners queue here; the lock is released with the transaction.
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    await conn.execute(text('CREATE SCHEMA IF NOT EXISTS "man_review";'))
+    await conn.execute(text(SCHEMA_VERSIONS_DDL))
+
+    applied = await conn.scalar(
+        text("SELECT 1 FROM man_review.schema_versions WHERE version = :version"),
+        {"version": SCHEMA_VERSION},
+    )
+    if applied:
+        return False
+
+    await conn.run_sync(Base.metadata.create_all)
+    for stmt in SCHEMA_STATEMENTS:
+        await conn.execute(text(stmt))
+    await conn.execute(
+        text("INSERT INTO man_review.schema_versions (version) VALUES (:version)"),
+        {"version": SCHEMA_VERSION},
+    )
+    return True
+
+
+async def run_migrations(*, strict: bool = False) -> None:
+    # Tiny retry so a momentary DB disconnect doesn't crash the app.
+    # strict re-raises the final error so a deploy step can fail the release.
+    for attempt in range(2):
+        try:
+            async with engine.begin() as conn:
+                if not await apply_migrations(conn):
+                    print(f"[migrations] Schema already at version {SCHEMA_VERSION}")
+            break  # success
+        except Exception as e:
+            if attempt == 0:
+                # Log + retry once after a short pause
+                print(f"[migrations] DB init failed, retrying once: {e!r}")
+                await asyncio.sleep(0.5)
+            elif strict:
+                raise
+            else:
+                # On the second failure, don't crash the app.
+                # Tables should already exist from previous runs.
+                print(f"[migrations] Skipping DB init due to error: {e!r}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_migrations(strict=True))
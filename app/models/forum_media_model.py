@@ -1,8 +1,11 @@
 # app/models/forum_media_model.py
 from __future__ import annotations
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, func
-from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 from app.models.forum_model import ForumThread, ForumPost  # if you reference in relationships
 from app.models.user_model import User
@@ -11,38 +14,41 @@ SCHEMA = "man_review"
 
 class ForumMedia(Base):
     __tablename__ = "forum_media"
-    __table_args__ = ({"schema": SCHEMA},)
+    __table_args__ = (
+        Index("ix_forum_media_thread_created", "thread_id", "created_at"),
+        {"schema": SCHEMA},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
-    user_id = Column(
+    user_id: Mapped[Optional[int]] = mapped_column(
         Integer,
         ForeignKey(f"{SCHEMA}.users.id", ondelete="SET NULL"),
         nullable=True,
         index=True,
     )
-    thread_id = Column(
+    thread_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey(f"{SCHEMA}.forum_threads.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
-    post_id = Column(
+    post_id: Mapped[Optional[int]] = mapped_column(
         Integer,
         ForeignKey(f"{SCHEMA}.forum_posts.id", ondelete="SET NULL"),
         nullable=True,
         index=True,
     )
 
-    url = Column(Text, nullable=False)
-    mime_type = Column(String(64), nullable=False)
-    size_bytes = Column(Integer, nullable=False)
-    width = Column(Integer, nullable=True)
-    height = Column(Integer, nullable=True)
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    mime_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    width: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    height: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    # optional relationships
-    user = relationship("User", lazy="joined")
-    thread = relationship("ForumThread", lazy="joined")
-    post = relationship("ForumPost", lazy="joined")
+    # optional relationships; not loaded by default, opt in per query with selectinload()
+    user: Mapped[Optional[User]] = relationship("User", lazy="raise_on_sql")
+    thread: Mapped[ForumThread] = relationship("ForumThread", lazy="raise_on_sql")
+    post: Mapped[Optional[ForumPost]] = relationship("ForumPost", lazy="raise_on_sql")
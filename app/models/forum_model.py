@@ -1,6 +1,8 @@
 
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+
 from sqlalchemy import (
-    Column,
     Integer,
     String,
     Text,
@@ -8,98 +10,135 @@ from sqlalchemy import (
     ForeignKey,
     func,
     UniqueConstraint, Boolean,
-text
+text,
+    Index,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
+if TYPE_CHECKING:
+    from app.models.series_model import Series
+    from app.models.user_model import User
+
 SCHEMA = "man_review"
 
 class ForumThread(Base):
     __tablename__ = "forum_threads"
     __table_args__ = (
         # add any extra constraints here if needed
+        # /forum/threads: newest-updated first, keyset on (updated_at, id)
+        Index("ix_forum_threads_updated_id", "updated_at", "id"),
+        # /forum/threads-paged: latest activity first, keyset on (last_post_at, id)
+        Index("ix_forum_threads_last_post_id", "last_post_at", "id"),
         {"schema": SCHEMA},
     )
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(200), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    title: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
 
     # user is in man_review.users
-    author_id = Column(
+    author_id: Mapped[Optional[int]] = mapped_column(
         Integer,
         ForeignKey(f"{SCHEMA}.users.id", ondelete="SET NULL"),
         nullable=True,
         index=True,
     )
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # denormalized counters for faster thread list
-    post_count = Column(Integer, nullable=False, server_default="0")
-    last_post_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    locked = Column(Boolean, nullable=False, server_default=text("false"))
+    post_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_post_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("false"))
 
-    latest_first = Column(Boolean, nullable=False, server_default="false")
+    latest_first: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
 
     # relationships
-    posts = relationship(
+    posts: Mapped[List["ForumPost"]] = relationship(
         "ForumPost",
         back_populates="thread",
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
-    series_refs = relationship(
+    series_refs: Mapped[List["ForumSeriesRef"]] = relationship(
         "ForumSeriesRef",
         back_populates="thread",
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
 
+    # read-only views for serializing threads; opt in per query with joinedload()/selectinload()
+    author: Mapped[Optional["User"]] = relationship("User", lazy="raise_on_sql")
+    header_refs: Mapped[List["ForumSeriesRef"]] = relationship(
+        "ForumSeriesRef",
+        primaryjoin="and_(ForumThread.id == ForumSeriesRef.thread_id, ForumSeriesRef.post_id.is_(None))",
+        viewonly=True,
+        lazy="raise_on_sql",
+    )
+
 
 class ForumPost(Base):
     __tablename__ = "forum_posts"
-    __table_args__ = ({"schema": SCHEMA},)
+    __table_args__ = (
+        # thread pages: posts of a thread in (created_at, id) keyset order, optionally per parent
+        Index("ix_forum_posts_thread_created_id", "thread_id", "created_at", "id"),
+        Index("ix_forum_posts_thread_parent_created_id", "thread_id", "parent_id", "created_at", "id"),
+        {"schema": SCHEMA},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
-    thread_id = Column(
+    thread_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey(f"{SCHEMA}.forum_threads.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
-    author_id = Column(
+    author_id: Mapped[Optional[int]] = mapped_column(
         Integer,
         ForeignKey(f"{SCHEMA}.users.id", ondelete="SET NULL"),
         nullable=True,
         index=True,
     )
 
-    parent_id = Column(
+    parent_id: Mapped[Optional[int]] = mapped_column(
         Integer,
         ForeignKey(f"{SCHEMA}.forum_posts.id", ondelete="CASCADE"),
         nullable=True,
         index=True,
     )
 
-    content_markdown = Column(Text, nullable=False)
+    content_markdown: Mapped[str] = mapped_column(Text, nullable=False)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
-    heart_count = Column(Integer, nullable=False, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    heart_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
 
     # relationships
-    thread = relationship("ForumThread", back_populates="posts")
-    series_refs = relationship(
+    thread: Mapped["ForumThread"] = relationship("ForumThread", back_populates="posts")
+    author: Mapped[Optional["User"]] = relationship("User", lazy="raise_on_sql")
+    series_refs: Mapped[List["ForumSeriesRef"]] = relationship(
         "ForumSeriesRef",
         back_populates="post",
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
 
-    parent = relationship("ForumPost", remote_side=[id], backref="replies")
+    # replies are removed by the DB (ON DELETE CASCADE); passive_deletes keeps the ORM
+    # from loading them and nulling parent_id first.
+    parent: Mapped[Optional["ForumPost"]] = relationship(
+        "ForumPost",
+        remote_side="ForumPost.id",
+        foreign_keys="ForumPost.parent_id",
+        back_populates="replies",
+    )
+    replies: Mapped[List["ForumPost"]] = relationship(
+        "ForumPost",
+        back_populates="parent",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
 
 class ForumSeriesRef(Base):
@@ -107,12 +146,18 @@ class ForumSeriesRef(Base):
     __table_args__ = (
         # Optional: prevent duplicate (thread_id, post_id, series_id) triples
         # UniqueConstraint("thread_id", "post_id", "series_id", name="uq_forum_series_ref"),
+        # thread header refs (post_id IS NULL), loaded with every thread
+        Index(
+            "ix_forum_series_refs_thread_header",
+            "thread_id",
+            postgresql_where=text("post_id IS NULL"),
+        ),
         {"schema": SCHEMA},
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
-    thread_id = Column(
+    thread_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey(f"{SCHEMA}.forum_threads.id", ondelete="CASCADE"),
         nullable=False,
@@ -120,7 +165,7 @@ class ForumSeriesRef(Base):
     )
 
     # Can be null when the reference is attached to the thread header (not a specific post)
-    post_id = Column(
+    post_id: Mapped[Optional[int]] = mapped_column(
         Integer,
         ForeignKey(f"{SCHEMA}.forum_posts.id", ondelete="CASCADE"),
         nullable=True,
@@ -128,7 +173,7 @@ class ForumSeriesRef(Base):
     )
 
     # Points to your Series table
-    series_id = Column(
+    series_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey(f"{SCHEMA}.series.id", ondelete="CASCADE"),
         nullable=False,
@@ -136,8 +181,9 @@ class ForumSeriesRef(Base):
     )
 
     # relationships
-    thread = relationship("ForumThread", back_populates="series_refs")
-    post = relationship("ForumPost", back_populates="series_refs")
+    thread: Mapped["ForumThread"] = relationship("ForumThread", back_populates="series_refs")
+    post: Mapped[Optional["ForumPost"]] = relationship("ForumPost", back_populates="series_refs")
+    series: Mapped["Series"] = relationship("Series", lazy="raise_on_sql")
 
 
 class ForumReaction(Base):
@@ -147,19 +193,19 @@ class ForumReaction(Base):
         {"schema": SCHEMA},
     )
 
-    id = Column(Integer, primary_key=True)
-    post_id = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    post_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey(f"{SCHEMA}.forum_posts.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
-    user_id = Column(
+    user_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey(f"{SCHEMA}.users.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
     # single MVP reaction type ("HEART"), keep extensible
-    kind = Column(String(20), nullable=False, server_default="HEART")
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False, server_default="HEART")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,15 +1,19 @@
-from sqlalchemy import Column, Integer, String, Text, Enum as SqlEnum, DateTime, ForeignKey
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import CheckConstraint, Index, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
 
-class IssueType(enum.Enum):
+class IssueType(str, enum.Enum):
     BUG = "BUG"
     FEATURE = "FEATURE"
     CONTENT = "CONTENT"
     OTHER = "OTHER"
 
-class IssueStatus(enum.Enum):
+class IssueStatus(str, enum.Enum):
     OPEN = "OPEN"
     IN_PROGRESS = "IN_PROGRESS"
     FIXED = "FIXED"
@@ -17,23 +21,30 @@ class IssueStatus(enum.Enum):
 
 class Issue(Base):
     __tablename__ = "issues"
-    __table_args__ = {"schema": "man_review"}
+    __table_args__ = (
+        CheckConstraint(f"type IN ({', '.join(repr(t.value) for t in IssueType)})", name="ck_issues_type"),
+        CheckConstraint(f"status IN ({', '.join(repr(s.value) for s in IssueStatus)})", name="ck_issues_status"),
+        # keyset pagination for list_issues (newest first)
+        Index("ix_issues_created_id", "created_at", "id"),
+        {"schema": "man_review"},
+    )
+    # UPDATE ... RETURNING the onupdate updated_at, so responses don't need a refresh()
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(Integer, primary_key=True, index=True)
-    type = Column(SqlEnum(IssueType, name="issue_type", schema="man_review"), nullable=False)
-    title = Column(String(200), nullable=False)
-    description = Column(Text, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    type: Mapped[str] = mapped_column(String(16), nullable=False)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
 
-    page_url = Column(String(1024))
-    email = Column(String(320))
-    screenshot_url = Column(String(2048))
+    page_url: Mapped[Optional[str]] = mapped_column(String(1024))
+    email: Mapped[Optional[str]] = mapped_column(String(320))
+    screenshot_url: Mapped[Optional[str]] = mapped_column(String(2048))
 
     # we keep it nullable because anyone can report anonymously
-    user_id = Column(Integer, ForeignKey("man_review.users.id"), nullable=True)
-    user_agent = Column(String(512))
-
-    status = Column(SqlEnum(IssueStatus, name="issue_status", schema="man_review"), nullable=False,
-                    default=IssueStatus.OPEN)
-    admin_notes = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("man_review.users.id"), nullable=True)
+    user_agent: Mapped[Optional[str]] = mapped_column(String(512))
+
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default=IssueStatus.OPEN.value)
+    admin_notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
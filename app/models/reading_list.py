@@ -1,6 +1,9 @@
 # app/models/reading_list.py
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, Boolean, text
-from sqlalchemy.orm import relationship
+import uuid
+from typing import List, Optional
+
+from sqlalchemy import Integer, String, ForeignKey, UniqueConstraint, Boolean, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -11,25 +14,25 @@ class ReadingList(Base):
         {"schema": "man_review"},
     )
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("man_review.users.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
-    name = Column(String, nullable=False)
+    name: Mapped[str] = mapped_column(String, nullable=False)
 
-    is_public = Column(Boolean, nullable=False, server_default=text("false"))
+    is_public: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("false"))
 
-    share_token = Column(
+    share_token: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         unique=True,
         nullable=False,
         server_default=text("gen_random_uuid()")  # requires pgcrypto extension
     )
 
-    items = relationship(
+    items: Mapped[List["ReadingListItem"]] = relationship(
         "ReadingListItem",
         cascade="all, delete-orphan",
         back_populates="reading_list",
@@ -43,19 +46,19 @@ class ReadingListItem(Base):
         {"schema": "man_review"},
     )
 
-    id = Column(Integer, primary_key=True, index=True)
-    list_id = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    list_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("man_review.reading_lists.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
-    series_id = Column(
+    series_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("man_review.series.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
-    left_off_chapter = Column(String(50), nullable=True)
+    left_off_chapter: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
 
-    reading_list = relationship("ReadingList", back_populates="items")
+    reading_list: Mapped["ReadingList"] = relationship("ReadingList", back_populates="items")
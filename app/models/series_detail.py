@@ -1,30 +1,35 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
+if TYPE_CHECKING:
+    from app.models.series_model import Series
+
 class SeriesDetail(Base):
     __tablename__ = "series_details"
     __table_args__ = {"schema": "man_review"}
 
-    id = Column(Integer, primary_key=True, index=True)
-    series_id = Column(Integer, ForeignKey("man_review.series.id", ondelete="CASCADE"), unique=True)
-    synopsis = Column(String)
-    series_cover_url = Column(String)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    series_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("man_review.series.id", ondelete="CASCADE"), unique=True)
+    synopsis: Mapped[Optional[str]] = mapped_column(String)
+    series_cover_url: Mapped[Optional[str]] = mapped_column(String)
 
     # Ratings fields
-    story_total = Column(Integer, default=0)
-    story_count = Column(Integer, default=0)
+    story_total: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    story_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
 
-    characters_total = Column(Integer, default=0)
-    characters_count = Column(Integer, default=0)
+    characters_total: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    characters_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
 
-    worldbuilding_total = Column(Integer, default=0)
-    worldbuilding_count = Column(Integer, default=0)
+    worldbuilding_total: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    worldbuilding_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
 
-    art_total = Column(Integer, default=0)
-    art_count = Column(Integer, default=0)
+    art_total: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    art_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
 
-    drama_or_fight_total = Column(Integer, default=0)
-    drama_or_fight_count = Column(Integer, default=0)
+    drama_or_fight_total: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    drama_or_fight_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
 
-    series = relationship("Series", back_populates="detail")
+    series: Mapped["Series"] = relationship("Series", back_populates="detail")
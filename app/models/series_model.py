@@ -1,15 +1,20 @@
 
-from sqlalchemy import Column, Integer, String, Enum as SqlEnum
-from sqlalchemy.orm import relationship
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import CheckConstraint, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 import enum
+
+if TYPE_CHECKING:
+    from app.models.series_detail import SeriesDetail
 
-class SeriesType(enum.Enum):
+class SeriesType(str, enum.Enum):
     MANGA = "MANGA"
     MANHWA = "MANHWA"
     MANHUA = "MANHUA"
 
-class SeriesStatus(enum.Enum):
+class SeriesStatus(str, enum.Enum):
     ONGOING = "ONGOING"
     COMPLETE = "COMPLETE"
     HIATUS = "HIATUS"
@@ -23,33 +28,30 @@ class SeriesApprovalStatus(enum.Enum):
 
 class Series(Base):
     __tablename__ = 'series'
-    __table_args__ = {"schema": "man_review"}
+    __table_args__ = (
+        CheckConstraint(f"type IN ({', '.join(repr(t.value) for t in SeriesType)})", name="ck_series_type"),
+        CheckConstraint(f"status IN ({', '.join(repr(s.value) for s in SeriesStatus)})", name="ck_series_status"),
+        {"schema": "man_review"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, nullable=False)
-    genre = Column(String)
-    vote_count = Column(Integer, default=0)
-    cover_url = Column(String)
-    type = Column(SqlEnum(SeriesType), nullable=False)
-    author = Column(String)
-    artist = Column(String)
-    approval_status = Column(String, nullable=False, default=SeriesApprovalStatus.APPROVED.value)
-    submitted_by_id = Column(Integer, nullable=True)
-    approved_by_id = Column(Integer, nullable=True)
-    approved_at = Column(String, nullable=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    genre: Mapped[Optional[str]] = mapped_column(String)
+    vote_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    cover_url: Mapped[Optional[str]] = mapped_column(String)
+    # enum-like columns are plain strings; the CHECK constraints above keep them valid
+    type: Mapped[str] = mapped_column(String(16), nullable=False)
+    author: Mapped[Optional[str]] = mapped_column(String)
+    artist: Mapped[Optional[str]] = mapped_column(String)
+    approval_status: Mapped[str] = mapped_column(String, nullable=False, default=SeriesApprovalStatus.APPROVED.value)
+    submitted_by_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    approved_by_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    approved_at: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
-    status = Column(
-        SqlEnum(
-            SeriesStatus,
-            name="series_status",
-            schema="man_review",
-            create_type=False,  # don't try to create; we already created via SQL
-        ),
-        nullable=True,
-    )
+    status: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
 
     # Relationship to SeriesDetail
-    detail = relationship(
+    detail: Mapped[Optional["SeriesDetail"]] = relationship(
         "SeriesDetail",
         back_populates="series",
         uselist=False,
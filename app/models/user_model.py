@@ -1,20 +1,33 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
-from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+
+from sqlalchemy import Integer, String, Boolean, DateTime, Index, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
+if TYPE_CHECKING:
+    from app.models.reading_list import ReadingList
+
 class User(Base):
     __tablename__ = "users"
     __table_args__ = {"schema": "man_review"}
 
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String, unique=True, index=True, nullable=False)
-    password = Column(String, nullable=False)
-    role = Column(String, default="GENERAL")  # GENERAL, CONTRIBUTOR, or ADMIN
-    email = Column(String, unique=True, index=True, nullable=True)
-    is_verified = Column(Boolean, default=False, nullable=False, server_default="false")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    username: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
+    password: Mapped[str] = mapped_column(String, nullable=False)
+    role: Mapped[Optional[str]] = mapped_column(String, default="GENERAL")  # GENERAL, CONTRIBUTOR, or ADMIN
+    email: Mapped[Optional[str]] = mapped_column(String, unique=True, index=True, nullable=True)
+    is_verified: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, server_default="false")
+
+    registered_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # denormalized count of forum threads authored, kept in step by create/delete thread
+    thread_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    reading_lists: Mapped[List["ReadingList"]] = relationship("ReadingList", cascade="all, delete-orphan", backref="owner")
 
-    registered_at = Column(DateTime(timezone=True), nullable=True)
 
-    reading_lists = relationship("ReadingList", cascade="all, delete-orphan", backref="owner")
+# Email lookups compare lower(email); username already has its own unique index.
+Index("ix_users_email_lower", func.lower(User.email))
 
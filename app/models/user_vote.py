@@ -1,16 +1,27 @@
-from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint, String
+from typing import Optional
+
+from sqlalchemy import Index, Integer, ForeignKey, UniqueConstraint, String
+from sqlalchemy.orm import Mapped, mapped_column
 from app.database import Base
 
 class UserVote(Base):
     __tablename__ = "user_votes"
     __table_args__ = (
         UniqueConstraint("user_id", "series_id", "category", name="unique_user_vote"),
+        # series detail vote tallies group a series' votes by category; INCLUDE makes it index-only
+        Index(
+            "ix_user_votes_series_category_user",
+            "series_id",
+            "category",
+            "user_id",
+            postgresql_include=["score"],
+        ),
         {"schema": "man_review"},
     )
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("man_review.users.id"))
-    series_id = Column(Integer, ForeignKey("man_review.series.id"))
-    category = Column(String, nullable=False)  # ✅ New
-    score = Column(Integer, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("man_review.users.id"))
+    series_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("man_review.series.id"))
+    category: Mapped[str] = mapped_column(String, nullable=False)  # ✅ New
+    score: Mapped[int] = mapped_column(Integer, nullable=False)
 
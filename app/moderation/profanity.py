@@ -1,8 +1,11 @@
 # app/moderation/profanity.py
 from __future__ import annotations
 
+import hashlib
 import re
 
+from cachetools import LRUCache
+
 BAD_WORDS = {
     # keep lowercase; single tokens only here
     "ass",
@@ -12,21 +15,38 @@ BAD_WORDS = {
     # add more…
 }
 
-# \b isn't perfect with all unicode; this adds basic unicode letter/digit boundary support
-WORD = r"[^\W_]+"  # letters/digits (no underscore), unicode-aware with re.UNICODE
-BOUND = r"(?<!\w)|\b"  # fall back to \b; engines vary. You can use (?:^|(?<=\W)) as well.
+_BAD = frozenset(BAD_WORDS)
+
+# Whole \w-runs, so the blocklist hit boundaries match the old per-word regexes
+# ("Classic" or "shit_post" are single tokens and don't match).
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Edits and resubmits re-check the same text; a digest is ~25x cheaper than a scan.
+# The blocklist is fixed at import, so results never go stale.
+_results: LRUCache = LRUCache(maxsize=4096)
 
-_patterns = [
-    re.compile(rf"(?i)(?:^|(?<=\W))({re.escape(w)})(?=$|\W)", re.UNICODE)
-    for w in BAD_WORDS
-]
 
 def contains_profanity(text: str) -> str | None:
-    t = text or ""
-    for pat in _patterns:
-        m = pat.search(t)
-        if m:
-            return m.group(1)
+    text = text or ""
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    try:
+        return _results[key]
+    except KeyError:
+        pass
+    hit = _scan(text)
+    _results[key] = hit
+    return hit
+
+
+def _scan(text: str) -> str | None:
+    # Tokenize + set check entirely in C; nearly all text is clean and stops here.
+    if _BAD.isdisjoint(_TOKEN_RE.findall(text.lower())):
+        return None
+    # Slow path only on a hit: find the first offending token as written.
+    for m in _TOKEN_RE.finditer(text):
+        tok = m.group(0)
+        if tok.lower() in _BAD:
+            return tok
     return None
 
 def ensure_clean(text: str) -> None:
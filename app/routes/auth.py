@@ -1,6 +1,7 @@
-from fastapi import (APIRouter, Depends, HTTPException,
+from fastapi import (APIRouter, BackgroundTasks, Depends, HTTPException,
                      status, Query, Body)
-from sqlalchemy import func
+from sqlalchemy import exists, func, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import AsyncSessionLocal
 from app.email_service import send_verification_email
@@ -8,54 +9,75 @@ from app.limiter import limiter
 from app.models.user_model import User
 from app.schemas.user_schemas import UserCreate, UserOut, SignupResponse, UserLogin, ResendVerification, UserAdminOut, UserRoleUpdate
 from sqlalchemy.future import select
-from passlib.hash import bcrypt
 from fastapi.responses import JSONResponse
-from fastapi import Request
+from fastapi import Request, Response
 
 from app.utils.captcha import verify_captcha
-from app.utils.token_utils import create_access_token
+from app.utils.password_utils import hash_password, verify_password
+from app.utils.token_utils import create_access_token, forget_cached_viewer
 from app.utils.email_token_utils import verify_email_token, generate_email_token
-from google.oauth2 import id_token
-from google.auth.transport import requests
+from app.utils.google_id_token import verify_google_id_token
 from datetime import datetime, timezone
+from cachetools import TTLCache
+import hashlib
+import httpx
 import os
-import json
-from urllib.parse import urlencode
-from urllib.request import urlopen
 from jose import JWTError
 from app.deps.admin import require_admin
 
 router = APIRouter()
+
+# Verification links get re-fetched by mail scanners and repeat clicks; ETags of
+# links that already verified are remembered so those hits skip Postgres.
+VERIFY_EMAIL_CACHE_CONTROL = "private, max-age=60"
+_verified_email_links: TTLCache = TTLCache(maxsize=10_000, ttl=600)
 
+# AsyncSession checks a connection out of the pool on its first statement, not here,
+# so handlers that bail out before querying never hold a pool slot.
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
 
 
+async def _send_verification_email_in_background(email: str, token: str) -> None:
+    # Runs after the response is sent; send_verification_email already logs the failure,
+    # and the user can ask for another link via /resend-verification.
+    try:
+        await send_verification_email(email, token)
+    except Exception:
+        pass
+
+
 
 @router.post("/signup", response_model=SignupResponse)
 @limiter.limit("5/minute")
-async def signup(request: Request, user: UserCreate, db: AsyncSession = Depends(get_db)):
+async def signup(
+    request: Request,
+    user: UserCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
     await verify_captcha(user.captcha_token, request=request)
 
     username_norm = user.username.strip()
-    email_norm = str(user.email).strip().lower()
+    email_norm = user.email  # lowercased by UserCreate
 
-    # Check username OR email conflict in a single round-trip
+    # Two index-backed EXISTS probes in one round-trip; skips hashing for obvious conflicts
     result = await db.execute(
-        select(User).where(
-            (User.username == username_norm) | (func.lower(User.email) == email_norm)
+        select(
+            exists().where(func.lower(User.email) == email_norm).label("email_taken"),
+            exists().where(User.username == username_norm).label("username_taken"),
         )
     )
-    existing = result.scalars().all()
+    taken = result.one()
 
-    if any((u.email or "").strip().lower() == email_norm for u in existing):
+    if taken.email_taken:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already exists")
 
-    if any(u.username == username_norm for u in existing):
+    if taken.username_taken:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Username already exists")
 
-    hashed = bcrypt.hash(user.password)
+    hashed = await hash_password(user.password)
     new_user = User(
         username=username_norm,
         password=hashed,
@@ -64,16 +86,20 @@ async def signup(request: Request, user: UserCreate, db: AsyncSession = Depends(
         registered_at=datetime.now(timezone.utc),
     )
 
+    token = generate_email_token(email_norm)
     try:
         db.add(new_user)
-        await db.flush()  # Write to DB without committing yet
-        token = generate_email_token(email_norm)
-        send_verification_email(email_norm, token)
-        await db.commit()  # Commit only if email sending succeeded
-        await db.refresh(new_user)
+        await db.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent signup; the unique constraints decide
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Username or email already exists")
     except Exception:
         await db.rollback()
-        raise HTTPException(status_code=500, detail="Signup failed during email sending")
+        raise HTTPException(status_code=500, detail="Signup failed")
+
+    # Send after commit so the DB connection isn't held across the SMTP round-trip
+    background_tasks.add_task(_send_verification_email_in_background, email_norm, token)
 
     return SignupResponse(
         message="User created successfully. Please verify your email.",
@@ -122,13 +148,15 @@ async def google_oauth(payload: dict, db: AsyncSession = Depends(get_db)):
 
     try:
         google_client_id = (os.getenv("GOOGLE_CLIENT_ID") or "").strip()
-        id_info = id_token.verify_oauth2_token(token, requests.Request(), google_client_id)
+        id_info = await verify_google_id_token(token, google_client_id)
     except Exception as verify_err:
-        print(f"[google-oauth] verify_oauth2_token failed: {verify_err!r}")
+        print(f"[google-oauth] local ID token verification failed: {verify_err!r}")
         try:
-            qs = urlencode({"id_token": token})
-            with urlopen(f"https://oauth2.googleapis.com/tokeninfo?{qs}", timeout=10) as resp:
-                id_info = json.loads(resp.read().decode("utf-8"))
+            async with httpx.AsyncClient(timeout=10) as client:
+                resp = await client.get(
+                    "https://oauth2.googleapis.com/tokeninfo", params={"id_token": token}
+                )
+            id_info = resp.json()
 
             if id_info.get("aud") != google_client_id:
                 raise HTTPException(status_code=401, detail="Invalid Google token")
@@ -145,9 +173,11 @@ async def google_oauth(payload: dict, db: AsyncSession = Depends(get_db)):
         username = id_info.get("name", email.split("@")[0]).strip()
 
         result = await db.execute(
-            select(User).where(func.lower(User.email) == email)
+            select(User.id, User.username, User.role)
+            .where(func.lower(User.email) == email)
+            .limit(1)
         )
-        user = result.scalars().first()
+        user = result.first()
 
         if not user:
             user = User(
@@ -159,8 +189,8 @@ async def google_oauth(payload: dict, db: AsyncSession = Depends(get_db)):
                 registered_at=datetime.now(timezone.utc),
             )
             db.add(user)
+            # The INSERT returns the new id; expire_on_commit=False keeps the rest loaded
             await db.commit()
-            await db.refresh(user)
 
         access_token = create_access_token(user)
 
@@ -177,6 +207,10 @@ async def google_oauth(payload: dict, db: AsyncSession = Depends(get_db)):
 @router.post("/login")
 @limiter.limit("5/minute")
 async def login(request: Request, user: UserLogin, db: AsyncSession = Depends(get_db)):
+    # Cheap input checks first; no captcha round-trip or DB work for an empty form
+    if not user.username.strip() or not user.password.strip():
+        raise HTTPException(status_code=400, detail="Username and password are required")
+
     try:
         await verify_captcha(user.captcha_token, request=request)
     except HTTPException as he:
@@ -187,15 +221,28 @@ async def login(request: Request, user: UserLogin, db: AsyncSession = Depends(ge
         print(f"[LOGIN] Unexpected captcha error -> {e}")
         raise HTTPException(status_code=500, detail=f"CAPTCHA verification error: {e}")
 
-    if not user.username.strip() or not user.password.strip():
-        raise HTTPException(status_code=400, detail="Username and password are required")
+    # Only the columns auth needs; a plain row skips ORM entity hydration
+    result = await db.execute(
+        select(User.id, User.username, User.password, User.role, User.is_verified)
+        .where(User.username == user.username)
+    )
+    db_user = result.first()
 
-    result = await db.execute(select(User).where(User.username == user.username))
-    db_user = result.scalar_one_or_none()
+    if not db_user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    if not db_user or not bcrypt.verify(user.password, db_user.password):
+    password_ok, needs_rehash = await verify_password(user.password, db_user.password)
+    if not password_ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    if needs_rehash:
+        await db.execute(
+            update(User)
+            .where(User.id == db_user.id)
+            .values(password=await hash_password(user.password))
+        )
+        await db.commit()
+
     if not db_user.is_verified:
         raise HTTPException(status_code=403, detail="Email not verified")
 
@@ -239,20 +286,38 @@ async def login(request: Request, user: UserLogin, db: AsyncSession = Depends(ge
 
 
 @router.get("/verify-email")
-async def verify_email(token: str = Query(...), db: AsyncSession = Depends(get_db)):
+async def verify_email(
+    request: Request,
+    response: Response,
+    token: str = Query(...),
+    db: AsyncSession = Depends(get_db),
+):
     email = verify_email_token(token)
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    etag = f'"{hashlib.sha1(token.encode("utf-8")).hexdigest()[:16]}"'
+    cache_headers = {"ETag": etag, "Cache-Control": VERIFY_EMAIL_CACHE_CONTROL}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=cache_headers)
+    if etag in _verified_email_links:
+        response.headers.update(cache_headers)
+        return {"message": "Email already verified"}
+
+    result = await db.execute(select(User.id, User.is_verified).where(User.email == email))
+    user = result.first()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     if user.is_verified:
+        _verified_email_links[etag] = True
+        response.headers.update(cache_headers)
         return {"message": "Email already verified"}
 
-    user.is_verified = True
+    await db.execute(update(User).where(User.id == user.id).values(is_verified=True))
     await db.commit()
 
+    _verified_email_links[etag] = True
+    response.headers.update(cache_headers)
     return {"message": "Email verification successful"}
 
 
@@ -262,6 +327,7 @@ async def verify_email(token: str = Query(...), db: AsyncSession = Depends(get_d
 async def resend_verification(
     request: Request,
     payload: ResendVerification,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     # (Optional) require CAPTCHA; flip this on if you get abuse
@@ -278,7 +344,9 @@ async def resend_verification(
     # Lookup by email first (if provided), else username
     user = None
     if payload.email:
-        result = await db.execute(select(User).where(User.email == str(payload.email)))
+        result = await db.execute(
+            select(User).where(func.lower(User.email) == payload.email).limit(1)
+        )
         user = result.scalar_one_or_none()
     if not user and payload.username:
         result = await db.execute(select(User).where(User.username == payload.username))
@@ -291,12 +359,8 @@ async def resend_verification(
     if user.is_verified:
         return {"message": "Email is already verified. You can log in."}
 
-    try:
-        token = generate_email_token(str(user.email))
-        send_verification_email(str(user.email), token)
-    except Exception:
-        # Don’t leak details; stay generic
-        return {"message": "If an account exists, a new verification link has been sent."}
+    token = generate_email_token(str(user.email))
+    background_tasks.add_task(_send_verification_email_in_background, str(user.email), token)
 
     return {"message": "Verification email sent. Please check your inbox."}
 
@@ -328,5 +392,5 @@ async def update_user_role(
 
     user.role = next_role
     await db.commit()
-    await db.refresh(user)
+    forget_cached_viewer(user.id)
     return user
@@ -1,15 +1,17 @@
 # app/routes/forum_media_routes.py
 from __future__ import annotations
 
+import asyncio
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, Tuple
 from PIL import Image
 import io
-from typing import cast
+import struct
+from urllib.parse import unquote, urlparse
 
 from app.database import get_async_session
-from app.s3 import upload_to_s3
+from app.s3 import delete_from_s3, upload_to_s3
 from app.utils.token_utils import get_current_user
 from app.models.user_model import User
 from app.models.forum_media_model import ForumMedia
@@ -26,11 +28,78 @@ MAX_WH_IMAGE    = 1024         # max width/height for non-GIF
 MAX_WH_GIF      = 512          # max width/height for GIF
 ALLOWED_MIMES   = {"image/png", "image/jpeg", "image/webp", "image/gif"}
 
-def sniff_image_dims(data: bytes) -> Optional[Tuple[int, int]]:
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG start-of-frame markers (C4/C8/CC are DHT/JPG/DAC, not frames)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_dims(data: bytes) -> Optional[Tuple[int, int]]:
+    i = 2
+    while i + 4 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # standalone markers, no length
+            i += 2
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            if i + 9 > len(data):
+                return None
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        (length,) = struct.unpack(">H", data[i + 2:i + 4])
+        i += 2 + length
+    return None
+
+
+def _header_dims(data: bytes) -> Optional[Tuple[str, Optional[Tuple[int, int]]]]:
+    """
+    Identify PNG/GIF/WEBP/JPEG from the magic bytes and read width/height from the header.
+    Returns (mime, dims), where dims is None if the header is truncated or unusual.
+    """
+    if data[:8] == PNG_SIGNATURE:
+        if data[12:16] == b"IHDR" and len(data) >= 24:
+            return "image/png", struct.unpack(">II", data[16:24])
+        return "image/png", None
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif", struct.unpack("<HH", data[6:10]) if len(data) >= 10 else None
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        chunk = data[12:16]
+        if len(data) < 30:
+            return "image/webp", None
+        if chunk == b"VP8 " and data[23:26] == b"\x9d\x01\x2a":
+            width, height = struct.unpack("<HH", data[26:30])
+            return "image/webp", (width & 0x3FFF, height & 0x3FFF)
+        if chunk == b"VP8L" and data[20] == 0x2F:
+            bits = int.from_bytes(data[21:25], "little")
+            return "image/webp", ((bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+        if chunk == b"VP8X":
+            return "image/webp", (
+                int.from_bytes(data[24:27], "little") + 1,
+                int.from_bytes(data[27:30], "little") + 1,
+            )
+        return "image/webp", None
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg", _jpeg_dims(data)
+    return None
+
+
+def sniff_image(data: bytes) -> Optional[Tuple[str, int, int]]:
+    """(mime, width, height) from the file's own bytes; None if it isn't a supported image."""
+    # Only the header is needed; never decode pixel data.
+    header = _header_dims(data)
+    if header and header[1] and header[1][0] > 0 and header[1][1] > 0:
+        mime, (width, height) = header
+        return mime, int(width), int(height)
     try:
         with Image.open(io.BytesIO(data)) as im:
-            im.load()
-            return int(im.width), int(im.height)
+            mime = Image.MIME.get(im.format or "")
+            if mime not in ALLOWED_MIMES:
+                return None
+            return mime, int(im.width), int(im.height)
     except Exception:
         return None
 
@@ -45,38 +114,50 @@ async def upload_forum_image_or_gif(
     if file.content_type not in ALLOWED_MIMES:
         raise HTTPException(status_code=400, detail="Unsupported image type.")
 
-    blob = await file.read()
+    # size limits
+    if file.content_type == "image/gif":
+        max_bytes, too_large = MAX_BYTES_GIF, "GIF too large (max 1 MB)."
+    else:
+        max_bytes, too_large = MAX_BYTES_IMAGE, "Image too large (max 300 KB)."
+
+    # Reject on the declared size before reading anything
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=400, detail=too_large)
+
+    # Never read more than one byte past the limit
+    blob = await file.read(max_bytes + 1)
     if not blob:
         raise HTTPException(status_code=400, detail="Empty file.")
+    if len(blob) > max_bytes:
+        raise HTTPException(status_code=400, detail=too_large)
 
-    # size limits
-    if file.content_type == "image/gif":
-        if len(blob) > MAX_BYTES_GIF:
-            raise HTTPException(status_code=400, detail="GIF too large (max 1 MB).")
+    sniffed = sniff_image(blob)
+    if not sniffed:
+        raise HTTPException(status_code=400, detail="File is not a valid image.")
+    actual_mime, width, height = sniffed
+    # The declared type drives the size limits, so it must match the bytes.
+    if actual_mime != file.content_type:
+        raise HTTPException(status_code=400, detail="File content does not match its image type.")
+
+    if actual_mime == "image/gif":
+        if width > MAX_WH_GIF or height > MAX_WH_GIF:
+            raise HTTPException(status_code=400, detail="GIF dimensions too large (max 512×512).")
     else:
-        if len(blob) > MAX_BYTES_IMAGE:
-            raise HTTPException(status_code=400, detail="Image too large (max 300 KB).")
-
-    dims = sniff_image_dims(blob)
-    width: Optional[int] = None
-    height: Optional[int] = None
-    if dims:
-        width, height = dims
-        if file.content_type == "image/gif":
-            if width > MAX_WH_GIF or height > MAX_WH_GIF:
-                raise HTTPException(status_code=400, detail="GIF dimensions too large (max 512×512).")
-        else:
-            if width > MAX_WH_IMAGE or height > MAX_WH_IMAGE:
-                raise HTTPException(status_code=400, detail="Image dimensions too large (max 1024×1024).")
+        if width > MAX_WH_IMAGE or height > MAX_WH_IMAGE:
+            raise HTTPException(status_code=400, detail="Image dimensions too large (max 1024×1024).")
 
-    if file.content_type not in ALLOWED_MIMES:
-        raise HTTPException(status_code=400, detail="Unsupported image type.")
+    mime = actual_mime
 
-    mime: str = cast(str, file.content_type)
+    # End the read transaction left open by get_current_user so no pooled
+    # connection is held while the file goes to S3.
+    await db.commit()
 
-    # upload to S3
-    url = upload_to_s3(
-        io.BytesIO(blob),
+    # upload to S3 straight from the spooled upload; no second in-memory copy.
+    # boto3 is blocking, so the PUT runs on a worker thread instead of the event loop.
+    await file.seek(0)
+    url = await asyncio.to_thread(
+        upload_to_s3,
+        file.file,
         filename=file.filename or "upload",
         content_type=mime,
         folder="forum",
@@ -95,8 +176,17 @@ async def upload_forum_image_or_gif(
         height=height,
     )
     db.add(media)
-    await db.commit()
-    await db.refresh(media)
+    try:
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        # Don't leave an orphaned S3 object behind when the row can't be written
+        try:
+            await asyncio.to_thread(delete_from_s3, unquote(urlparse(url).path.lstrip("/")))
+        except Exception:
+            pass
+        raise
+    # id comes back from the INSERT; every other field was set here
 
     return {
         "id": media.id,
@@ -1,9 +1,15 @@
+import hashlib
 import math
+from datetime import datetime
 
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func, delete, insert, update, exists, literal, or_, and_, tuple_, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased, joinedload, load_only, selectinload
 from typing import Optional, List
 
 from app.database import get_async_session
@@ -16,10 +22,10 @@ from app.schemas.forum_schemas import (
     UpdateThreadIn, PageOut, ThreadPostsPageOut
 )
 from app.utils.forum_content import reject_disallowed_images
+from app.utils.keyset import keyset_cursor, parse_keyset_cursor
 
 # ✅ Use your existing token utils (no changes there)
-from app.utils.token_utils import get_current_user, SECRET_KEY, ALGORITHM
-from jose import jwt, JWTError
+from app.utils.token_utils import CachedViewer, cache_viewer, decode_access_token, get_cached_viewer, get_current_user
 from app.limiter import limiter
 from app.moderation.profanity import ensure_clean
 
@@ -34,22 +40,35 @@ class HeartToggleOut(BaseModel):
     count: int
 
 
-async def _post_heart_bits(db: AsyncSession, post_id: int, viewer_id: Optional[int]) -> tuple[int, bool]:
-    # count hearts
-    count_stmt = select(func.count(ForumReaction.id)).where(
-        ForumReaction.post_id == post_id, ForumReaction.kind == "HEART"
-    )
-    heart_count = int((await db.execute(count_stmt)).scalar_one() or 0)
+# (q, author_id) -> threads-paged total; COUNT(*) is the slowest part of that endpoint.
+# Cleared on thread create/delete in this worker; other workers catch up within the TTL.
+THREAD_TOTAL_CACHE_SECONDS = 60
+_thread_total_cache: TTLCache = TTLCache(maxsize=1024, ttl=THREAD_TOTAL_CACHE_SECONDS)
 
-    has = False
-    if viewer_id:
-        has_stmt = select(func.count(ForumReaction.id)).where(
-            ForumReaction.post_id == post_id,
+
+MAX_THREADS_PER_USER = 10
+
+# Thread reads are per-viewer (viewer_has_hearted), so caches must revalidate per user.
+FORUM_CACHE_HEADERS = {"Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+
+def _weak_etag(*parts) -> str:
+    digest = hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:16]
+    return f'W/"{digest}"'
+
+
+async def _load_viewer_hearts(db: AsyncSession, posts: List[ForumPost], viewer_id: Optional[int]) -> frozenset[int]:
+    """Ids of the posts on this page the viewer has hearted; one query, none for anonymous viewers."""
+    if not viewer_id or not posts:
+        return frozenset()
+    rows = await db.execute(
+        select(ForumReaction.post_id).where(
+            ForumReaction.post_id.in_([p.id for p in posts]),
             ForumReaction.user_id == viewer_id,
             ForumReaction.kind == "HEART",
         )
-        has = (await db.execute(has_stmt)).scalar_one() > 0
-    return heart_count, has
+    )
+    return frozenset(rows.scalars().all())
 
 
 # ------------------------------
@@ -58,161 +77,281 @@ async def _post_heart_bits(db: AsyncSession, post_id: int, viewer_id: Optional[i
 def _is_admin(user: "User") -> bool:
     return (getattr(user, "role", "") or "").upper() == "ADMIN"
 
-async def _post_to_plain_dict(p: ForumPost, db: AsyncSession, viewer: Optional["User"]=None) -> dict:
-    refs = await db.execute(
-        select(ForumSeriesRef, Series)
-        .join(Series, Series.id == ForumSeriesRef.series_id)
-        .where(ForumSeriesRef.post_id == p.id)
+def _post_to_plain_dict(p: ForumPost, viewer_hearted: frozenset[int] = frozenset()) -> dict:
+    """Expects a post loaded with POST_OUT_OPTIONS."""
+    return _post_plain_dict(
+        p,
+        p.author.username if p.author else None,
+        [ref.series for ref in p.series_refs if ref.series is not None],
+        viewer_hearted,
     )
-    srefs = []
-    for (_ref, s) in refs.all():
-        srefs.append({
-            "series_id": s.id,
-            "title": s.title,
-            "cover_url": s.cover_url,
-            "type": s.type,
-            "status": s.status,
-        })
-
-    author_username = None
-    if p.author_id:
-        u = await db.get(User, p.author_id)
-        author_username = getattr(u, "username", None) if u else None
 
-    heart_count, viewer_has = await _post_heart_bits(db, p.id, getattr(viewer, "id", None))
 
+def _post_plain_dict(
+    p: ForumPost,
+    author_username: Optional[str],
+    series: List[Series],
+    viewer_hearted: frozenset[int] = frozenset(),
+) -> dict:
     # Always include parent_id; use 0 for top-level
     return {
         "id": p.id,
         "author_username": author_username,
         "content_markdown": p.content_markdown,
-        "created_at": str(p.created_at),
-        "updated_at": str(p.updated_at),
-        "series_refs": srefs,
+        "created_at": p.created_at,
+        "updated_at": p.updated_at,
+        "series_refs": [_series_ref_dict(s) for s in series],
         "parent_id": int(p.parent_id) if p.parent_id is not None else 0,
-        "heart_count": int(getattr(p, "heart_count", heart_count) or heart_count),
-        "viewer_has_hearted": bool(viewer_has),
+        "heart_count": int(p.heart_count or 0),  # maintained by toggle_heart
+        "viewer_has_hearted": p.id in viewer_hearted,
     }
 
-def dump_model(m):
-    return m.model_dump(exclude_none=False) if hasattr(m, "model_dump") else m.dict(exclude_none=False)
-
 # ------------------------------
 # Local optional-user helper ONLY in this file
 # ------------------------------
 async def get_current_user_optional(
     request: Request,
     db: AsyncSession = Depends(get_async_session),
-) -> Optional[User]:
+) -> Optional[CachedViewer]:
     auth = request.headers.get("Authorization")
     if not auth or not auth.lower().startswith("bearer "):
         return None
     token = auth.split(" ", 1)[1].strip()
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("id")
-        if user_id is None:
-            return None
-    except JWTError:
+    payload = decode_access_token(token)
+    user_id = payload.get("id") if payload else None
+    if user_id is None:
         return None
 
-    user = await db.get(User, user_id)
-    return user
+    # Viewers are only read (id for heart state), so the shared viewer cache is enough.
+    viewer = get_cached_viewer(int(user_id))
+    if viewer is None:
+        user = await db.get(User, int(user_id))
+        if user is None:
+            return None
+        viewer = cache_viewer(user)
+    return viewer
 
 # ------------------------------
 # Mappers
 # ------------------------------
-async def _thread_to_out(t: ForumThread, db: AsyncSession) -> ForumThreadOut:
-    author_username: Optional[str] = None
-    if t.author_id:
-        u = await db.get(User, t.author_id)
-        author_username = getattr(u, "username", None) if u else None
-
-    refs = await db.execute(
-        select(ForumSeriesRef, Series)
-        .join(Series, Series.id == ForumSeriesRef.series_id)
-        .where(ForumSeriesRef.thread_id == t.id, ForumSeriesRef.post_id == None)
-    )
-    srefs = [
-        SeriesRefOut(
-            series_id=s.id,
-            title=s.title,
-            cover_url=s.cover_url,
-            type=s.type,
-            status=s.status,
-        )
-        for (_ref, s) in refs.all()
-    ]
+# Everything _thread_to_out reads, loaded together with the threads (no per-row queries)
+THREAD_OUT_OPTIONS = (
+    joinedload(ForumThread.author).load_only(User.id, User.username),
+    selectinload(ForumThread.header_refs).joinedload(ForumSeriesRef.series),
+)
 
-    return ForumThreadOut(
-        id=t.id,
-        title=t.title,
-        author_username=author_username,
-        created_at=str(t.created_at),
-        updated_at=str(t.updated_at),
-        post_count=t.post_count or 0,
-        last_post_at=str(t.last_post_at),
-        series_refs=srefs,
-        locked=bool(getattr(t, "locked", False)),
-        latest_first=bool(getattr(t, "latest_first", False)),
+
+def _series_ref_dict(s: Series) -> dict:
+    return {
+        "series_id": s.id,
+        "title": s.title,
+        "cover_url": s.cover_url,
+        "type": s.type,
+        "status": s.status,
+    }
+
+
+async def _fetch_series(db: AsyncSession, series_ids: Optional[List[int]]) -> List[Series]:
+    """
+    The referenced series in request order (duplicates dropped), read once so responses need
+    no post-commit query. 400s on unknown ids instead of failing the FK mid-insert.
+    """
+    if not series_ids:
+        return []
+    series_ids = list(dict.fromkeys(series_ids))
+    rows = (
+        await db.execute(
+            select(Series)
+            .where(Series.id.in_(series_ids))
+            .options(load_only(Series.id, Series.title, Series.cover_url, Series.type, Series.status))
+        )
+    ).scalars().all()
+    by_id = {s.id: s for s in rows}
+    if len(by_id) != len(series_ids):
+        raise HTTPException(status_code=400, detail="One or more referenced series do not exist")
+    return [by_id[sid] for sid in series_ids]
+
+
+async def _insert_series_refs(
+    db: AsyncSession, thread_id: int, post_id: Optional[int], series: List[Series]
+) -> None:
+    # One executemany INSERT rather than an ORM object + INSERT per ref
+    if not series:
+        return
+    await db.execute(
+        insert(ForumSeriesRef),
+        [{"thread_id": thread_id, "post_id": post_id, "series_id": s.id} for s in series],
     )
 
-async def _post_to_out(p: ForumPost, db: AsyncSession, viewer: Optional["User"]=None) -> ForumPostOut:
-    refs = await db.execute(
-        select(ForumSeriesRef, Series)
-        .join(Series, Series.id == ForumSeriesRef.series_id)
-        .where(ForumSeriesRef.post_id == p.id)
+
+async def _sync_series_refs(
+    db: AsyncSession, thread_id: int, post_id: Optional[int], series: List[Series]
+) -> bool:
+    """Make a post's refs (or the thread header's, post_id=None) match `series`; True if any changed."""
+    # Diff against what is stored so unchanged refs aren't deleted and re-inserted on every edit
+    scope = (
+        ForumSeriesRef.thread_id == thread_id,
+        ForumSeriesRef.post_id == post_id if post_id is not None else ForumSeriesRef.post_id.is_(None),
     )
-    srefs = [
-        SeriesRefOut(
-            series_id=s.id,
-            title=s.title,
-            cover_url=s.cover_url,
-            type=s.type,
-            status=s.status,
+    current = set((await db.execute(select(ForumSeriesRef.series_id).where(*scope))).scalars().all())
+    stale = current - {s.id for s in series}
+    added = [s for s in series if s.id not in current]
+
+    if stale:
+        await db.execute(delete(ForumSeriesRef).where(*scope, ForumSeriesRef.series_id.in_(stale)))
+    await _insert_series_refs(db, thread_id, post_id, added)
+    return bool(stale or added)
+
+
+async def _delete_post_subtree(db: AsyncSession, thread_id: int, post_id: int) -> None:
+    """Delete a post with all its replies and adjust the thread's counters by what was removed."""
+    # Delete the subtree explicitly (rather than leaning on ON DELETE CASCADE) so RETURNING
+    # reports every removed row and the thread counters never need a full recount.
+    subtree = select(ForumPost.id).where(ForumPost.id == post_id).cte("subtree", recursive=True)
+    subtree = subtree.union_all(
+        select(ForumPost.id).join(subtree, ForumPost.parent_id == subtree.c.id)
+    )
+    removed = (
+        await db.execute(
+            delete(ForumPost)
+            .where(ForumPost.id.in_(select(subtree.c.id)))
+            .returning(ForumPost.created_at)
+            .execution_options(synchronize_session=False)
         )
-        for (_ref, s) in refs.all()
-    ]
+    ).scalars().all()
+    if not removed:
+        return
+
+    # last_post_at only moves when the newest post went away; then one index-backed lookup
+    newest_left = (
+        select(ForumPost.created_at)
+        .where(ForumPost.thread_id == thread_id)
+        .order_by(ForumPost.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(ForumThread)
+        .where(ForumThread.id == thread_id)
+        .values(
+            post_count=func.greatest(ForumThread.post_count - len(removed), 0),
+            last_post_at=case(
+                (ForumThread.last_post_at > max(removed), ForumThread.last_post_at),
+                else_=func.coalesce(newest_left, ForumThread.created_at),
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+# Everything the post mappers read
+POST_OUT_OPTIONS = (
+    joinedload(ForumPost.author).load_only(User.id, User.username),
+    selectinload(ForumPost.series_refs).joinedload(ForumSeriesRef.series),
+)
+
+
+async def _load_post_for_out(db: AsyncSession, post_id: int) -> Optional[ForumPost]:
+    return (
+        await db.execute(
+            select(ForumPost)
+            .where(ForumPost.id == post_id)
+            .options(*POST_OUT_OPTIONS)
+            .execution_options(populate_existing=True)
+        )
+    ).scalars().first()
+
+
+async def _load_thread_for_out(db: AsyncSession, thread_id: int) -> Optional[ForumThread]:
+    # populate_existing so a thread already in the session (e.g. just committed) is re-read whole
+    return (
+        await db.execute(
+            select(ForumThread)
+            .where(ForumThread.id == thread_id)
+            .options(*THREAD_OUT_OPTIONS)
+            .execution_options(populate_existing=True)
+        )
+    ).scalars().first()
 
-    author_username: Optional[str] = None
-    if p.author_id:
-        u = await db.get(User, p.author_id)
-        author_username = getattr(u, "username", None) if u else None
-
-    heart_count, viewer_has = await _post_heart_bits(db, p.id, getattr(viewer, "id", None))
-
-    return ForumPostOut(
-        id=p.id,
-        author_username=author_username,
-        content_markdown=p.content_markdown,
-        created_at=str(p.created_at),
-        updated_at=str(p.updated_at),
-        series_refs=srefs,
-        parent_id=p.parent_id if p.parent_id is not None else 0,
-        heart_count=int(getattr(p, "heart_count", heart_count) or heart_count),
-        viewer_has_hearted=bool(viewer_has),
+
+def _thread_to_plain_dict(t: ForumThread) -> dict:
+    """Expects a thread loaded with THREAD_OUT_OPTIONS."""
+    return _thread_plain_dict(
+        t,
+        t.author.username if t.author else None,
+        [ref.series for ref in t.header_refs if ref.series is not None],
     )
 
+
+def _thread_plain_dict(t: ForumThread, author_username: Optional[str], series: List[Series]) -> dict:
+    # Same shape as ForumThreadOut; read endpoints send these straight to orjson
+    return {
+        "id": t.id,
+        "title": t.title,
+        "author_username": author_username,
+        "created_at": t.created_at,
+        "updated_at": t.updated_at,
+        "post_count": t.post_count or 0,
+        "last_post_at": t.last_post_at,
+        "series_refs": [_series_ref_dict(s) for s in series],
+        "locked": bool(getattr(t, "locked", False)),
+        "latest_first": bool(getattr(t, "latest_first", False)),
+    }
+
+
+def _thread_to_out(t: ForumThread) -> ForumThreadOut:
+    return ForumThreadOut(**_thread_to_plain_dict(t))
+
+
+def _thread_out(t: ForumThread, author_username: Optional[str], series: List[Series]) -> ForumThreadOut:
+    return ForumThreadOut(**_thread_plain_dict(t, author_username, series))
+
+
+def _post_to_out(p: ForumPost, viewer_hearted: frozenset[int] = frozenset()) -> ForumPostOut:
+    return ForumPostOut(**_post_to_plain_dict(p, viewer_hearted))
+
 # ------------------------------
 # Routes
 # ------------------------------
 @router.get("/threads", response_model=List[ForumThreadOut])
 async def list_threads(
+    request: Request,
     q: Optional[str] = None,
-    page: int = 1,
-    page_size: int = 20,
+    page: int = Query(1, ge=1, le=500),
+    page_size: int = Query(20, ge=1, le=50),
+    # Keyset paging: pass the last item's updated_at (+ id) to get the next page at any depth
+    before: Optional[datetime] = None,
+    before_id: Optional[int] = None,
     db: AsyncSession = Depends(get_async_session),
-    _viewer: Optional[User] = Depends(get_current_user_optional),
+    _viewer: Optional[CachedViewer] = Depends(get_current_user_optional),
 ):
-    stmt = select(ForumThread).order_by(ForumThread.updated_at.desc())
+    stmt = (
+        select(ForumThread)
+        .options(*THREAD_OUT_OPTIONS)
+        .order_by(ForumThread.updated_at.desc(), ForumThread.id.desc())
+    )
     if q:
-        stmt = select(ForumThread).where(ForumThread.title.ilike(f"%{q}%")).order_by(
-            ForumThread.updated_at.desc()
-        )
+        stmt = stmt.where(ForumThread.title.ilike(f"%{q}%"))
 
-    stmt = stmt.offset((page - 1) * page_size).limit(page_size)
+    if before is not None:
+        if before_id is not None:
+            stmt = stmt.where(tuple_(ForumThread.updated_at, ForumThread.id) < (before, before_id))
+        else:
+            stmt = stmt.where(ForumThread.updated_at < before)
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+    stmt = stmt.limit(page_size)
     rows = (await db.execute(stmt)).scalars().all()
-    return [await _thread_to_out(t, db) for t in rows]
+
+    # Any change to a listed thread (posts, counters, refs, settings) bumps its updated_at
+    etag = _weak_etag(*((t.id, t.updated_at, t.post_count) for t in rows))
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, **FORUM_CACHE_HEADERS})
+    # Plain dicts straight to orjson; response_model stays for the OpenAPI schema only
+    return ORJSONResponse(
+        [_thread_to_plain_dict(t) for t in rows],
+        headers={"ETag": etag, **FORUM_CACHE_HEADERS},
+    )
 
 @router.post("/threads", response_model=ForumThreadOut)
 @limiter.limit("3/minute;20/hour;60/day")
@@ -232,19 +371,25 @@ request: Request,
             detail={"code": "PROFANITY", "message": "Reply contains inappropriate language."}
         )
 
-    # 🔒 limit: max 10 threads per user
-    existing_count = (
-        await db.execute(
-            select(func.count(ForumThread.id)).where(ForumThread.author_id == user.id)
-        )
-    ).scalar_one()
-    if existing_count >= 10:
+    # 🔒 limit: max 10 threads per user. Claiming a slot on the user's counter is one PK
+    # UPDATE, and concurrent creates can't both squeeze past the limit.
+    claimed = await db.execute(
+        update(User)
+        .where(User.id == user.id, User.thread_count < MAX_THREADS_PER_USER)
+        .values(thread_count=User.thread_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if claimed.rowcount == 0:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Thread limit reached (10). Delete an existing thread to create a new one.",
+            detail=f"Thread limit reached ({MAX_THREADS_PER_USER}). Delete an existing thread to create a new one.",
         )
 
-    thread = ForumThread(title=payload.title, author_id=user.id)
+    series = await _fetch_series(db, payload.series_ids)
+
+    # post_count starts at 1 and last_post_at defaults to now(), so the thread needs no
+    # follow-up UPDATE; server defaults come back via INSERT ... RETURNING.
+    thread = ForumThread(title=payload.title, author_id=user.id, post_count=1)
     db.add(thread)
     await db.flush()  # get thread.id
 
@@ -255,67 +400,12 @@ request: Request,
     )
     db.add(post)
 
-    for sid in payload.series_ids or []:
-        db.add(ForumSeriesRef(thread_id=thread.id, post_id=None, series_id=sid))
-
-    thread.post_count = 1
-    thread.last_post_at = func.now()
+    await _insert_series_refs(db, thread.id, None, series)
 
     await db.commit()
-    await db.refresh(thread)
-
-    return await _thread_to_out(thread, db)
-
-# @router.get("/threads/{thread_id}")
-# async def get_thread(
-#     thread_id: int,
-#     db: AsyncSession = Depends(get_async_session),
-#     _viewer: Optional[User] = Depends(get_current_user_optional),  # optional
-# ):
-#     t = await db.get(ForumThread, thread_id)
-#     if not t:
-#         raise HTTPException(status_code=404, detail="Thread not found")
-#
-#     header_refs = await db.execute(
-#         select(ForumSeriesRef, Series)
-#         .join(Series, Series.id == ForumSeriesRef.series_id)
-#         .where(ForumSeriesRef.thread_id == thread_id, ForumSeriesRef.post_id == None)
-#     )
-#     header = [
-#         {
-#             "series_id": s.id,
-#             "title": s.title,
-#             "cover_url": s.cover_url,
-#             "type": s.type,
-#             "status": s.status,
-#         }
-#         for (_ref, s) in header_refs.all()
-#     ]
-#
-#     posts = (
-#         await db.execute(
-#             select(ForumPost)
-#             .where(ForumPost.thread_id == thread_id)
-#             .order_by(ForumPost.created_at.asc())
-#         )
-#     ).scalars().all()
-#
-#     posts_out = [await _post_to_plain_dict(p, db) for p in posts]
-#
-#     return {
-#         "thread": {
-#             "id": t.id,
-#             "title": t.title,
-#             "author_username": None,
-#             "created_at": str(t.created_at),
-#             "updated_at": str(t.updated_at),
-#             "post_count": t.post_count or 0,
-#             "last_post_at": str(t.last_post_at),
-#             "series_refs": header,
-#             "locked": bool(getattr(t, "locked", False)),
-#         },
-#         "posts": posts_out,
-#     }
+    _thread_total_cache.clear()
+
+    return _thread_out(thread, user.username, series)
 
 
 @router.get("/threads-paged", response_model=PageOut)
@@ -324,72 +414,123 @@ async def list_threads_paged(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     author_id: Optional[int] = None,  # allows "my threads" count without fetching 1000 rows
+    cursor: Optional[str] = None,  # next_cursor from the previous page; seeks instead of OFFSET
     db: AsyncSession = Depends(get_async_session),
-    _viewer: Optional[User] = Depends(get_current_user_optional),
+    _viewer: Optional[CachedViewer] = Depends(get_current_user_optional),
 ):
+    cursor_key = parse_keyset_cursor(cursor) if cursor else None
+
     filters = []
     if q:
         filters.append(ForumThread.title.ilike(f"%{q}%"))
     if author_id is not None:
         filters.append(ForumThread.author_id == author_id)
 
-    # total
-    total_stmt = select(func.count(ForumThread.id))
-    if filters:
-        total_stmt = total_stmt.where(*filters)
-    total = int((await db.execute(total_stmt)).scalar_one() or 0)
+    # total (cached briefly; has_next below comes from the page query, not from this)
+    total_key = (q or None, author_id)
+    total = _thread_total_cache.get(total_key)
+    if total is None:
+        total_stmt = select(func.count(ForumThread.id))
+        if filters:
+            total_stmt = total_stmt.where(*filters)
+        total = int((await db.execute(total_stmt)).scalar_one() or 0)
+        _thread_total_cache[total_key] = total
 
     # page rows (stable order)
-    stmt = select(ForumThread).order_by(
+    stmt = select(ForumThread).options(*THREAD_OUT_OPTIONS).order_by(
         ForumThread.last_post_at.desc(),
         ForumThread.id.desc(),
     )
     if filters:
         stmt = stmt.where(*filters)
-    stmt = stmt.offset((page - 1) * page_size).limit(page_size)
+    if cursor_key:
+        stmt = stmt.where(tuple_(ForumThread.last_post_at, ForumThread.id) < cursor_key)
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+    stmt = stmt.limit(page_size + 1)  # one extra row tells us whether there is a next page
 
     rows = (await db.execute(stmt)).scalars().all()
-    items = [await _thread_to_out(t, db) for t in rows]
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    items = [_thread_to_plain_dict(t) for t in rows]
 
     total_pages = max(1, math.ceil(total / page_size))
-    return PageOut(
-        items=items,
-        page=page,
-        page_size=page_size,
-        total=total,
-        total_pages=total_pages,
-        has_prev=page > 1,
-        has_next=page < total_pages,
-    )
+    return ORJSONResponse({
+        "items": items,
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "total_pages": total_pages,
+        "has_prev": bool(cursor_key) or page > 1,
+        "has_next": has_next,
+        "next_cursor": keyset_cursor(rows[-1].last_post_at, rows[-1].id) if has_next else None,
+    })
 
 @router.get("/threads/{thread_id}")
 async def get_thread(
+    request: Request,
     thread_id: int,
     db: AsyncSession = Depends(get_async_session),
-    viewer: Optional[User] = Depends(get_current_user_optional),  # optional
+    after: Optional[str] = None,  # next_cursor from the previous page
+    limit: Optional[int] = Query(None, ge=1, le=200),  # omitted: whole thread, as before
+    viewer: Optional[CachedViewer] = Depends(get_current_user_optional),  # optional
 ):
-    t = await db.get(ForumThread, thread_id)
-    if not t:
-        raise HTTPException(status_code=404, detail="Thread not found")
+    after_key = parse_keyset_cursor(after) if after else None
 
-    # Posts (unchanged)
-    posts = (
+    # Cheap version probe first: post edits and heart toggles bump posts' updated_at,
+    # new/deleted posts change post_count, everything else bumps the thread's updated_at.
+    version = (
         await db.execute(
-            select(ForumPost)
-            .where(ForumPost.thread_id == thread_id)
-            .order_by(ForumPost.created_at.asc())
+            select(
+                ForumThread.updated_at,
+                ForumThread.post_count,
+                select(func.max(ForumPost.updated_at))
+                .where(ForumPost.thread_id == thread_id)
+                .scalar_subquery(),
+            ).where(ForumThread.id == thread_id)
         )
-    ).scalars().all()
-    posts_out = [await _post_to_plain_dict(p, db, viewer) for p in posts]
+    ).first()
+    if not version:
+        raise HTTPException(status_code=404, detail="Thread not found")
 
-    # ✅ Reuse the shared mapper so locked + latest_first + series_refs are all included
-    thread_out = await _thread_to_out(t, db)
+    etag = _weak_etag(thread_id, *version, getattr(viewer, "id", None))
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, **FORUM_CACHE_HEADERS})
 
-    # If you want to be explicit, dump the Pydantic model into a dict
-    return {
-        "thread": dump_model(thread_out),
-        "posts": posts_out,
-    }
+    t = await _load_thread_for_out(db, thread_id)
+    if not t:
+        raise HTTPException(status_code=404, detail="Thread not found")
+
+    # Keyset pagination on (created_at, id), served by ix_forum_posts_thread_created
+    stmt = (
+        select(ForumPost)
+        .where(ForumPost.thread_id == thread_id)
+        .options(*POST_OUT_OPTIONS)
+        .order_by(ForumPost.created_at.asc(), ForumPost.id.asc())
+    )
+    if after_key:
+        stmt = stmt.where(tuple_(ForumPost.created_at, ForumPost.id) > after_key)
+    if limit:
+        stmt = stmt.limit(limit + 1)  # one extra row tells us whether there is a next page
+    posts = (await db.execute(stmt)).scalars().all()
+
+    next_cursor = None
+    if limit and len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = keyset_cursor(posts[-1].created_at, posts[-1].id)
+
+    hearted = await _load_viewer_hearts(db, posts, getattr(viewer, "id", None))
+    posts_out = [_post_to_plain_dict(p, hearted) for p in posts]
+
+    # ✅ Reuse the shared mapper so locked + latest_first + series_refs are all included
+    return ORJSONResponse(
+        {
+            "thread": _thread_to_plain_dict(t),
+            "posts": posts_out,
+            "next_cursor": next_cursor,
+        },
+        headers={"ETag": etag, **FORUM_CACHE_HEADERS},
+    )
 
 
 @router.get("/threads/{thread_id}/posts-paged", response_model=ThreadPostsPageOut)
@@ -397,126 +538,122 @@ async def get_thread_posts_paged(
     thread_id: int,
     page: int = Query(1, ge=1),
     page_size: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = None,  # next_cursor from the previous page; seeks instead of OFFSET
     db: AsyncSession = Depends(get_async_session),
-    viewer: Optional[User] = Depends(get_current_user_optional),
+    viewer: Optional[CachedViewer] = Depends(get_current_user_optional),
 ):
+    cursor_key = parse_keyset_cursor(cursor) if cursor else None
+
     # 1) Thread + OP
-    t = await db.get(ForumThread, thread_id)
+    t = await _load_thread_for_out(db, thread_id)
     if not t:
         raise HTTPException(status_code=404, detail="Thread not found")
 
-    # Oldest post is the OP
-    first_post = (
+    # Oldest post is the OP; the top-level count rides along instead of costing its own
+    # round-trip (the OP has no parent, so it is one of the parent IS NULL rows).
+    top_level = aliased(ForumPost)
+    top_level_with_op = (
+        select(func.count(top_level.id))
+        .where(top_level.thread_id == thread_id, top_level.parent_id.is_(None))
+        .scalar_subquery()
+    )
+    op_row = (
         await db.execute(
-            select(ForumPost)
+            select(ForumPost, top_level_with_op)
             .where(ForumPost.thread_id == thread_id)
+            .options(*POST_OUT_OPTIONS)
             .order_by(ForumPost.created_at.asc(), ForumPost.id.asc())
             .limit(1)
         )
-    ).scalars().first()
-    if not first_post:
+    ).first()
+    if not op_row:
         # shouldn't happen, but be safe
-        out = ThreadPostsPageOut(
-            thread=await _thread_to_out(t, db),
-            posts=[],
-            page=page,
-            page_size=page_size,
-            total_top_level=0,
-            total_pages=1,
-            has_prev=False,
-            has_next=False,
-        )
-        return out
+        return ORJSONResponse({
+            "thread": _thread_to_plain_dict(t),
+            "posts": [],
+            "page": page,
+            "page_size": page_size,
+            "total_top_level": 0,
+            "total_pages": 1,
+            "has_prev": False,
+            "has_next": False,
+            "next_cursor": None,
+        })
 
-    # 2) Count top-level replies (parent IS NULL) excluding OP
-    total_top_level = int(
-        (
-            await db.execute(
-                select(func.count(ForumPost.id)).where(
-                    ForumPost.thread_id == thread_id,
-                    ForumPost.parent_id.is_(None),
-                    ForumPost.id != first_post.id,
-                )
-            )
-        ).scalar_one()
-        or 0
-    )
+    first_post, top_level_with_op = op_row
+
+    # 2) Top-level replies (parent IS NULL) excluding the OP
+    total_top_level = max(int(top_level_with_op or 0) - 1, 0)
     total_pages = max(1, math.ceil(total_top_level / page_size))
     page = min(page, total_pages)
 
     # 3) Page of top-level roots (stable order: oldest→newest)
-    roots = (
-        await db.execute(
-            select(ForumPost)
-            .where(
-                ForumPost.thread_id == thread_id,
-                ForumPost.parent_id.is_(None),
-                ForumPost.id != first_post.id,
-            )
-            .order_by(ForumPost.created_at.asc(), ForumPost.id.asc())
-            .offset((page - 1) * page_size)
-            .limit(page_size)
+    roots_stmt = (
+        select(ForumPost)
+        .where(
+            ForumPost.thread_id == thread_id,
+            ForumPost.parent_id.is_(None),
+            ForumPost.id != first_post.id,
         )
-    ).scalars().all()
+        .options(*POST_OUT_OPTIONS)
+        .order_by(ForumPost.created_at.asc(), ForumPost.id.asc())
+    )
+    if cursor_key:
+        roots_stmt = roots_stmt.where(tuple_(ForumPost.created_at, ForumPost.id) > cursor_key)
+    else:
+        roots_stmt = roots_stmt.offset((page - 1) * page_size)
+    roots = (await db.execute(roots_stmt.limit(page_size + 1))).scalars().all()
+    has_next = len(roots) > page_size
+    roots = roots[:page_size]
     root_ids = [p.id for p in roots]
 
-    # 4) Fetch descendants for those roots (iterative, avoids recursive CTE complexity)
+    # 4) Fetch descendants for those roots: one recursive CTE, whatever the reply depth
     descendants: list[ForumPost] = []
-    frontier = set(root_ids)
-    while frontier:
-        children = (
+    if root_ids:
+        tree = (
+            select(ForumPost.id)
+            .where(ForumPost.thread_id == thread_id, ForumPost.parent_id.in_(root_ids))
+            .cte("descendants", recursive=True)
+        )
+        tree = tree.union_all(
+            select(ForumPost.id).join(tree, ForumPost.parent_id == tree.c.id)
+        )
+        descendants = (
             await db.execute(
                 select(ForumPost)
-                .where(
-                    ForumPost.thread_id == thread_id,
-                    ForumPost.parent_id.in_(frontier),
-                )
+                .join(tree, ForumPost.id == tree.c.id)
+                .options(*POST_OUT_OPTIONS)
             )
         ).scalars().all()
-        if not children:
-            break
-        descendants.extend(children)
-        frontier = set(c.id for c in children)
 
-    # 5) Build a flat list: OP first, then roots, each followed by their subtree
-    #    The frontend sorts children per parent; order here just needs to be consistent.
+    # 5) Build a flat list: OP first, then roots, each followed by their subtree (depth-first),
+    #    siblings oldest first. Iterative, so reply depth can't hit the recursion limit.
     by_parent: dict[int, list[ForumPost]] = {}
-    subset = roots + descendants
-    for p in subset:
-        pid = int(p.parent_id) if p.parent_id is not None else 0
-        by_parent.setdefault(pid, []).append(p)
-
-    # sort roots by time asc (children are sorted by the client)
-    roots_sorted = sorted(roots, key=lambda p: (p.created_at, p.id))
+    for p in sorted(descendants, key=lambda p: (p.created_at, p.id), reverse=True):
+        by_parent.setdefault(p.parent_id, []).append(p)  # newest first: pops come out oldest first
 
     ordered_models: list[ForumPost] = [first_post]
-    def walk(parent: ForumPost):
-        kids = by_parent.get(parent.id, [])
-        # children order not critical; client sorts by created_at asc
-        for k in kids:
-            ordered_models.append(k)
-            walk(k)
-
-    for r in roots_sorted:
-        ordered_models.append(r)
-        walk(r)
+    stack = list(reversed(roots))  # roots arrive in (created_at, id) order
+    while stack:
+        node = stack.pop()
+        ordered_models.append(node)
+        stack.extend(by_parent.get(node.id, ()))
 
     # 6) Map to output
-    thread_out = await _thread_to_out(t, db)
-    posts_out: list[ForumPostOut] = []
-    for m in ordered_models:
-        posts_out.append(await _post_to_out(m, db, viewer))
-
-    return ThreadPostsPageOut(
-        thread=thread_out,
-        posts=posts_out,
-        page=page,
-        page_size=page_size,
-        total_top_level=total_top_level,
-        total_pages=total_pages,
-        has_prev=page > 1,
-        has_next=page < total_pages,
-    )
+    hearted = await _load_viewer_hearts(db, ordered_models, getattr(viewer, "id", None))
+    posts_out = [_post_to_plain_dict(m, hearted) for m in ordered_models]
+
+    return ORJSONResponse({
+        "thread": _thread_to_plain_dict(t),
+        "posts": posts_out,
+        "page": page,
+        "page_size": page_size,
+        "total_top_level": total_top_level,
+        "total_pages": total_pages,
+        "has_prev": bool(cursor_key) or page > 1,
+        "has_next": has_next,
+        "next_cursor": keyset_cursor(roots[-1].created_at, roots[-1].id) if has_next else None,
+    })
 
 
 @router.patch("/threads/{thread_id}/lock")
@@ -528,13 +665,19 @@ async def set_thread_lock(
 ):
     if not _is_admin(user):
         raise HTTPException(status_code=403, detail="Admin only")
-    t = await db.get(ForumThread, thread_id)
-    if not t:
+    # One UPDATE ... RETURNING instead of get + flush + refresh
+    row = (
+        await db.execute(
+            update(ForumThread)
+            .where(ForumThread.id == thread_id)
+            .values(locked=bool(body.locked))
+            .returning(ForumThread.id, ForumThread.locked)
+        )
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Thread not found")
-    t.locked = bool(body.locked)
     await db.commit()
-    await db.refresh(t)
-    return {"id": t.id, "locked": t.locked}
+    return {"id": row.id, "locked": row.locked}
 
 
 @router.post("/threads/{thread_id}/posts")
@@ -546,12 +689,17 @@ request: Request,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_session),
 ):
-    thread = await db.get(ForumThread, thread_id)
-    if not thread:
+    # One round-trip for the lock flag and, when replying, the parent's thread
+    parent_id = payload.parent_id
+    columns = [ForumThread.locked]
+    if parent_id is not None:
+        columns.append(select(ForumPost.thread_id).where(ForumPost.id == parent_id).scalar_subquery())
+    probe = (await db.execute(select(*columns).where(ForumThread.id == thread_id))).first()
+    if not probe:
         raise HTTPException(status_code=404, detail="Thread not found")
 
     # ✅ Fail fast if thread is locked (non-admins)
-    if bool(getattr(thread, "locked", False)) and not _is_admin(user):
+    if probe[0] and not _is_admin(user):
         raise HTTPException(status_code=423, detail="Thread is locked")
 
     # ✅ Profanity check (reply content)
@@ -565,19 +713,14 @@ request: Request,
 
     reject_disallowed_images(payload.content_markdown)
 
-
-    parent_id = payload.parent_id
     if parent_id is not None:
-        parent = await db.get(ForumPost, parent_id)
-        if not parent:
+        if probe[1] is None:
             raise HTTPException(status_code=404, detail="Parent post not found")
-
-        if bool(getattr(thread, "locked", False)) and not _is_admin(user):
-            raise HTTPException(status_code=423, detail="Thread is locked")
-
-        if parent.thread_id != thread_id:
+        if probe[1] != thread_id:
             raise HTTPException(status_code=400, detail="Parent post is from another thread")
 
+    series = await _fetch_series(db, payload.series_ids)
+
     post = ForumPost(
         thread_id=thread_id,
         author_id=user.id,
@@ -587,16 +730,19 @@ request: Request,
     db.add(post)
     await db.flush()
 
-    for sid in (payload.series_ids or []):
-        db.add(ForumSeriesRef(thread_id=thread_id, post_id=post.id, series_id=sid))
+    await _insert_series_refs(db, thread_id, post.id, series)
 
-    thread.post_count = (thread.post_count or 0) + 1
-    thread.last_post_at = func.now()
+    await db.execute(
+        update(ForumThread)
+        .where(ForumThread.id == thread_id)
+        .values(post_count=ForumThread.post_count + 1, last_post_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
 
     await db.commit()
-    await db.refresh(post)
 
-    return await _post_to_plain_dict(post, db)
+    # A brand-new post has no hearts yet
+    return _post_plain_dict(post, user.username, series)
 
 @router.get("/series-search", response_model=List[SeriesRefOut])
 @limiter.limit("30/minute;1000/day")
@@ -642,39 +788,26 @@ async def delete_post(
     if not (_is_admin(user) or post.author_id == user.id):
         raise HTTPException(status_code=403, detail="Admins or the post owner may delete this post.")
 
-    # Prevent deleting the original post via this endpoint
-    first_post_id = (
+    # Prevent deleting the original post via this endpoint: it's the one with no earlier post
+    has_earlier_post = (
         await db.execute(
-            select(ForumPost.id)
-            .where(ForumPost.thread_id == thread_id)
-            .order_by(ForumPost.created_at.asc())
-            .limit(1)
+            select(
+                exists().where(
+                    ForumPost.thread_id == thread_id,
+                    or_(
+                        ForumPost.created_at < post.created_at,
+                        and_(ForumPost.created_at == post.created_at, ForumPost.id < post.id),
+                    ),
+                )
+            )
         )
     ).scalar_one()
-    if post.id == first_post_id:
+    if not has_earlier_post:
         raise HTTPException(status_code=400, detail="Delete the thread to remove the original post.")
 
-    thread = await db.get(ForumThread, thread_id)
-    if not thread:
-        raise HTTPException(status_code=404, detail="Thread not found")
-
-    await db.delete(post)   # cascades to children via ON DELETE CASCADE
-    await db.flush()
-
-    # refresh thread counters
-    total_posts = (
-        await db.execute(
-            select(func.count()).select_from(ForumPost).where(ForumPost.thread_id == thread_id)
-        )
-    ).scalar_one()
-    last_post_at = (
-        await db.execute(
-            select(func.max(ForumPost.created_at)).where(ForumPost.thread_id == thread_id)
-        )
-    ).scalar_one()
-
-    thread.post_count = int(total_posts or 0)
-    thread.last_post_at = last_post_at or thread.created_at
+    # post.thread_id == thread_id and the FK guarantees the thread exists; counters are
+    # updated by statement, so the thread row is never loaded.
+    await _delete_post_subtree(db, thread_id, post.id)
 
     await db.commit()
     return Response(status_code=204)
@@ -685,16 +818,33 @@ async def delete_thread(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_session),
 ):
-    thread = await db.get(ForumThread, thread_id)
-    if not thread:
-        raise HTTPException(status_code=404, detail="Thread not found")
-
-    # Admins OR owner of the thread
-    if not (_is_admin(user) or thread.author_id == user.id):
+    # Admins OR owner of the thread; the check rides along in the DELETE itself
+    conditions = [ForumThread.id == thread_id]
+    if not _is_admin(user):
+        conditions.append(ForumThread.author_id == user.id)
+    deleted = (
+        await db.execute(
+            delete(ForumThread).where(*conditions).returning(ForumThread.author_id)
+        )  # DB cascades to posts + series refs
+    ).first()
+
+    if deleted is None:
+        # Nothing deleted: tell a missing thread apart from someone else's
+        found = (await db.execute(select(ForumThread.id).where(ForumThread.id == thread_id))).first()
+        if not found:
+            raise HTTPException(status_code=404, detail="Thread not found")
         raise HTTPException(status_code=403, detail="Admins or the thread owner may delete this thread.")
 
-    await db.delete(thread)  # cascades to posts + series refs
+    if deleted.author_id is not None:
+        await db.execute(
+            update(User)
+            .where(User.id == deleted.author_id, User.thread_count > 0)
+            .values(thread_count=User.thread_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+
     await db.commit()
+    _thread_total_cache.clear()
     return Response(status_code=204)
 
 @router.delete("/threads/{thread_id}/posts/{post_id}/mine", status_code=204)
@@ -713,24 +863,7 @@ async def delete_my_post(
     if (user.role or "").upper() != "ADMIN" and post.author_id != user.id:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    await db.delete(post)
-    await db.flush()
-
-    thread = await db.get(ForumThread, thread_id)
-    if thread:
-        total_posts = (
-            await db.execute(
-                select(func.count()).select_from(ForumPost).where(ForumPost.thread_id == thread_id)
-            )
-        ).scalar_one()
-        last_post_at = (
-            await db.execute(
-                select(func.max(ForumPost.created_at)).where(ForumPost.thread_id == thread_id)
-            )
-        ).scalar_one()
-
-        thread.post_count = int(total_posts or 0)
-        thread.last_post_at = last_post_at or thread.created_at
+    await _delete_post_subtree(db, thread_id, post.id)
 
     await db.commit()
     return Response(status_code=204)
@@ -744,16 +877,27 @@ async def update_thread_settings(
 ):
     if not _is_admin(user):
         raise HTTPException(status_code=403, detail="Admin only")
-    t = await db.get(ForumThread, thread_id)
-    if not t:
+    if body.latest_first is None:
+        # Nothing to change; just report the current value
+        row = (
+            await db.execute(
+                select(ForumThread.id, ForumThread.latest_first).where(ForumThread.id == thread_id)
+            )
+        ).first()
+    else:
+        row = (
+            await db.execute(
+                update(ForumThread)
+                .where(ForumThread.id == thread_id)
+                .values(latest_first=bool(body.latest_first))
+                .returning(ForumThread.id, ForumThread.latest_first)
+            )
+        ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Thread not found")
 
-    if body.latest_first is not None:
-        t.latest_first = bool(body.latest_first)
-
     await db.commit()
-    await db.refresh(t)
-    return {"id": t.id, "latest_first": t.latest_first}
+    return {"id": row.id, "latest_first": row.latest_first}
 
 
 @router.patch("/threads/{thread_id}/posts/{post_id}", response_model=ForumPostOut)
@@ -793,24 +937,20 @@ async def update_post(
 
     reject_disallowed_images(payload.content_markdown)
 
-    # Update the content
+    series = await _fetch_series(db, payload.series_ids)
+
+    # Update the content; always stamp the edit, since a refs-only change leaves the row as-is
     post.content_markdown = payload.content_markdown
+    post.updated_at = func.now()
 
-    # Replace series refs for this post (if series_ids provided)
-    await db.execute(
-        delete(ForumSeriesRef).where(
-            ForumSeriesRef.thread_id == thread_id,
-            ForumSeriesRef.post_id == post_id,
-        )
-    )
-    for sid in (payload.series_ids or []):
-        db.add(ForumSeriesRef(thread_id=thread_id, post_id=post_id, series_id=sid))
+    # Bring this post's series refs in line with series_ids (none given clears them)
+    await _sync_series_refs(db, thread_id, post_id, series)
 
     await db.commit()
-    await db.refresh(post)
 
     # Return normalized shape
-    return await _post_to_out(post, db)
+    post = await _load_post_for_out(db, post_id)
+    return _post_to_out(post)
 
 
 from sqlalchemy import select, func, delete
@@ -875,18 +1015,12 @@ async def update_thread(
 
     # Replace header-level series refs IF provided
     if payload.series_ids is not None:
-        await db.execute(
-            delete(ForumSeriesRef).where(
-                ForumSeriesRef.thread_id == thread_id,
-                ForumSeriesRef.post_id == None,  # header refs only
-            )
-        )
-        for sid in map(int, payload.series_ids):
-            db.add(ForumSeriesRef(thread_id=thread_id, series_id=sid))
+        series = await _fetch_series(db, payload.series_ids)
+        if await _sync_series_refs(db, thread_id, None, series):
+            thread.updated_at = func.now()  # header refs live in another table; keep list/thread ETags honest
 
     await db.commit()
-    await db.refresh(thread)
-    return await _thread_to_out(thread, db)
+    return _thread_to_out(await _load_thread_for_out(db, thread_id))
 
 
 @router.post("/threads/{thread_id}/posts/{post_id}/heart", response_model=HeartToggleOut)
@@ -898,49 +1032,51 @@ async def toggle_heart(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_session),
 ):
-    post = await db.get(ForumPost, post_id)
-    if not post or post.thread_id != thread_id:
-        raise HTTPException(status_code=404, detail="Post not found")
-
     # Reactions are allowed on locked threads per product note.
 
-    existing = (
-        await db.execute(
-            select(ForumReaction)
-            .where(
-                ForumReaction.post_id == post_id,
-                ForumReaction.user_id == user.id,
-                ForumReaction.kind == "HEART",
-            )
-            .limit(1)
+    # One statement: delete the viewer's heart if present, otherwise insert one, and bump
+    # the denormalized counter by whichever happened. A post outside the thread matches
+    # nothing, so the UPDATE returns no row.
+    post_in_thread = exists().where(ForumPost.id == post_id, ForumPost.thread_id == thread_id)
+    removed = (
+        delete(ForumReaction)
+        .where(
+            ForumReaction.post_id == post_id,
+            ForumReaction.user_id == user.id,
+            ForumReaction.kind == "HEART",
+            post_in_thread,
         )
-    ).scalars().first()
-
-    if existing:
-        # remove
-        await db.delete(existing)
-        # denorm
-        if hasattr(post, "heart_count") and post.heart_count is not None:
-            post.heart_count = max(0, int(post.heart_count) - 1)
-        await db.commit()
-        # count
-        count_stmt = select(func.count(ForumReaction.id)).where(
-            ForumReaction.post_id == post_id, ForumReaction.kind == "HEART"
+        .returning(ForumReaction.id)
+        .cte("removed")
+    )
+    added = (
+        pg_insert(ForumReaction)
+        .from_select(
+            ["post_id", "user_id", "kind"],
+            select(literal(post_id), literal(user.id), literal("HEART"))
+            .where(post_in_thread, ~exists(removed.select())),
         )
-        count = int((await db.execute(count_stmt)).scalar_one() or 0)
-        return HeartToggleOut(hearted=False, count=count)
-    else:
-        # add
-        db.add(ForumReaction(post_id=post_id, user_id=user.id, kind="HEART"))
-        # denorm
-        if hasattr(post, "heart_count") and post.heart_count is not None:
-            post.heart_count = int(post.heart_count) + 1
-        await db.commit()
-        count_stmt = select(func.count(ForumReaction.id)).where(
-            ForumReaction.post_id == post_id, ForumReaction.kind == "HEART"
+        # a concurrent double-click already inserted it; leave the count alone
+        .on_conflict_do_nothing()
+        .returning(ForumReaction.id)
+        .cte("added")
+    )
+    delta = case((exists(added.select()), 1), (exists(removed.select()), -1), else_=0)
+    row = (
+        await db.execute(
+            update(ForumPost)
+            .where(ForumPost.id == post_id, ForumPost.thread_id == thread_id)
+            .values(heart_count=func.greatest(ForumPost.heart_count + delta, 0))
+            .returning(ForumPost.heart_count, ~exists(removed.select()))
+            .execution_options(synchronize_session=False)
         )
-        count = int((await db.execute(count_stmt)).scalar_one() or 0)
-        return HeartToggleOut(hearted=True, count=count)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    count, hearted = row
+    await db.commit()
+    return HeartToggleOut(hearted=hearted, count=int(count))
 
 
 
@@ -1,17 +1,19 @@
+import asyncio
 from urllib.parse import urlparse
 
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Request, Query, status
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Request, Response, Query, status
 from typing import Optional, List
 
 from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, or_
+from sqlalchemy import select, delete, desc, update, or_, tuple_
 
 from app.database import AsyncSessionLocal
 from app.deps.admin import require_admin
 from app.models.issue import Issue, IssueType, IssueStatus
 from app.schemas.issue_schemas import IssueOut, IssueStatusUpdate
 from app.s3 import upload_to_s3, delete_from_s3
+from app.utils.keyset import keyset_cursor, parse_keyset_cursor
 
 # If you want to rate-limit, uncomment the next 2 lines and decorate the endpoint
 # from app.limiter import limiter
@@ -67,7 +69,8 @@ async def report_issue(
     screenshot_url: Optional[str] = None
     if screenshot is not None:
         try:
-            screenshot_url = _upload_screenshot(screenshot)
+            # boto3 is blocking; keep the PUT off the event loop
+            screenshot_url = await asyncio.to_thread(_upload_screenshot, screenshot)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Screenshot upload failed: {e}")
 
@@ -85,8 +88,7 @@ async def report_issue(
     )
 
     db.add(issue)
-    await db.commit()
-    await db.refresh(issue)
+    await db.commit()  # INSERT ... RETURNING fills id and the server defaults
     return issue
 
 # Optional: simple list endpoint (no auth), for internal checks or admin UI later.
@@ -94,13 +96,16 @@ async def report_issue(
 # ---- Public: list (with filters)
 @router.get("", response_model=List[IssueOut])
 async def list_issues(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     q: Optional[str] = Query(None, description="Search in title/description"),
     type: Optional[str] = Query(None, description="BUG|FEATURE|CONTENT|OTHER"),
     status: Optional[str] = Query(None, description="OPEN|IN_PROGRESS|FIXED|WONT_FIX"),
     page: int = Query(1, ge=1),
     page_size: int = Query(25, ge=1, le=200),
+    cursor: Optional[str] = None,  # X-Next-Cursor from the previous page; seeks instead of OFFSET
 ):
+    cursor_key = parse_keyset_cursor(cursor) if cursor else None
     stmt = select(Issue)
 
     if type:
@@ -119,8 +124,18 @@ async def list_issues(
         like = f"%{q}%"
         stmt = stmt.where(or_(Issue.title.ilike(like), Issue.description.ilike(like)))
 
-    stmt = stmt.order_by(desc(Issue.created_at)).offset((page - 1) * page_size).limit(page_size)
-    rows = (await db.execute(stmt)).scalars().all()
+    stmt = stmt.order_by(desc(Issue.created_at), desc(Issue.id))
+    if cursor_key:
+        stmt = stmt.where(tuple_(Issue.created_at, Issue.id) < cursor_key)
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+    stmt = stmt.limit(page_size + 1)  # one extra row tells us whether there is a next page
+    rows = list((await db.execute(stmt)).scalars().all())
+
+    # The body stays a plain list for existing clients; the next page's cursor rides in a header.
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        response.headers["X-Next-Cursor"] = keyset_cursor(rows[-1].created_at, rows[-1].id)
     return rows
 
 
@@ -133,15 +148,19 @@ async def update_issue_status(
     db: AsyncSession = Depends(get_db),
     _admin=Depends(require_admin),
 ):
-    issue = (await db.execute(select(Issue).where(Issue.id == issue_id))).scalars().first()
+    # One UPDATE ... RETURNING instead of SELECT + UPDATE
+    issue = (
+        await db.execute(
+            update(Issue)
+            .where(Issue.id == issue_id)
+            .values(status=IssueStatus(payload.status).value, admin_notes=payload.admin_notes)
+            .returning(Issue)
+        )
+    ).scalars().first()
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
 
-    issue.status = IssueStatus(payload.status) if isinstance(payload.status, str) else payload.status
-    issue.admin_notes = payload.admin_notes
-
     await db.commit()
-    await db.refresh(issue)
     return issue
 
 
@@ -152,19 +171,26 @@ async def delete_issue(
     db: AsyncSession = Depends(get_db),
     _admin=Depends(require_admin),
 ):
-    issue = (await db.execute(select(Issue).where(Issue.id == issue_id))).scalars().first()
-    if not issue:
+    # DELETE ... RETURNING: one round trip, and the screenshot URL comes back with it
+    row = (
+        await db.execute(
+            delete(Issue)
+            .where(Issue.id == issue_id)
+            .returning(Issue.screenshot_url)
+            .execution_options(synchronize_session=False)
+        )
+    ).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Issue not found")
+    await db.commit()
 
     # Remove screenshot (works for both old path 'issues/covers/...' and new 'issues/screenshots/...')
-    if issue.screenshot_url:
-        key = _extract_s3_key(issue.screenshot_url)
+    screenshot_url = row[0]
+    if screenshot_url:
+        key = _extract_s3_key(screenshot_url)
         if key:
             try:
-                delete_from_s3(key)
+                await asyncio.to_thread(delete_from_s3, key)
             except Exception as e:
                 print(f"[issues] Warning: failed to delete S3 object {key}: {e}")
-
-    await db.delete(issue)
-    await db.commit()
     return
@@ -1,11 +1,11 @@
 # app/routes/reading_list_routes.py
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func, delete, exists
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import jwt, JWTError
 
 from app.routes.auth import get_db  # ✅ use your existing DB dependency
 from app.schemas.reading_list_schemas import (
@@ -18,8 +18,7 @@ from app.models.user_model import User
 # ⬇️ Adjust this import if your Series model lives elsewhere
 from app.models.series_model import Series
 
-# Try to read keys from your config; fall back to HS256 if ALGORITHM isn’t exported
-from app.config import SECRET_KEY
+from app.utils.token_utils import CachedViewer, cache_viewer, decode_access_token, get_cached_viewer
 
 import uuid
 from sqlalchemy import select
@@ -35,11 +34,6 @@ from app.schemas.reading_list_schemas import (
     UpdateReadingListItemRequest,
 )
 
-try:
-    from app.config import ALGORITHM  # type: ignore
-except Exception:
-    ALGORITHM = "HS256"
-
 router = APIRouter(prefix="/reading-lists", tags=["reading-lists"])
 MAX_LISTS_PER_USER = 2
 MAX_ITEMS_PER_LIST_NON_ADMIN = 35
@@ -74,16 +68,19 @@ def is_admin_user(user: User) -> bool:
 
 async def get_current_user(
     request: Request, db: AsyncSession = Depends(get_db)
-) -> User:
-    """Lightweight JWT auth that matches your login/signup flow."""
+) -> Union[User, CachedViewer]:
+    """
+    Lightweight JWT auth that matches your login/signup flow.
+    Routes here only read id and role, so a recently seen user comes back as a
+    CachedViewer without touching the database.
+    """
     auth_header = request.headers.get("Authorization", "")
     if not auth_header.startswith("Bearer "):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
     token = auth_header.split(" ", 1)[1].strip()
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-    except JWTError:
+    payload = decode_access_token(token)
+    if payload is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
     # Try common claim keys your token might have
@@ -92,8 +89,13 @@ async def get_current_user(
 
     user: Optional[User] = None
     if user_id is not None:
+        cached = get_cached_viewer(int(user_id))
+        if cached is not None:
+            return cached
         res = await db.execute(select(User).where(User.id == int(user_id)))
         user = res.scalar_one_or_none()
+        if user:
+            return cache_viewer(user)
     elif username:
         res = await db.execute(select(User).where(User.username == str(username)))
         user = res.scalar_one_or_none()
@@ -125,11 +127,12 @@ async def create_reading_list(
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Enforce per-user limit
-    count_stmt = select(func.count(ReadingList.id)).where(
-        ReadingList.user_id == current_user.id
-    )
-    count = (await session.execute(count_stmt)).scalar_one()
+    # Per-user limit and unique name checked in one query
+    check_stmt = select(
+        func.count(ReadingList.id),
+        func.count(ReadingList.id).filter(ReadingList.name == payload.name),
+    ).where(ReadingList.user_id == current_user.id)
+    count, duplicates = (await session.execute(check_stmt)).one()
     if count >= MAX_LISTS_PER_USER:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -137,26 +140,20 @@ async def create_reading_list(
         )
 
     # Unique name per user
-    dup_stmt = select(ReadingList).where(
-        ReadingList.user_id == current_user.id, ReadingList.name == payload.name
-    )
-    duplicate = (await session.execute(dup_stmt)).scalars().first()
-    if duplicate:
+    if duplicates:
         raise HTTPException(status_code=400, detail="You already have a list with that name.")
 
-    new_list = ReadingList(user_id=current_user.id, name=payload.name)
+    # items=[] marks the (empty) collection loaded, so serialization never lazy-loads;
+    # the INSERT returns id, is_public and share_token.
+    new_list = ReadingList(user_id=current_user.id, name=payload.name, items=[])
     session.add(new_list)
-    await session.commit()
-    await session.refresh(new_list)
-
-    # ✅ re-select with items eagerly loaded to avoid async lazy-load during serialization
-    stmt = (
-        select(ReadingList)
-        .where(ReadingList.id == new_list.id)
-        .options(selectinload(ReadingList.items))
-    )
-    full = (await session.execute(stmt)).scalars().first()
-    return full
+    try:
+        await session.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent create of the same name; uq_reading_lists_user_name decides
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="You already have a list with that name.")
+    return new_list
 
 
 # @router.post("/{list_id}/items", response_model=ReadingListOut)
@@ -224,62 +221,40 @@ async def add_series_to_list(
 
     # Optional: verify series exists for cleaner error
     series_exists = (
-        await session.execute(select(func.count(Series.id)).where(Series.id == payload.series_id))
+        await session.execute(select(exists().where(Series.id == payload.series_id)))
     ).scalar_one()
     if not series_exists:
         raise HTTPException(status_code=404, detail="Series not found.")
 
-    # Idempotent add: if already present, optionally update progress and return the list
-    exists_stmt = select(ReadingListItem).where(
-        ReadingListItem.list_id == list_id, ReadingListItem.series_id == payload.series_id
-    )
-    existing = (await session.execute(exists_stmt)).scalars().first()
+    # Idempotent add: if already present, optionally update progress and return the list.
+    # rlist.items is already loaded, so lookups and the cap check need no extra queries.
+    existing = next((i for i in rlist.items if i.series_id == payload.series_id), None)
     if existing:
         next_chapter = normalize_left_off_chapter(payload.left_off_chapter)
         if existing.left_off_chapter != next_chapter:
             existing.left_off_chapter = next_chapter
             await session.commit()
-            rlist = (
-                await session.execute(
-                    select(ReadingList)
-                    .where(ReadingList.id == list_id)
-                    .options(selectinload(ReadingList.items))
-                )
-            ).scalars().first()
         return rlist
-
-    # Enforce per-list item cap for non-admins
-    if not is_admin_user(current_user):
-        current_count = (
-            await session.execute(
-                select(func.count(ReadingListItem.id)).where(ReadingListItem.list_id == list_id)
-            )
-        ).scalar_one()
-        if current_count >= MAX_ITEMS_PER_LIST_NON_ADMIN:
+
+    # Enforce per-list item cap for non-admins
+    if not is_admin_user(current_user):
+        if len(rlist.items) >= MAX_ITEMS_PER_LIST_NON_ADMIN:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"List is full. Non premium users can only have up to {MAX_ITEMS_PER_LIST_NON_ADMIN} items per list.",
             )
 
-    # Proceed to add
-    session.add(
-        ReadingListItem(
-            list_id=list_id,
-            series_id=payload.series_id,
-            left_off_chapter=normalize_left_off_chapter(payload.left_off_chapter),
-        )
-    )
-    await session.commit()
-
-    # Return updated list with items
-    rlist = (
-        await session.execute(
-            select(ReadingList)
-            .where(ReadingList.id == list_id)
-            .options(selectinload(ReadingList.items))
-        )
-    ).scalars().first()
-    return rlist
+    # Proceed to add; appending keeps the loaded collection current for the response
+    # (expire_on_commit=False), so there's no re-SELECT after the commit.
+    item = ReadingListItem(
+        list_id=list_id,
+        series_id=payload.series_id,
+        left_off_chapter=normalize_left_off_chapter(payload.left_off_chapter),
+    )
+    session.add(item)
+    rlist.items.append(item)
+    await session.commit()
+    return rlist
 
 
 @router.patch("/{list_id}/items/{series_id}", response_model=ReadingListOut)
@@ -299,24 +274,12 @@ async def update_series_in_list(
     if not rlist:
         raise HTTPException(status_code=404, detail="List not found.")
 
-    item_stmt = select(ReadingListItem).where(
-        ReadingListItem.list_id == list_id,
-        ReadingListItem.series_id == series_id,
-    )
-    item = (await session.execute(item_stmt)).scalars().first()
+    item = next((i for i in rlist.items if i.series_id == series_id), None)
     if not item:
         raise HTTPException(status_code=404, detail="Series not found in this list.")
 
     item.left_off_chapter = normalize_left_off_chapter(payload.left_off_chapter)
     await session.commit()
-
-    rlist = (
-        await session.execute(
-            select(ReadingList)
-            .where(ReadingList.id == list_id)
-            .options(selectinload(ReadingList.items))
-        )
-    ).scalars().first()
     return rlist
 
 
@@ -327,34 +290,23 @@ async def remove_series_from_list(
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Verify list ownership
-    list_stmt = select(ReadingList).where(
-        ReadingList.id == list_id, ReadingList.user_id == current_user.id
+    # Verify list ownership + eager-load items for the response
+    list_stmt = (
+        select(ReadingList)
+        .where(ReadingList.id == list_id, ReadingList.user_id == current_user.id)
+        .options(selectinload(ReadingList.items))
     )
     rlist = (await session.execute(list_stmt)).scalars().first()
     if not rlist:
         raise HTTPException(status_code=404, detail="List not found.")
 
-    # Delete row
-    del_stmt = (
-        delete(ReadingListItem)
-        .where(ReadingListItem.list_id == list_id, ReadingListItem.series_id == series_id)
-        .execution_options(synchronize_session="fetch")
-    )
-    result = await session.execute(del_stmt)
-    if result.rowcount == 0:
+    item = next((i for i in rlist.items if i.series_id == series_id), None)
+    if not item:
         raise HTTPException(status_code=404, detail="Series not found in this list.")
 
+    # delete-orphan: dropping it from the collection deletes the row at commit
+    rlist.items.remove(item)
     await session.commit()
-
-    # Return updated list
-    rlist = (
-        await session.execute(
-            select(ReadingList)
-            .where(ReadingList.id == list_id)
-            .options(selectinload(ReadingList.items))
-        )
-    ).scalars().first()
     return rlist
 
 
@@ -364,14 +316,16 @@ async def delete_list(
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    list_stmt = select(ReadingList).where(
-        ReadingList.id == list_id, ReadingList.user_id == current_user.id
+    # One DELETE ... RETURNING; the items go with it via ON DELETE CASCADE
+    del_stmt = (
+        delete(ReadingList)
+        .where(ReadingList.id == list_id, ReadingList.user_id == current_user.id)
+        .returning(ReadingList.id)
+        .execution_options(synchronize_session=False)
     )
-    rlist = (await session.execute(list_stmt)).scalars().first()
-    if not rlist:
+    if (await session.execute(del_stmt)).first() is None:
         raise HTTPException(status_code=404, detail="List not found.")
 
-    await session.delete(rlist)
     await session.commit()
 
 
@@ -401,7 +355,6 @@ async def share_reading_list(
         rlist.share_token = uuid.uuid4()
 
     await session.commit()
-    await session.refresh(rlist)
     return rlist
 
 # --- NEW: unshare a list (owner only) ---
@@ -422,7 +375,6 @@ async def unshare_reading_list(
 
     rlist.is_public = False
     await session.commit()
-    await session.refresh(rlist)
     return rlist
 
 # --- NEW: public read by token (no auth) ---
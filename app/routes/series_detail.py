@@ -1,3 +1,4 @@
+import asyncio
 from typing import Optional
 
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Request
@@ -13,7 +14,8 @@ from app.s3 import upload_to_s3
 from app.models.user_vote import UserVote
 from app.utils.token_utils import get_current_user
 from fastapi.responses import JSONResponse
-from sqlalchemy import func
+from sqlalchemy import exists, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.deps.admin import require_admin, is_admin, can_submit_series
 from app.models.series_model import SeriesApprovalStatus
 from datetime import datetime, timezone
@@ -48,7 +50,9 @@ async def create_or_update_series_detail(
         detail.synopsis = synopsis
         if file:
             file.file.seek(0)
-            file_url = upload_to_s3(
+            # boto3 is blocking; upload on a worker thread so other requests keep flowing
+            file_url = await asyncio.to_thread(
+                upload_to_s3,
                 file.file,
                 file.filename,
                 file.content_type,
@@ -59,7 +63,8 @@ async def create_or_update_series_detail(
         if not file:
             raise HTTPException(status_code=400, detail="Detail cover image is required")
         file.file.seek(0)
-        file_url = upload_to_s3(
+        file_url = await asyncio.to_thread(
+            upload_to_s3,
             file.file,
             file.filename,
             file.content_type,
@@ -83,7 +88,6 @@ async def create_or_update_series_detail(
         elif is_owner_of_pending:
             series.approval_status = SeriesApprovalStatus.PENDING.value
             await session.commit()
-    await session.refresh(detail)
     return detail
 
 
@@ -107,57 +111,65 @@ async def vote_series_detail(
     if category not in valid_categories or not (1 <= score <= 10):
         raise HTTPException(status_code=400, detail="Invalid vote")
 
-    series = await session.get(Series, series_id)
-    if not series:
+    row = (
+        await session.execute(
+            select(Series.approval_status, SeriesDetail.id)
+            .outerjoin(SeriesDetail, SeriesDetail.series_id == Series.id)
+            .where(Series.id == series_id)
+        )
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Series not found")
-    if series.approval_status != SeriesApprovalStatus.APPROVED.value:
+    approval_status, detail_id = row
+    if approval_status != SeriesApprovalStatus.APPROVED.value or detail_id is None:
         raise HTTPException(status_code=404, detail="Series detail not found")
 
-    detail = await session.scalar(
-        select(SeriesDetail).where(SeriesDetail.series_id == series_id)
+    # One statement records the vote and applies it. The INSERT does nothing if this
+    # category was already voted on (unique_user_vote), and both UPDATEs only run when
+    # it inserted. CTEs see the table as it was before the statement, so the prior-vote
+    # probe doesn't count the vote being cast.
+    total_field, count_field = valid_categories[category]
+    vote = (
+        pg_insert(UserVote)
+        .values(user_id=user.id, series_id=series_id, category=category, score=score)
+        .on_conflict_do_nothing(index_elements=["user_id", "series_id", "category"])
+        .returning(UserVote.id)
+        .cte("vote")
     )
-    if not detail:
-        raise HTTPException(status_code=404, detail="Series detail not found")
-
-    # ❌ Already voted on this category?
-    existing_vote = await session.scalar(
-        select(UserVote).where(
-            UserVote.user_id == user.id,
-            UserVote.series_id == series_id,
-            UserVote.category == category
-        )
-    )
-    if existing_vote:
-        raise HTTPException(status_code=403, detail="You already voted on this category")
-
-    # ✅ Apply vote
-    total_field, count_field = valid_categories[category]
-    setattr(detail, total_field, getattr(detail, total_field) + score)
-    setattr(detail, count_field, getattr(detail, count_field) + 1)
-
-    # 🧠 Check if this is user's FIRST vote for this series
-    previous_votes = await session.execute(
-        select(UserVote).where(
-            UserVote.user_id == user.id,
-            UserVote.series_id == series_id
-        )
-    )
-    has_prior_votes = previous_votes.first() is not None
+    inserted = exists(vote.select())
+    # ✅ Increment only on the user's first vote for this series
+    first_vote_bump = (
+        update(Series)
+        .where(
+            Series.id == series_id,
+            inserted,
+            ~exists().where(UserVote.user_id == user.id, UserVote.series_id == series_id),
+        )
+        .values(vote_count=func.coalesce(Series.vote_count, 0) + 1)
+        .returning(Series.id)
+        .cte("first_vote_bump")
+    )
+    total_col = getattr(SeriesDetail, total_field)
+    count_col = getattr(SeriesDetail, count_field)
+    detail = (
+        await session.execute(
+            update(SeriesDetail)
+            .where(SeriesDetail.id == detail_id, inserted)
+            .values({
+                total_field: func.coalesce(total_col, 0) + score,
+                count_field: func.coalesce(count_col, 0) + 1,
+            })
+            .returning(SeriesDetail)
+            .add_cte(first_vote_bump)
+            .execution_options(populate_existing=True)
+        )
+    ).scalars().first()
+    if detail is None:
+        # ❌ Already voted on this category
+        raise HTTPException(status_code=403, detail="You already voted on this category")
 
-    # ✅ Increment only on first vote
-    if not has_prior_votes:
-        series.vote_count = (series.vote_count or 0) + 1
-
-    # 🗳️ Save this vote
-    session.add(UserVote(
-        user_id=user.id,
-        series_id=series_id,
-        category=category,
-        score=score
-    ))
-    await session.commit()
-    await session.refresh(detail)
-    return detail
+    await session.commit()
+    return detail
 
 
 
@@ -167,15 +179,17 @@ async def get_series_detail(
     request: Request,
     session: AsyncSession = Depends(get_async_session),
 ):
-    # Get series first (always exists in this use case)
-    series = await session.get(Series, series_id)
-    if not series:
-        raise HTTPException(status_code=404, detail="Series not found")
-
-    result = await session.execute(
-        select(SeriesDetail).where(SeriesDetail.series_id == series_id)
-    )
-    detail = result.scalars().first()
+    # Series and its detail in one round trip; detail is None until someone creates it
+    row = (
+        await session.execute(
+            select(Series, SeriesDetail)
+            .outerjoin(SeriesDetail, SeriesDetail.series_id == Series.id)
+            .where(Series.id == series_id)
+        )
+    ).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Series not found")
+    series, detail = row
 
     # Create default empty detail if not yet created
     if not detail:
@@ -219,27 +233,23 @@ async def get_series_detail(
         "Drama / Fighting": "Drama / Fighting",
     }
 
-    vote_scores = {}
+    # Distinct voters per category and, for a signed-in viewer, their own score, in one pass
+    columns = [UserVote.category, func.count(func.distinct(UserVote.user_id))]
     if user:
-        results = await session.execute(
-            select(UserVote.category, UserVote.score).where(
-                UserVote.user_id == user.id,
-                UserVote.series_id == series_id
-            )
-        )
-        vote_scores = {
-            CATEGORY_LABELS.get(row[0], row[0]): row[1]
-            for row in results.all()
-        }
-
-    vote_counts = {}
-    count_results = await session.execute(
-        select(UserVote.category, func.count(func.distinct(UserVote.user_id)))
+        columns.append(func.max(UserVote.score).filter(UserVote.user_id == user.id))
+    vote_results = await session.execute(
+        select(*columns)
         .where(UserVote.series_id == series_id)
         .group_by(UserVote.category)
     )
-    for cat, count in count_results:
-        vote_counts[CATEGORY_LABELS.get(cat, cat)] = count
+
+    vote_scores = {}
+    vote_counts = {}
+    for cat, count, *own_score in vote_results:
+        label = CATEGORY_LABELS.get(cat, cat)
+        vote_counts[label] = count
+        if own_score and own_score[0] is not None:
+            vote_scores[label] = own_score[0]
 
     response_data = jsonable_encoder(detail)
     response_data["vote_scores"] = vote_scores
@@ -248,7 +258,7 @@ async def get_series_detail(
     response_data["artist"] = series.artist
     response_data["title"] = series.title
     response_data["genre"] = series.genre
-    response_data["type"] = series.type.value if getattr(series, "type", None) else None
+    response_data["type"] = series.type
     response_data["cover_url"] = series.cover_url
     response_data["approval_status"] = series.approval_status
     response_data["submitted_by_id"] = series.submitted_by_id
@@ -1,3 +1,5 @@
+import asyncio
+import logging
 from decimal import Decimal
 from typing import List, Optional
 from sqlalchemy import select, and_, or_, delete
@@ -17,6 +19,8 @@ from fastapi import Query, HTTPException
 from app.deps.admin import require_admin, require_series_submitter, can_submit_series, is_admin
 from app.utils.token_utils import get_current_user
 from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -46,7 +50,7 @@ async def delete_series(
     if series.cover_url:
         try:
             key = extract_s3_key(series.cover_url)
-            delete_from_s3(key)
+            await asyncio.to_thread(delete_from_s3, key)
         except Exception as e:
             print(f"Warning: Failed to delete image from S3: {e}")
 
@@ -55,7 +59,7 @@ async def delete_series(
     if detail and detail.series_cover_url:
         try:
             detail_key = extract_s3_key(detail.series_cover_url)
-            delete_from_s3(detail_key)
+            await asyncio.to_thread(delete_from_s3, detail_key)
         except Exception as e:
             print(f"Warning: Failed to delete detail image from S3: {e}")
 
@@ -71,7 +75,10 @@ async def create_series(
     current_user: User = Depends(require_series_submitter),
     db: AsyncSession = Depends(get_db)
 ):
-    image_url = upload_to_s3(cover.file, cover.filename, cover.content_type, folder=series.title)
+    # boto3 is blocking; upload on a worker thread so other requests keep flowing
+    image_url = await asyncio.to_thread(
+        upload_to_s3, cover.file, cover.filename, cover.content_type, folder=series.title
+    )
 
     new_series = Series(
         title=series.title,
@@ -89,7 +96,6 @@ async def create_series(
 
     db.add(new_series)
     await db.commit()
-    await db.refresh(new_series)
     return new_series
 
 
@@ -147,10 +153,11 @@ async def update_series(
     if cover is not None and cover.filename:
         if series.cover_url:
             try:
-                delete_from_s3(extract_s3_key(series.cover_url))
+                await asyncio.to_thread(delete_from_s3, extract_s3_key(series.cover_url))
             except Exception as exc:
                 print(f"Warning: Failed to delete old series cover from S3: {exc}")
-        series.cover_url = upload_to_s3(
+        series.cover_url = await asyncio.to_thread(
+            upload_to_s3,
             cover.file,
             cover.filename,
             cover.content_type,
@@ -158,7 +165,6 @@ async def update_series(
         )
 
     await session.commit()
-    await session.refresh(series)
     return series
 
 
@@ -286,7 +292,6 @@ async def approve_series(
     series.approved_at = datetime.now(timezone.utc).isoformat()
 
     await db.commit()
-    await db.refresh(series)
     return series
 
 
@@ -306,7 +311,7 @@ async def get_ranked_series(
 
     query = await db.execute(stmt)
     results = query.all()
-    print(f"🔍 Total results from DB (joined): {len(results)}")
+    logger.debug("Total results from DB (joined): %d", len(results))
 
     ranked_series = []
     for series, detail in results:
@@ -335,15 +340,14 @@ async def get_ranked_series(
             "cover_url": series.cover_url,
             "vote_count": series.vote_count or 0,
             "final_score": final_score,
-            "status": series.status.name if series.status else None,
+            "status": series.status,
         })
 
     # Split and sort
     ranked = [s for s in ranked_series if s["final_score"] > 0]
     unranked = [s for s in ranked_series if s["final_score"] == 0]
 
-    print(f"🏆 Ranked series: {len(ranked)}")
-    print(f"❌ Unranked series: {len(unranked)}")
+    logger.debug("Ranked series: %d, unranked series: %d", len(ranked), len(unranked))
 
     ranked.sort(key=lambda x: x["final_score"], reverse=True)
 
@@ -356,8 +360,9 @@ async def get_ranked_series(
 
     start = (page - 1) * page_size
     end = start + page_size
-    print(f"📦 Returning {len(final_output[start:end])} items for page {page} (range {start}:{end})")
-    return final_output[start:end]
+    page_items = final_output[start:end]
+    logger.debug("Returning %d items for page %d (range %d:%d)", len(page_items), page, start, end)
+    return page_items
 
 
 
@@ -429,7 +434,7 @@ async def get_series_summary(
             "cover_url": s.cover_url,
             "vote_count": s.vote_count or 0,
             "final_score": final_score,
-            "status": s.status.name if s.status else None,
+            "status": s.status,
         })
 
     ranked = [x for x in ranked_series if x["final_score"] > 0]
@@ -469,7 +474,7 @@ async def get_series_summary(
         "cover_url": series_row.cover_url,
         "vote_count": series_row.vote_count or 0,
         "final_score": final_score,
-        "status": series_row.status.name if series_row.status else None,
+        "status": series_row.status,
         "rank": None,
     }
 
@@ -524,7 +529,7 @@ async def search_series(
             "cover_url": series.cover_url,
             "vote_count": series.vote_count or 0,
             "final_score": final_score,
-            "status": series.status.name if series.status else None,
+            "status": series.status,
         })
 
     ranked = [s for s in ranked_series if s["final_score"] > 0]
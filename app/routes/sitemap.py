@@ -7,7 +7,7 @@ from datetime import datetime, timezone
 from typing import List, Tuple
 
 from fastapi import APIRouter, Depends, Response
-from sqlalchemy import func, select
+from sqlalchemy import func, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_async_session
@@ -89,21 +89,30 @@ async def sitemap_index(session: AsyncSession = Depends(get_async_session)) -> R
       - /sitemaps/forum-1.xml, /sitemaps/forum-2.xml, ...
     Includes <lastmod> on each <sitemap>.
     """
-    # total threads and latest thread activity for <lastmod>
-    total_threads = await session.scalar(select(func.count(ForumThread.id))) or 0
-    latest_forum_activity = await session.scalar(
-        select(func.max(func.coalesce(ForumThread.last_post_at, ForumThread.updated_at)))
-    )
-    total_series = await session.scalar(
-        select(func.count(Series.id)).where(
-            Series.approval_status == SeriesApprovalStatus.APPROVED.value
-        )
-    ) or 0
-    latest_series_activity = await session.scalar(
-        select(func.max(Series.approved_at)).where(
-            Series.approval_status == SeriesApprovalStatus.APPROVED.value
-        )
-    )
+    # counts and latest activity for <lastmod>: one aggregate per table, one round-trip
+    forum_stats = select(
+        func.count(ForumThread.id).label("total"),
+        func.max(func.coalesce(ForumThread.last_post_at, ForumThread.updated_at)).label("latest"),
+    ).subquery()
+    series_stats = (
+        select(func.count(Series.id).label("total"), func.max(Series.approved_at).label("latest"))
+        .where(Series.approval_status == SeriesApprovalStatus.APPROVED.value)
+        .subquery()
+    )
+    stats = (
+        await session.execute(
+            select(
+                forum_stats.c.total.label("total_threads"),
+                forum_stats.c.latest.label("latest_forum_activity"),
+                series_stats.c.total.label("total_series"),
+                series_stats.c.latest.label("latest_series_activity"),
+            ).select_from(forum_stats.join(series_stats, true()))
+        )
+    ).one()
+    total_threads = stats.total_threads or 0
+    latest_forum_activity = stats.latest_forum_activity
+    total_series = stats.total_series or 0
+    latest_series_activity = stats.latest_series_activity
 
     sitemaps: List[Tuple[str, str]] = [
         (STATIC_SITEMAP_URL, _fmt_lastmod(datetime.now(timezone.utc)))
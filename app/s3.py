@@ -13,11 +13,14 @@ s3 = boto3.client(
     aws_secret_access_key=AWS_SECRET_ACCESS_KEY
 )
 
+_UNSAFE_FOLDER_RE = re.compile(r'[^a-zA-Z0-9_\-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SAFE_FILENAME_RE = re.compile(r'[^a-zA-Z0-9._-]+')
+_DASH_RUN_RE = re.compile(r'-{2,}')
+
 def sanitize_folder_name(name: str) -> str:
     # Remove or replace any non-safe S3 characters
-    return re.sub(r'[^a-zA-Z0-9_\-]', '_', name)
-
-_SAFE_FILENAME_RE = re.compile(r'[^a-zA-Z0-9._-]+')
+    return _UNSAFE_FOLDER_RE.sub('_', name)
 
 # def upload_to_s3(file_bytes, filename: str, content_type: str, folder: str) -> str:
 #     sanitized_folder = sanitize_folder_name(folder)
@@ -57,9 +60,9 @@ def sanitize_filename(name: str) -> str:
     - Collapse repeats
     """
     name = name.strip()
-    name = re.sub(r'\s+', '-', name)          # spaces -> dash
+    name = _WHITESPACE_RE.sub('-', name)      # spaces -> dash
     name = _SAFE_FILENAME_RE.sub('-', name)   # unsafe -> dash
-    name = re.sub(r'-{2,}', '-', name)        # collapse ---
+    name = _DASH_RUN_RE.sub('-', name)        # collapse ---
     if not name:
         name = "file"
     return name
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 from typing import List, Optional
 
@@ -16,8 +18,8 @@ class ForumPostOut(BaseModel):
     id: int
     author_username: Optional[str] = None
     content_markdown: str
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
     series_refs: List[SeriesRefOut] = []
     parent_id: Optional[int] = None
     heart_count: int = 0
@@ -28,10 +30,10 @@ class ForumThreadOut(BaseModel):
     id: int
     title: str
     author_username: Optional[str] = None
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
     post_count: int
-    last_post_at: str
+    last_post_at: datetime
     series_refs: List[SeriesRefOut] = []
     locked: bool = False
     latest_first: bool = False
@@ -73,6 +75,7 @@ class PageOut(BaseModel):
     total_pages: int
     has_prev: bool
     has_next: bool
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page (keyset)
 
 
 class ThreadPostsPageOut(BaseModel):
@@ -83,4 +86,5 @@ class ThreadPostsPageOut(BaseModel):
     total_top_level: int              # number of top-level replies (excludes OP)
     total_pages: int
     has_prev: bool
-    has_next: bool
\ No newline at end of file
+    has_next: bool
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page of roots
@@ -3,10 +3,16 @@ from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional
 
 class UserCreate(BaseModel):
-    username: str
-    password: str
-    email: EmailStr
-    captcha_token: str
+    username: str
+    password: str
+    email: EmailStr
+    captcha_token: str
+
+    # EmailStr already strips; stored emails are lowercase, so normalize once at parse time
+    @field_validator("email", mode="after")
+    @classmethod
+    def lowercase_email(cls, v: str) -> str:
+        return v.lower()
 
     # @field_validator("email")
     @classmethod
@@ -41,4 +47,9 @@ class ResendVerification(BaseModel):
     username: Optional[str] = None
     captcha_token: Optional[str] = None
 
+    @field_validator("email", mode="after")
+    @classmethod
+    def lowercase_email(cls, v: Optional[str]) -> Optional[str]:
+        return v.lower() if v else v
+
 
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import os
 import httpx
+from cachetools import TTLCache
 import google.auth
 from dotenv import load_dotenv
 from fastapi import HTTPException
@@ -9,6 +11,18 @@ from google.auth.transport.requests import Request as GoogleAuthRequest
 
 load_dotenv()
 
+# Recent outcomes keyed by sha256 of the token. reCAPTCHA tokens are only
+# valid for two minutes, so a double-submitted or retried token is answered
+# here instead of with another round-trip to Google. A token that already
+# passed is single-use and is rejected the same way Google would reject it.
+CAPTCHA_RESULT_TTL_SECONDS = 120
+_captcha_results: TTLCache = TTLCache(maxsize=4096, ttl=CAPTCHA_RESULT_TTL_SECONDS)
+
+
+def _token_digest(captcha_token: str | None) -> str:
+    return hashlib.sha256((captcha_token or "").strip().encode("utf-8")).hexdigest()
+
+
 def _truthy(value: str | None) -> bool:
     return str(value or "").strip().lower() in {"1", "true", "yes", "on"}
 
@@ -123,6 +137,22 @@ async def _verify_captcha_legacy(captcha_token: str):
 
 
 async def verify_captcha(captcha_token: str, request=None):
-    if _enterprise_enabled():
-        return await _verify_captcha_enterprise(captcha_token, request=request)
-    return await _verify_captcha_legacy(captcha_token)
+    key = _token_digest(captcha_token)
+    cached = _captcha_results.get(key)
+    if cached is not None:
+        ok, detail = cached
+        if ok:
+            detail = "Captcha verification failed (timeout-or-duplicate)"
+        raise HTTPException(status_code=400, detail=detail)
+
+    try:
+        if _enterprise_enabled():
+            await _verify_captcha_enterprise(captcha_token, request=request)
+        else:
+            await _verify_captcha_legacy(captcha_token)
+    except HTTPException as e:
+        # Only the provider's verdict is cached; config and network errors are retried.
+        if e.status_code == 400:
+            _captcha_results[key] = (False, e.detail)
+        raise
+    _captcha_results[key] = (True, None)
@@ -88,6 +88,10 @@ def reject_disallowed_images(markdown: str) -> None:
         _best_effort_head_check(url)
 
     text = markdown or ""
+    # Most posts carry no images; skip both regex scans unless one could match.
+    if "](" not in text and "<" not in text:
+        return
+
     for m in IMG_MD_RE.finditer(text):
         _check_one(m.group("src"))
 
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+
+import httpx
+from cachetools import TTLCache
+from jose import jwt
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = frozenset({"accounts.google.com", "https://accounts.google.com"})
+# Used when Google's response carries no max-age
+DEFAULT_CERTS_TTL_SECONDS = 3600
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+# Google's signing keys (a JWKS) and when they expire, per the response's Cache-Control
+_certs_cache: dict = {"jwks": None, "expires_at": 0.0}
+
+# SPAs re-send the same ID token on tab focus; keep decoded claims briefly.
+_claims_cache: TTLCache = TTLCache(maxsize=1024, ttl=5)
+
+
+async def _fetch_google_certs() -> tuple[dict, int]:
+    async with httpx.AsyncClient(timeout=5) as client:
+        res = await client.get(GOOGLE_CERTS_URL)
+    res.raise_for_status()
+    match = _MAX_AGE_RE.search(res.headers.get("cache-control", ""))
+    ttl = int(match.group(1)) if match else DEFAULT_CERTS_TTL_SECONDS
+    return res.json(), ttl
+
+
+async def get_google_certs() -> dict:
+    if _certs_cache["jwks"] is None or time.monotonic() >= _certs_cache["expires_at"]:
+        jwks, ttl = await _fetch_google_certs()
+        _certs_cache.update(jwks=jwks, expires_at=time.monotonic() + ttl)
+    return _certs_cache["jwks"]
+
+
+async def verify_google_id_token(token: str, client_id: str) -> dict:
+    """
+    Verify a Google ID token's signature, audience, expiry and issuer against
+    the cached JWKS and return its claims. Raises on any invalid token.
+    """
+    cache_key = (hashlib.sha256(token.encode("utf-8")).hexdigest(), client_id)
+    claims = _claims_cache.get(cache_key)
+    if claims is not None:
+        return claims
+
+    jwks = await get_google_certs()
+    # One RS256 signature check against an in-memory key; cheap enough for the event loop.
+    claims = jwt.decode(
+        token,
+        jwks,
+        algorithms=["RS256"],
+        audience=client_id,
+        options={"verify_at_hash": False},
+    )
+    if claims.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError(f"Wrong issuer: {claims.get('iss')!r}")
+
+    _claims_cache[cache_key] = claims
+    return claims
@@ -0,0 +1,26 @@
+# app/utils/keyset.py
+import re
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+
+_CURSOR_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Plain digits only: int() would also take signs, spaces and "1_000" separators.
+_CURSOR_RE = re.compile(r"^(\d{1,17})_(\d{1,10})$")
+_MAX_ROW_ID = 2**31 - 1  # ids are int4 columns
+
+
+def keyset_cursor(ts: datetime, row_id: int) -> str:
+    # "<timestamp in epoch microseconds>_<id>": URL-safe and exact
+    return f"{(ts - _CURSOR_EPOCH) // timedelta(microseconds=1)}_{row_id}"
+
+
+def parse_keyset_cursor(cursor: str) -> tuple[datetime, int]:
+    match = _CURSOR_RE.match(cursor)
+    if not match or int(match.group(2)) > _MAX_ROW_ID:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        ts = _CURSOR_EPOCH + timedelta(microseconds=int(match.group(1)))
+    except OverflowError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return ts, int(match.group(2))
@@ -0,0 +1,72 @@
+# app/utils/password_utils.py
+import asyncio
+import os
+from typing import Tuple
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from fastapi import HTTPException
+from passlib.hash import bcrypt
+
+# Argon2id; memory_cost is in KiB (64 MiB).
+_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
+
+# At most one KDF per core; once this many callers are already queued, shed load
+# with a 503 so a login flood can't monopolize the thread pool.
+KDF_CONCURRENCY = os.cpu_count() or 4
+KDF_MAX_WAITING = 50
+_kdf_semaphore = asyncio.Semaphore(KDF_CONCURRENCY)
+_kdf_waiting = 0
+
+
+def _is_legacy_bcrypt(hashed: str) -> bool:
+    return hashed.startswith("$2")
+
+
+def _verify_sync(password: str, hashed: str) -> Tuple[bool, bool]:
+    if not hashed:
+        # e.g. Google-only accounts have no password
+        return False, False
+
+    if _is_legacy_bcrypt(hashed):
+        try:
+            ok = bcrypt.verify(password, hashed)
+        except ValueError:
+            return False, False
+        # Upgrade bcrypt hashes to Argon2id on the next successful login
+        return ok, ok
+
+    try:
+        _hasher.verify(hashed, password)
+    except (VerificationError, InvalidHashError):
+        return False, False
+    return True, _hasher.check_needs_rehash(hashed)
+
+
+async def _run_kdf(func, *args):
+    global _kdf_waiting
+    if _kdf_semaphore.locked() and _kdf_waiting >= KDF_MAX_WAITING:
+        raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
+
+    _kdf_waiting += 1
+    try:
+        await _kdf_semaphore.acquire()
+    finally:
+        _kdf_waiting -= 1
+    try:
+        # KDFs are deliberately slow; keep them off the event loop.
+        return await asyncio.to_thread(func, *args)
+    finally:
+        _kdf_semaphore.release()
+
+
+async def hash_password(password: str) -> str:
+    return await _run_kdf(_hasher.hash, password)
+
+
+async def verify_password(password: str, hashed: str) -> Tuple[bool, bool]:
+    """
+    Returns (matches, needs_rehash). needs_rehash is True for legacy bcrypt
+    hashes and Argon2 hashes made with outdated parameters.
+    """
+    return await _run_kdf(_verify_sync, password, hashed or "")
@@ -1,7 +1,10 @@
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import os
+import time
+from typing import NamedTuple, Optional, Protocol
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -44,8 +47,28 @@ def _get_secret_key() -> str:
         raise RuntimeError("SECRET_KEY is too short; use at least 32 characters")
     return secret
 
-def create_access_token(user: User) -> str:
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+# Repeat logins with identical claims inside the same minute reuse the signed token.
+# exp is pinned to the start of the minute bucket, so a cache hit is identical to re-signing.
+TOKEN_CACHE_BUCKET_SECONDS = 60
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_BUCKET_SECONDS)
+
+class TokenSubject(Protocol):
+    """Anything carrying the claims we sign: a User, or a row of just these columns."""
+    id: int
+    username: str
+    role: Optional[str]
+
+
+def create_access_token(user: TokenSubject) -> str:
+    secret = _get_secret_key()
+    bucket = int(time.time()) // TOKEN_CACHE_BUCKET_SECONDS
+    cache_key = (user.id, user.username, user.role, bucket, secret)
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    bucket_start = datetime.fromtimestamp(bucket * TOKEN_CACHE_BUCKET_SECONDS, tz=timezone.utc)
+    expire = bucket_start + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode = {
         "id": user.id,         # what get_current_user expects
         "sub": user.username,  # helpful for auditing/logs
@@ -53,10 +76,58 @@ def create_access_token(user: User) -> str:
         "exp": expire,
     }
     try:
-        return jwt.encode(to_encode, _get_secret_key(), algorithm=ALGORITHM)
+        token = jwt.encode(to_encode, secret, algorithm=ALGORITHM)
     except Exception as e:
         raise RuntimeError(f"JWT encode failed: {e}")
+    _token_cache[cache_key] = token
+    return token
+
+
+# Clients send the same bearer token on every request; remember verified
+# claims per token and only re-check exp on a hit.
+DECODED_TOKEN_CACHE_SECONDS = 300
+_decoded_token_cache: TTLCache = TTLCache(maxsize=4096, ttl=DECODED_TOKEN_CACHE_SECONDS)
+
+
+def decode_access_token(token: str) -> Optional[dict]:
+    """Verified claims of an access token, or None if it is invalid or expired."""
+    claims = _decoded_token_cache.get(token)
+    if claims is not None:
+        exp = claims.get("exp")
+        return claims if exp is None or exp > time.time() else None
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    _decoded_token_cache[token] = claims
+    return claims
+
 
+class CachedViewer(NamedTuple):
+    """The User columns auth-only dependencies need, detached from any session."""
+    id: int
+    username: str
+    role: Optional[str]
+
+
+# user id -> CachedViewer for dependencies that only need identity and role.
+# Role changes call forget_cached_viewer; anything else catches up within the TTL.
+VIEWER_CACHE_SECONDS = 60
+_viewer_cache: TTLCache = TTLCache(maxsize=10_000, ttl=VIEWER_CACHE_SECONDS)
+
+
+def get_cached_viewer(user_id: int) -> Optional[CachedViewer]:
+    return _viewer_cache.get(user_id)
+
+
+def cache_viewer(user: User) -> CachedViewer:
+    viewer = CachedViewer(user.id, user.username, user.role)
+    _viewer_cache[user.id] = viewer
+    return viewer
+
+
+def forget_cached_viewer(user_id: int) -> None:
+    _viewer_cache.pop(user_id, None)
 
 
 async def get_current_user(
@@ -68,12 +139,9 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("id")  # 🔑 Uses the updated token payload
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+    payload = decode_access_token(token)
+    user_id: Optional[int] = payload.get("id") if payload else None  # 🔑 Uses the updated token payload
+    if user_id is None:
         raise credentials_exception
 
     user = await session.get(User, user_id)
@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
 
+import app.main as main_module
 from app.main import app
 
 
@@ -28,6 +29,28 @@ def test_redirect_www_redirects_bare_domain_to_www():
     assert response.headers["location"] == "http://www.toonranks.com/health"
 
 
+def test_redirect_www_keeps_query_string():
+    response = client.get(
+        "/health?ref=home",
+        headers={"host": "toonranks.com"},
+        follow_redirects=False,
+    )
+
+    assert response.status_code == 301
+    assert response.headers["location"] == "http://www.toonranks.com/health?ref=home"
+
+
+def test_redirect_www_keeps_percent_encoded_path():
+    response = client.get(
+        "/series/one%20piece",
+        headers={"host": "toonranks.com"},
+        follow_redirects=False,
+    )
+
+    assert response.status_code == 301
+    assert response.headers["location"] == "http://www.toonranks.com/series/one%20piece"
+
+
 def test_redirect_www_skips_sitemap_paths_for_bare_domain():
     response = client.get(
         "/sitemap-not-real.xml",
@@ -36,3 +59,67 @@ def test_redirect_www_skips_sitemap_paths_for_bare_domain():
     )
 
     assert response.status_code == 404
+
+
+def test_startup_skips_migrations_unless_enabled(monkeypatch):
+    calls = []
+
+    async def fake_run_migrations():
+        calls.append(True)
+
+    monkeypatch.setattr(main_module, "run_migrations", fake_run_migrations)
+    monkeypatch.delenv("RUN_MIGRATIONS", raising=False)
+    with TestClient(app):
+        pass
+    assert calls == []
+
+    monkeypatch.setenv("RUN_MIGRATIONS", "1")
+    with TestClient(app):
+        pass
+    assert calls == [True]
+
+
+def test_cors_preflight_is_answered_for_allowed_origin():
+    response = client.options(
+        "/auth/login",
+        headers={
+            "origin": "https://www.toonranks.com",
+            "access-control-request-method": "POST",
+            "access-control-request-headers": "authorization, content-type",
+        },
+    )
+
+    assert response.status_code == 204
+    assert response.headers["access-control-allow-origin"] == "https://www.toonranks.com"
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-allow-headers"] == "authorization, content-type"
+    assert "POST" in response.headers["access-control-allow-methods"]
+
+
+def test_cors_preflight_rejects_unknown_origin():
+    response = client.options(
+        "/auth/login",
+        headers={
+            "origin": "https://evil.example",
+            "access-control-request-method": "POST",
+        },
+    )
+
+    assert response.status_code == 400
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_cors_headers_added_to_simple_request_from_allowed_origin():
+    response = client.get("/health", headers={"origin": "http://localhost:5173"})
+
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+    assert response.headers["vary"] == "Origin"
+    assert response.headers["access-control-expose-headers"] == "X-Next-Cursor"
+
+
+def test_cors_headers_not_added_for_unknown_origin():
+    response = client.get("/health", headers={"origin": "https://evil.example"})
+
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
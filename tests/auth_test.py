@@ -1,6 +1,9 @@
 from types import SimpleNamespace
 
+from argon2 import PasswordHasher
 from fastapi.testclient import TestClient
+from passlib.hash import bcrypt
+from sqlalchemy.exc import IntegrityError
 
 from app.main import app
 from app.routes import auth
@@ -29,20 +32,32 @@ class FakeExecuteResult:
     def scalars(self):
         return FakeScalarResult(rows=self._rows, one=self._one)
 
+    def all(self):
+        return self._rows
+
+    def one(self):
+        return self._one
+
+    def first(self):
+        return self._one
+
     def scalar_one_or_none(self):
         return self._one
 
 
 class FakeAuthSession:
-    def __init__(self, *, execute_result=None):
+    def __init__(self, *, execute_result=None, commit_error=None):
         self.execute_result = execute_result or FakeExecuteResult()
+        self.commit_error = commit_error
+        self.executed = []
         self.added = []
         self.committed = False
         self.flushed = False
         self.refreshed = []
         self.rolled_back = False
 
-    async def execute(self, _stmt):
+    async def execute(self, stmt):
+        self.executed.append(stmt)
         return self.execute_result
 
     def add(self, item):
@@ -52,6 +67,8 @@ class FakeAuthSession:
         self.flushed = True
 
     async def commit(self):
+        if self.commit_error:
+            raise self.commit_error
         self.committed = True
 
     async def refresh(self, item):
@@ -75,18 +92,24 @@ async def fake_verify_captcha(*args, **kwargs):
     return None
 
 
+def signup_probe(*, email_taken=False, username_taken=False):
+    return FakeExecuteResult(
+        one=SimpleNamespace(email_taken=email_taken, username_taken=username_taken)
+    )
+
+
 def test_signup_creates_unverified_user_with_normalized_email(monkeypatch):
-    session = FakeAuthSession()
+    session = FakeAuthSession(execute_result=signup_probe())
     cleanup = override_auth_db(session)
     sent_emails = []
 
     monkeypatch.setattr(auth, "verify_captcha", fake_verify_captcha)
     monkeypatch.setattr(auth, "generate_email_token", lambda email: f"token-for-{email}")
-    monkeypatch.setattr(
-        auth,
-        "send_verification_email",
-        lambda email, token: sent_emails.append((email, token)),
-    )
+
+    async def fake_send(email, token):
+        sent_emails.append((email, token))
+
+    monkeypatch.setattr(auth, "send_verification_email", fake_send)
 
     try:
         response = client.post(
@@ -106,20 +129,20 @@ def test_signup_creates_unverified_user_with_normalized_email(monkeypatch):
         "message": "User created successfully. Please verify your email.",
         "token": "token-for-reader@gmail.com",
     }
-    assert session.flushed is True
     assert session.committed is True
     assert session.rolled_back is False
+    assert session.refreshed == []
     assert sent_emails == [("reader@gmail.com", "token-for-reader@gmail.com")]
     assert len(session.added) == 1
     assert session.added[0].username == "NewReader"
     assert session.added[0].email == "reader@gmail.com"
     assert session.added[0].is_verified is False
-    assert auth.bcrypt.verify("safe-password", session.added[0].password)
+    assert session.added[0].password.startswith("$argon2id$")
+    assert PasswordHasher().verify(session.added[0].password, "safe-password")
 
 
 def test_signup_rejects_existing_email(monkeypatch):
-    existing = SimpleNamespace(username="OtherUser", email="reader@gmail.com")
-    session = FakeAuthSession(execute_result=FakeExecuteResult(rows=[existing]))
+    session = FakeAuthSession(execute_result=signup_probe(email_taken=True))
     cleanup = override_auth_db(session)
 
     monkeypatch.setattr(auth, "verify_captcha", fake_verify_captcha)
@@ -142,14 +165,42 @@ def test_signup_rejects_existing_email(monkeypatch):
     assert session.added == []
 
 
-def test_signup_rolls_back_when_verification_email_fails(monkeypatch):
-    session = FakeAuthSession()
+def test_signup_returns_conflict_when_insert_loses_race(monkeypatch):
+    session = FakeAuthSession(
+        execute_result=signup_probe(),
+        commit_error=IntegrityError("INSERT", {}, Exception("duplicate key")),
+    )
+    cleanup = override_auth_db(session)
+
+    monkeypatch.setattr(auth, "verify_captcha", fake_verify_captcha)
+
+    try:
+        response = client.post(
+            "/auth/signup",
+            json={
+                "username": "NewReader",
+                "password": "safe-password",
+                "email": "reader@gmail.com",
+                "captcha_token": "captcha-token",
+            },
+        )
+    finally:
+        cleanup()
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Username or email already exists"
+    assert session.rolled_back is True
+
+
+def test_signup_commits_user_when_verification_email_fails(monkeypatch):
+    session = FakeAuthSession(execute_result=signup_probe())
     cleanup = override_auth_db(session)
 
     monkeypatch.setattr(auth, "verify_captcha", fake_verify_captcha)
     monkeypatch.setattr(auth, "generate_email_token", lambda email: "token")
 
-    def fail_send(*args, **kwargs):
+    async def fail_send(*args, **kwargs):
+        assert session.committed is True
         raise RuntimeError("smtp unavailable")
 
     monkeypatch.setattr(auth, "send_verification_email", fail_send)
@@ -167,17 +218,18 @@ def test_signup_rolls_back_when_verification_email_fails(monkeypatch):
     finally:
         cleanup()
 
-    assert response.status_code == 500
-    assert response.json()["detail"] == "Signup failed during email sending"
-    assert session.rolled_back is True
-    assert session.committed is False
+    # The email goes out after commit; a failed send leaves an unverified user who can resend.
+    assert response.status_code == 200
+    assert response.json()["token"] == "token"
+    assert session.committed is True
+    assert session.rolled_back is False
 
 
 def test_login_returns_access_token_for_verified_user(monkeypatch):
     db_user = SimpleNamespace(
         id=7,
         username="reader",
-        password=auth.bcrypt.hash("safe-password"),
+        password=bcrypt.hash("safe-password"),
         is_verified=True,
         role="GENERAL",
     )
@@ -210,7 +262,7 @@ def test_login_rejects_invalid_password(monkeypatch):
     db_user = SimpleNamespace(
         id=7,
         username="reader",
-        password=auth.bcrypt.hash("safe-password"),
+        password=bcrypt.hash("safe-password"),
         is_verified=True,
         role="GENERAL",
     )
@@ -239,7 +291,7 @@ def test_login_rejects_unverified_user(monkeypatch):
     db_user = SimpleNamespace(
         id=7,
         username="reader",
-        password=auth.bcrypt.hash("safe-password"),
+        password=bcrypt.hash("safe-password"),
         is_verified=False,
         role="GENERAL",
     )
@@ -262,3 +314,107 @@ def test_login_rejects_unverified_user(monkeypatch):
 
     assert response.status_code == 403
     assert response.json()["detail"] == "Email not verified"
+
+
+def test_login_upgrades_legacy_bcrypt_hash_to_argon2(monkeypatch):
+    db_user = SimpleNamespace(
+        id=7,
+        username="reader",
+        password=bcrypt.hash("safe-password"),
+        is_verified=True,
+        role="GENERAL",
+    )
+    session = FakeAuthSession(execute_result=FakeExecuteResult(one=db_user))
+    cleanup = override_auth_db(session)
+
+    monkeypatch.setattr(auth, "verify_captcha", fake_verify_captcha)
+    monkeypatch.setattr(auth, "create_access_token", lambda user: "token")
+
+    try:
+        response = client.post(
+            "/auth/login",
+            json={
+                "username": "reader",
+                "password": "safe-password",
+                "captcha_token": "captcha-token",
+            },
+        )
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    rehash = session.executed[-1]
+    assert rehash.is_update
+    assert rehash.compile().params["password"].startswith("$argon2id$")
+    assert session.committed is True
+
+
+def test_verify_email_marks_user_verified_with_single_update(monkeypatch):
+    session = FakeAuthSession(
+        execute_result=FakeExecuteResult(one=SimpleNamespace(id=7, is_verified=False))
+    )
+    cleanup = override_auth_db(session)
+
+    monkeypatch.setattr(auth, "verify_email_token", lambda token: "reader@gmail.com")
+
+    try:
+        response = client.get("/auth/verify-email", params={"token": "email-token"})
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    assert response.json() == {"message": "Email verification successful"}
+    assert session.executed[-1].is_update
+    assert session.executed[-1].compile().params["is_verified"] is True
+    assert session.committed is True
+
+
+def test_verify_email_repeat_clicks_skip_the_database(monkeypatch):
+    session = FakeAuthSession(
+        execute_result=FakeExecuteResult(one=SimpleNamespace(id=7, is_verified=False))
+    )
+    cleanup = override_auth_db(session)
+
+    monkeypatch.setattr(auth, "verify_email_token", lambda token: "reader@gmail.com")
+    monkeypatch.setattr(auth, "_verified_email_links", auth.TTLCache(maxsize=10, ttl=600))
+
+    try:
+        first = client.get("/auth/verify-email", params={"token": "repeat-token"})
+        executed_after_first = len(session.executed)
+        second = client.get("/auth/verify-email", params={"token": "repeat-token"})
+        conditional = client.get(
+            "/auth/verify-email",
+            params={"token": "repeat-token"},
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+    finally:
+        cleanup()
+
+    assert first.json() == {"message": "Email verification successful"}
+    assert first.headers["cache-control"] == "private, max-age=60"
+    assert second.json() == {"message": "Email already verified"}
+    assert second.headers["etag"] == first.headers["etag"]
+    assert conditional.status_code == 304
+    assert len(session.executed) == executed_after_first
+
+
+def test_login_rejects_blank_credentials_before_captcha_or_db(monkeypatch):
+    session = FakeAuthSession()
+    cleanup = override_auth_db(session)
+
+    async def unexpected_captcha(*args, **kwargs):
+        raise AssertionError("captcha called")
+
+    monkeypatch.setattr(auth, "verify_captcha", unexpected_captcha)
+
+    try:
+        response = client.post(
+            "/auth/login",
+            json={"username": "   ", "password": "safe-password", "captcha_token": "captcha-token"},
+        )
+    finally:
+        cleanup()
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username and password are required"
+    assert session.executed == []
@@ -85,3 +85,47 @@ async def test_verify_captcha_legacy_wraps_network_errors(monkeypatch):
 
     assert exc_info.value.status_code == 502
     assert "Captcha verification request failed" in exc_info.value.detail
+
+
+async def test_verify_captcha_rejects_replayed_token(monkeypatch):
+    monkeypatch.setenv("RECAPTCHA_SECRET_KEY", "test-secret")
+    monkeypatch.delenv("RECAPTCHA_ENTERPRISE_ENABLED", raising=False)
+    monkeypatch.setattr(captcha, "_captcha_results", captcha.TTLCache(maxsize=10, ttl=120))
+    clients = []
+
+    def make_client(*args, **kwargs):
+        clients.append(FakeAsyncClient())
+        return clients[-1]
+
+    monkeypatch.setattr(captcha.httpx, "AsyncClient", make_client)
+
+    assert await captcha.verify_captcha("captcha-token") is None
+    with pytest.raises(HTTPException) as replayed:
+        await captcha.verify_captcha(" captcha-token ")
+    assert replayed.value.status_code == 400
+    assert replayed.value.detail == "Captcha verification failed (timeout-or-duplicate)"
+    assert len(clients) == 1
+    assert "captcha-token" not in captcha._captcha_results
+
+
+async def test_verify_captcha_caches_rejections_but_not_network_errors(monkeypatch):
+    monkeypatch.setenv("RECAPTCHA_SECRET_KEY", "test-secret")
+    monkeypatch.delenv("RECAPTCHA_ENTERPRISE_ENABLED", raising=False)
+    monkeypatch.setattr(captcha, "_captcha_results", captcha.TTLCache(maxsize=10, ttl=120))
+    responses = [
+        FakeAsyncClient(error=RuntimeError("network down")),
+        FakeAsyncClient(payload={"success": False, "error-codes": ["timeout-or-duplicate"]}),
+    ]
+    monkeypatch.setattr(captcha.httpx, "AsyncClient", lambda *args, **kwargs: responses.pop(0))
+
+    with pytest.raises(HTTPException) as network_error:
+        await captcha.verify_captcha("replayed-token")
+    assert network_error.value.status_code == 502
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as rejected:
+            await captcha.verify_captcha("replayed-token")
+        assert rejected.value.status_code == 400
+        assert rejected.value.detail == "Captcha verification failed (timeout-or-duplicate)"
+
+    assert responses == []
@@ -19,3 +19,12 @@ def pytest_configure():
 @pytest.fixture
 def anyio_backend():
     return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    # Every TestClient request comes from the same address; start each test with fresh quotas.
+    from app.limiter import limiter
+
+    limiter.reset()
+    yield
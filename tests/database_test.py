@@ -0,0 +1,18 @@
+import logging
+
+from app import database
+
+
+def test_pool_pressure_warns_once_until_pool_drains(caplog, monkeypatch):
+    monkeypatch.setitem(database._pool_pressure, "warned", False)
+    busy = database._pool_warn_at
+
+    with caplog.at_level(logging.WARNING, logger="app.database"):
+        database._check_pool_pressure(busy)
+        database._check_pool_pressure(busy + 1)
+        database._check_pool_pressure(busy - 1)
+        database._check_pool_pressure(busy)
+
+    warnings = [r for r in caplog.records if "DB pool at" in r.getMessage()]
+    assert len(warnings) == 2
+    assert warnings[0].getMessage().startswith(f"DB pool at {busy}/30 ")
@@ -46,3 +46,13 @@ def test_reject_disallowed_images_blocks_unsafe_sources(monkeypatch, markdown, d
 
     assert exc_info.value.status_code == 400
     assert exc_info.value.detail == detail
+
+
+def test_reject_disallowed_images_skips_text_without_image_syntax(monkeypatch):
+    def fail_scan(_text):
+        raise AssertionError("text without image syntax should not be scanned")
+
+    monkeypatch.setattr(forum_content, "IMG_MD_RE", type("R", (), {"finditer": staticmethod(fail_scan)}))
+    monkeypatch.setattr(forum_content, "IMG_TAG_RE", type("R", (), {"finditer": staticmethod(fail_scan)}))
+
+    forum_content.reject_disallowed_images("Plain reply with [a link] and (parens).")
@@ -13,16 +13,28 @@ client = TestClient(app)
 
 
 class FakeForumMediaSession:
-    def __init__(self):
+    def __init__(self, *, fail_commit_after=None):
         self.added = []
         self.committed = False
+        self.commit_count = 0
+        self.fail_commit_after = fail_commit_after
+        self.rolled_back = False
         self.refreshed = []
 
     def add(self, item):
         self.added.append(item)
 
     async def commit(self):
+        self.commit_count += 1
+        if self.fail_commit_after is not None and self.commit_count > self.fail_commit_after:
+            raise RuntimeError("commit failed")
         self.committed = True
+        for index, item in enumerate(self.added, start=1):
+            if getattr(item, "id", None) is None:
+                item.id = index
+
+    async def rollback(self):
+        self.rolled_back = True
 
     async def refresh(self, item):
         self.refreshed.append(item)
@@ -55,9 +67,34 @@ def override_forum_media_dependencies(session, *, user=None):
     return cleanup
 
 
-def test_sniff_image_dims_returns_dimensions_for_valid_image():
-    assert forum_media_routes.sniff_image_dims(make_image_bytes(size=(12, 8))) == (12, 8)
-    assert forum_media_routes.sniff_image_dims(b"not an image") is None
+def test_sniff_image_returns_mime_and_dimensions_for_valid_image():
+    assert forum_media_routes.sniff_image(make_image_bytes(size=(12, 8))) == ("image/png", 12, 8)
+    assert forum_media_routes.sniff_image(b"not an image") is None
+
+
+def test_sniff_image_reads_headers_without_pil(monkeypatch):
+    samples = [
+        make_image_bytes(size=(12, 8), image_format="PNG"),
+        make_image_bytes(size=(12, 8), image_format="GIF"),
+        make_image_bytes(size=(12, 8), image_format="JPEG"),
+        make_image_bytes(size=(12, 8), image_format="WEBP"),
+    ]
+    lossless = io.BytesIO()
+    Image.new("RGBA", (12, 8)).save(lossless, format="WEBP", lossless=True)
+    samples.append(lossless.getvalue())
+    progressive = io.BytesIO()
+    Image.new("RGB", (12, 8)).save(progressive, format="JPEG", progressive=True)
+    samples.append(progressive.getvalue())
+
+    monkeypatch.setattr(
+        forum_media_routes.Image,
+        "open",
+        lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("PIL called")),
+    )
+
+    mimes = ["image/png", "image/gif", "image/jpeg", "image/webp", "image/webp", "image/jpeg"]
+    for data, mime in zip(samples, mimes):
+        assert forum_media_routes.sniff_image(data) == (mime, 12, 8)
 
 
 def test_upload_forum_image_rejects_unsupported_mime_without_s3(monkeypatch):
@@ -135,10 +172,40 @@ def test_upload_forum_image_rejects_large_image_without_s3(monkeypatch):
     assert session.added == []
 
 
+def test_upload_forum_image_rejects_content_that_does_not_match_mime(monkeypatch):
+    session = FakeForumMediaSession()
+    cleanup = override_forum_media_dependencies(session)
+    monkeypatch.setattr(
+        forum_media_routes,
+        "upload_to_s3",
+        lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("S3 called")),
+    )
+
+    try:
+        gif_as_png = client.post(
+            "/forum/media/upload",
+            data={"thread_id": "1"},
+            files={"file": ("anim.png", make_image_bytes(image_format="GIF"), "image/png")},
+        )
+        not_an_image = client.post(
+            "/forum/media/upload",
+            data={"thread_id": "1"},
+            files={"file": ("page.png", b"<html>hello</html>", "image/png")},
+        )
+    finally:
+        cleanup()
+
+    assert gif_as_png.status_code == 400
+    assert gif_as_png.json()["detail"] == "File content does not match its image type."
+    assert not_an_image.status_code == 400
+    assert not_an_image.json()["detail"] == "File is not a valid image."
+    assert session.added == []
+
+
 def test_upload_forum_image_rejects_large_dimensions_without_s3(monkeypatch):
     session = FakeForumMediaSession()
     cleanup = override_forum_media_dependencies(session)
-    monkeypatch.setattr(forum_media_routes, "sniff_image_dims", lambda _blob: (1025, 16))
+    monkeypatch.setattr(forum_media_routes, "sniff_image", lambda _blob: ("image/png", 1025, 16))
     monkeypatch.setattr(
         forum_media_routes,
         "upload_to_s3",
@@ -214,3 +281,31 @@ def test_upload_forum_image_persists_metadata_with_mocked_s3(monkeypatch):
     assert session.added[0].user_id == 10
     assert session.added[0].thread_id == 1
     assert session.added[0].post_id == 5
+
+
+def test_upload_forum_image_deletes_s3_object_when_insert_fails(monkeypatch):
+    # The first commit only ends the read transaction; the insert's commit fails.
+    session = FakeForumMediaSession(fail_commit_after=1)
+    cleanup = override_forum_media_dependencies(session)
+    deleted = []
+
+    monkeypatch.setattr(
+        forum_media_routes,
+        "upload_to_s3",
+        lambda *args, **kwargs: "https://bucket.s3.us-east-1.amazonaws.com/forum/media/abc_my%20pic.png",
+    )
+    monkeypatch.setattr(forum_media_routes, "delete_from_s3", deleted.append)
+
+    try:
+        with TestClient(app, raise_server_exceptions=False) as failing_client:
+            response = failing_client.post(
+                "/forum/media/upload",
+                data={"thread_id": "1"},
+                files={"file": ("my pic.png", make_image_bytes(), "image/png")},
+            )
+    finally:
+        cleanup()
+
+    assert response.status_code == 500
+    assert session.rolled_back is True
+    assert deleted == ["forum/media/abc_my pic.png"]
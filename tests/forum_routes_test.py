@@ -1,12 +1,18 @@
-from datetime import datetime, timezone
+import asyncio
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
+import pytest
+
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.models.forum_model import ForumPost, ForumReaction, ForumSeriesRef, ForumThread
 from app.models.user_model import User
 from app.routes import forum_routes
+from app.schemas.forum_schemas import PageOut, ThreadPostsPageOut
+from app.utils import token_utils
+from app.utils.keyset import parse_keyset_cursor
 
 
 client = TestClient(app)
@@ -26,14 +32,18 @@ class FakeScalarResult:
 
 
 class FakeExecuteResult:
-    def __init__(self, *, rows=None, first=None, scalar_one=None):
+    def __init__(self, *, rows=None, first=None, scalar_one=None, rowcount=0):
         self._rows = rows or []
         self._first = first
         self._scalar_one = scalar_one
+        self.rowcount = rowcount
 
     def all(self):
         return self._rows
 
+    def first(self):
+        return self._first
+
     def scalars(self):
         return FakeScalarResult(rows=self._rows, first=self._first)
 
@@ -50,8 +60,13 @@ class FakeForumSession:
         self.committed = False
         self.flushed = False
         self.refreshed = []
+        self.executed = []
+        self.executed_params = []
 
-    async def execute(self, _stmt):
+    async def execute(self, stmt, params=None):
+        self.executed.append(stmt)
+        if params is not None:
+            self.executed_params.append(params)
         return self._results.pop(0)
 
     async def get(self, model, key):
@@ -107,11 +122,21 @@ def thread_object(**overrides):
         "last_post_at": NOW,
         "locked": False,
         "latest_first": False,
+        "author": SimpleNamespace(username="reader"),
+        "header_refs": [],
     }
     values.update(overrides)
     return SimpleNamespace(**values)
 
 
+def series_ref_object(series_id, title):
+    series = SimpleNamespace(
+        id=series_id, title=title, cover_url=f"https://cdn.example.com/{series_id}.jpg",
+        type="MANHWA", status="ONGOING",
+    )
+    return SimpleNamespace(series_id=series_id, series=series)
+
+
 def post_object(**overrides):
     values = {
         "id": 5,
@@ -122,6 +147,8 @@ def post_object(**overrides):
         "created_at": NOW,
         "updated_at": NOW,
         "heart_count": 0,
+        "author": SimpleNamespace(username="reader"),
+        "series_refs": [],
     }
     values.update(overrides)
     return SimpleNamespace(**values)
@@ -130,6 +157,7 @@ def post_object(**overrides):
 def override_forum_dependencies(session, *, user=None, viewer=None):
     current_user = user or SimpleNamespace(id=10, username="reader", role="GENERAL")
     current_viewer = viewer if viewer is not None else current_user
+    forum_routes._thread_total_cache.clear()
 
     async def fake_get_db():
         yield session
@@ -155,10 +183,15 @@ def override_forum_dependencies(session, *, user=None, viewer=None):
 def test_create_thread_creates_thread_first_post_and_series_refs():
     session = FakeForumSession(
         results=[
-            FakeExecuteResult(scalar_one=0),
-            FakeExecuteResult(rows=[]),
+            FakeExecuteResult(rowcount=1),  # claimed a thread slot
+            FakeExecuteResult(
+                rows=[
+                    series_ref_object(102, "Omniscient Reader").series,
+                    series_ref_object(101, "Solo Leveling").series,
+                ]
+            ),
+            FakeExecuteResult(),
         ],
-        get_results={(User, 10): SimpleNamespace(username="reader")},
     )
     cleanup = override_forum_dependencies(session)
 
@@ -175,21 +208,396 @@ def test_create_thread_creates_thread_first_post_and_series_refs():
         cleanup()
 
     assert response.status_code == 200
-    assert response.json()["title"] == "Favorite fights"
-    assert response.json()["author_username"] == "reader"
+    body = response.json()
+    assert body["title"] == "Favorite fights"
+    assert body["author_username"] == "reader"
+    assert body["post_count"] == 1
+    assert [ref["title"] for ref in body["series_refs"]] == ["Solo Leveling", "Omniscient Reader"]
+    assert session._results == []  # no re-read after commit
     assert session.flushed is True
     assert session.committed is True
-    assert [type(item) for item in session.added] == [
-        ForumThread,
-        ForumPost,
-        ForumSeriesRef,
-        ForumSeriesRef,
-    ]
+    assert [type(item) for item in session.added] == [ForumThread, ForumPost]
     assert session.added[1].content_markdown == "Which fight had the best paneling?"
+    assert "thread_count < " in str(session.executed[0])
+    assert session.executed[2].table.name == "forum_series_refs"
+    assert session.executed_params == [
+        [
+            {"thread_id": 1, "post_id": None, "series_id": 101},
+            {"thread_id": 1, "post_id": None, "series_id": 102},
+        ]
+    ]
+
+
+def test_list_threads_serializes_eager_loaded_authors_and_refs_in_one_query():
+    threads = [
+        thread_object(id=1, header_refs=[series_ref_object(101, "Solo Leveling")]),
+        thread_object(id=2, author=None, author_id=None),
+    ]
+    session = FakeForumSession(results=[FakeExecuteResult(rows=threads)])
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.get("/forum/threads")
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [t["author_username"] for t in body] == ["reader", None]
+    assert body[0]["series_refs"] == [
+        {
+            "series_id": 101,
+            "title": "Solo Leveling",
+            "cover_url": "https://cdn.example.com/101.jpg",
+            "type": "MANHWA",
+            "status": "ONGOING",
+        }
+    ]
+    assert session._results == []
+
+
+def test_create_thread_rejects_unknown_series_before_inserting():
+    session = FakeForumSession(
+        results=[
+            FakeExecuteResult(rowcount=1),  # claimed a thread slot
+            FakeExecuteResult(rows=[series_ref_object(101, "Solo Leveling").series]),
+        ],
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.post(
+            "/forum/threads",
+            json={
+                "title": "Favorite fights",
+                "first_post_markdown": "Which fight had the best paneling?",
+                "series_ids": [101, 999, 101],
+            },
+        )
+    finally:
+        cleanup()
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "One or more referenced series do not exist"
+    assert session.added == []
+    assert session.committed is False
+
+
+def test_get_thread_batches_heart_lookups_for_all_posts():
+    posts = [
+        post_object(id=5, heart_count=2, series_refs=[series_ref_object(101, "Solo Leveling")]),
+        post_object(id=6, heart_count=1, author=None, author_id=None),
+    ]
+    session = FakeForumSession(
+        results=[
+            FakeExecuteResult(first=(NOW, 2, NOW)),
+            FakeExecuteResult(first=thread_object()),
+            FakeExecuteResult(rows=posts),
+            FakeExecuteResult(rows=[5]),  # viewer hearted post 5
+        ],
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.get("/forum/threads/1")
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    body = response.json()["posts"]
+    assert [p["author_username"] for p in body] == ["reader", None]
+    assert body[0]["created_at"] == "2026-05-16T00:00:00+00:00"
+    assert [p["heart_count"] for p in body] == [2, 1]
+    assert [p["viewer_has_hearted"] for p in body] == [True, False]
+    assert body[0]["series_refs"][0]["title"] == "Solo Leveling"
+    assert session._results == []
+    assert response.headers["etag"].startswith('W/"')
+
+
+def test_get_thread_pages_posts_with_keyset_cursor():
+    posts = [post_object(id=5), post_object(id=6)]
+    session = FakeForumSession(
+        results=[
+            FakeExecuteResult(first=(NOW, 3, NOW)),
+            FakeExecuteResult(first=thread_object()),
+            FakeExecuteResult(rows=posts),  # limit + 1 rows: there is a next page
+            FakeExecuteResult(rows=[]),
+            FakeExecuteResult(rows=[]),
+        ],
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        first_page = client.get("/forum/threads/1", params={"limit": 1})
+    finally:
+        cleanup()
+
+    assert first_page.status_code == 200
+    body = first_page.json()
+    assert [p["id"] for p in body["posts"]] == [5]
+    cursor = body["next_cursor"]
+    assert parse_keyset_cursor(cursor) == (NOW, 5)
+
+    session = FakeForumSession(
+        results=[
+            FakeExecuteResult(first=(NOW, 3, NOW)),
+            FakeExecuteResult(first=thread_object()),
+            FakeExecuteResult(rows=[post_object(id=6)]),
+            FakeExecuteResult(rows=[]),
+            FakeExecuteResult(rows=[]),
+        ],
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        second_page = client.get("/forum/threads/1", params={"limit": 1, "after": cursor})
+    finally:
+        cleanup()
+
+    assert [p["id"] for p in second_page.json()["posts"]] == [6]
+    assert second_page.json()["next_cursor"] is None
+    assert "(man_review.forum_posts.created_at, man_review.forum_posts.id) >" in str(session.executed[2])
+
+
+def test_get_thread_posts_paged_loads_reply_tree_in_one_query():
+    op = post_object(id=1, heart_count=1)
+    root = post_object(id=2, heart_count=1)
+    reply = post_object(id=3, parent_id=2, heart_count=1)
+    nested = post_object(id=4, parent_id=3, heart_count=1)
+    session = FakeForumSession(
+        results=[
+            FakeExecuteResult(first=thread_object()),
+            FakeExecuteResult(first=(op, 2)),  # OP + top-level count (OP included)
+            FakeExecuteResult(rows=[root]),
+            FakeExecuteResult(rows=[nested, reply]),
+            FakeExecuteResult(rows=[]),  # viewer hearts
+        ],
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.get("/forum/threads/1/posts-paged")
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    assert [p["id"] for p in response.json()["posts"]] == [1, 2, 3, 4]
+    assert response.json()["next_cursor"] is None
+    # served as plain dicts, so check the documented response model still fits
+    ThreadPostsPageOut.model_validate(response.json())
+    assert response.json()["total_top_level"] == 1
+    assert "(SELECT count(forum_posts_1.id)" in str(session.executed[1])
+    assert str(session.executed[3]).startswith("WITH RECURSIVE descendants")
+    assert session._results == []
+
+
+def test_get_thread_posts_paged_orders_siblings_and_survives_deep_reply_chains():
+    op = post_object(id=1)
+    root = post_object(id=2)
+    later = post_object(id=3, parent_id=2, created_at=NOW + timedelta(minutes=2))
+    earlier = post_object(id=4, parent_id=2, created_at=NOW + timedelta(minutes=1))
+    chain = [post_object(id=100 + i, parent_id=(100 + i - 1) if i else 4) for i in range(2000)]
+    session = FakeForumSession(
+        results=[
+            FakeExecuteResult(first=thread_object()),
+            FakeExecuteResult(first=(op, 2)),  # OP + top-level count (OP included)
+            FakeExecuteResult(rows=[root]),
+            FakeExecuteResult(rows=[later, *chain, earlier]),
+            FakeExecuteResult(rows=[]),
+        ],
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.get("/forum/threads/1/posts-paged")
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    ids = [p["id"] for p in response.json()["posts"]]
+    assert ids == [1, 2, 4, *(100 + i for i in range(2000)), 3]
+
+
+def test_get_current_user_optional_uses_shared_viewer_cache():
+    user = SimpleNamespace(id=10, username="reader", role="GENERAL")
+    token = token_utils.create_access_token(user)
+    token_utils._viewer_cache.clear()
+    session = FakeForumSession(get_results={(User, 10): user})
+    request = SimpleNamespace(headers={"Authorization": f"Bearer {token}"})
+
+    first = asyncio.run(forum_routes.get_current_user_optional(request, session))
+    session._get_results.clear()
+    again = asyncio.run(forum_routes.get_current_user_optional(request, session))
+
+    assert first == again == token_utils.CachedViewer(10, "reader", "GENERAL")
+
+    # forget_cached_viewer is the one invalidation point for every route
+    token_utils.forget_cached_viewer(10)
+    assert asyncio.run(forum_routes.get_current_user_optional(request, session)) is None
+
+
+def test_get_thread_rejects_malformed_cursor():
+    session = FakeForumSession()
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.get("/forum/threads/1", params={"after": "yesterday"})
+    finally:
+        cleanup()
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "1_2_3",  # int() would read "2_3" as 23
+        "99999999999999999999_1",  # timestamp past datetime.max
+        "1_2147483648",  # past int4
+        "-1_1",
+        " 1_1",
+    ],
+)
+def test_get_thread_rejects_out_of_range_cursor(cursor):
+    session = FakeForumSession()
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.get("/forum/threads/1", params={"after": cursor})
+    finally:
+        cleanup()
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_get_thread_returns_304_for_matching_etag_without_loading_posts():
+    def fresh_session():
+        return FakeForumSession(
+            results=[
+                FakeExecuteResult(first=(NOW, 1, NOW)),
+                FakeExecuteResult(first=thread_object()),
+                FakeExecuteResult(rows=[]),
+            ],
+        )
+
+    session = fresh_session()
+    cleanup = override_forum_dependencies(session)
+    try:
+        etag = client.get("/forum/threads/1").headers["etag"]
+        session = fresh_session()
+        app.dependency_overrides[forum_routes.get_async_session] = lambda: session
+        response = client.get("/forum/threads/1", headers={"If-None-Match": etag})
+    finally:
+        cleanup()
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert len(session.executed) == 1  # only the version probe ran
+
+
+def test_list_threads_seeks_past_cursor_instead_of_offset():
+    session = FakeForumSession(results=[FakeExecuteResult(rows=[thread_object(id=3)])])
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.get(
+            "/forum/threads",
+            params={"before": NOW.isoformat(), "before_id": 4, "page_size": 10},
+        )
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    assert [t["id"] for t in response.json()] == [3]
+    sql = str(session.executed[0])
+    assert "(man_review.forum_threads.updated_at, man_review.forum_threads.id) <" in sql
+    assert "OFFSET" not in sql
+
+
+def test_list_threads_paged_returns_next_cursor_and_seeks_with_it():
+    threads = [thread_object(id=9), thread_object(id=8), thread_object(id=7)]
+    session = FakeForumSession(
+        results=[FakeExecuteResult(scalar_one=5), FakeExecuteResult(rows=threads)],
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        first_page = client.get("/forum/threads-paged", params={"page_size": 2})
+    finally:
+        cleanup()
+
+    body = first_page.json()
+    assert [t["id"] for t in body["items"]] == [9, 8]
+    assert body["has_next"] is True
+    assert parse_keyset_cursor(body["next_cursor"]) == (NOW, 8)
+    PageOut.model_validate(body)
+    assert "OFFSET" in str(session.executed[1])
+
+    session = FakeForumSession(
+        results=[FakeExecuteResult(scalar_one=5), FakeExecuteResult(rows=[thread_object(id=7)])],
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        next_page = client.get(
+            "/forum/threads-paged", params={"page_size": 2, "cursor": body["next_cursor"]}
+        )
+    finally:
+        cleanup()
+
+    body = next_page.json()
+    assert [t["id"] for t in body["items"]] == [7]
+    assert body["has_prev"] is True
+    assert body["has_next"] is False
+    assert body["next_cursor"] is None
+    sql = str(session.executed[1])
+    assert "(man_review.forum_threads.last_post_at, man_review.forum_threads.id) <" in sql
+    assert "OFFSET" not in sql
+
+
+def test_list_threads_paged_caches_total_until_a_thread_is_deleted():
+    session = FakeForumSession(
+        results=[
+            FakeExecuteResult(scalar_one=5),
+            FakeExecuteResult(rows=[thread_object(id=9)]),
+            FakeExecuteResult(rows=[thread_object(id=9)]),  # second request: page query only
+            FakeExecuteResult(first=SimpleNamespace(author_id=10)),  # DELETE ... RETURNING
+            FakeExecuteResult(),
+            FakeExecuteResult(scalar_one=4),
+            FakeExecuteResult(rows=[]),
+        ],
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        first = client.get("/forum/threads-paged", params={"author_id": 10})
+        second = client.get("/forum/threads-paged", params={"author_id": 10})
+        client.delete("/forum/threads/9")
+        third = client.get("/forum/threads-paged", params={"author_id": 10})
+    finally:
+        cleanup()
+
+    assert [r.json()["total"] for r in (first, second, third)] == [5, 5, 4]
+    assert session._results == []
+
+
+def test_list_threads_caps_page_size():
+    session = FakeForumSession()
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.get("/forum/threads", params={"page_size": 500})
+    finally:
+        cleanup()
+
+    assert response.status_code == 422
+    assert session.executed == []
 
 
 def test_create_thread_rejects_user_thread_limit():
-    session = FakeForumSession(results=[FakeExecuteResult(scalar_one=10)])
+    session = FakeForumSession(results=[FakeExecuteResult(rowcount=0)])  # counter already at 10
     cleanup = override_forum_dependencies(session)
 
     try:
@@ -212,9 +620,7 @@ def test_create_thread_rejects_user_thread_limit():
 
 
 def test_create_post_rejects_locked_thread_for_non_admin_user():
-    session = FakeForumSession(
-        get_results={(ForumThread, 1): thread_object(locked=True)}
-    )
+    session = FakeForumSession(results=[FakeExecuteResult(first=(True,))])
     cleanup = override_forum_dependencies(session)
 
     try:
@@ -231,9 +637,54 @@ def test_create_post_rejects_locked_thread_for_non_admin_user():
     assert session.committed is False
 
 
+def test_create_post_checks_parent_in_the_thread_probe():
+    session = FakeForumSession(results=[FakeExecuteResult(first=(False, 2))])
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.post(
+            "/forum/threads/1/posts",
+            json={"content_markdown": "Replying across threads.", "parent_id": 7},
+        )
+    finally:
+        cleanup()
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Parent post is from another thread"
+    assert len(session.executed) == 1
+    assert session.added == []
+
+
+def test_create_post_bumps_thread_counters_in_one_update():
+    session = FakeForumSession(results=[FakeExecuteResult(first=(False, 1)), FakeExecuteResult()])
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.post(
+            "/forum/threads/1/posts",
+            json={"content_markdown": "Nice reply.", "parent_id": 7},
+        )
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["parent_id"] == 7
+    assert body["author_username"] == "reader"
+    assert body["heart_count"] == 0
+    assert session.committed is True
+    probe_sql, counter_sql = (str(stmt) for stmt in session.executed)
+    assert probe_sql.startswith("SELECT man_review.forum_threads.locked, (SELECT")
+    assert counter_sql.startswith("UPDATE man_review.forum_threads")
+    assert "post_count=(man_review.forum_threads.post_count + " in counter_sql
+
+
 def test_delete_thread_rejects_non_owner_non_admin_user():
     session = FakeForumSession(
-        get_results={(ForumThread, 1): thread_object(author_id=22)}
+        results=[
+            FakeExecuteResult(first=None),  # owner-scoped DELETE matched nothing
+            FakeExecuteResult(first=(1,)),  # but the thread exists
+        ],
     )
     cleanup = override_forum_dependencies(session)
 
@@ -248,14 +699,167 @@ def test_delete_thread_rejects_non_owner_non_admin_user():
     assert session.committed is False
 
 
-def test_toggle_heart_adds_reaction_and_returns_count():
-    post = post_object(heart_count=0)
+def test_delete_thread_deletes_own_thread_and_releases_its_slot():
+    session = FakeForumSession(
+        results=[
+            FakeExecuteResult(first=SimpleNamespace(author_id=10)),
+            FakeExecuteResult(rowcount=1),
+        ],
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.delete("/forum/threads/1")
+    finally:
+        cleanup()
+
+    assert response.status_code == 204
+    assert session.committed is True
+    delete_sql, counter_sql = (str(stmt) for stmt in session.executed)
+    assert delete_sql.startswith("DELETE FROM man_review.forum_threads")
+    assert "forum_threads.author_id" in delete_sql
+    assert "thread_count=(man_review.users.thread_count - " in counter_sql
+
+
+def test_delete_thread_returns_404_for_missing_thread():
+    session = FakeForumSession(
+        results=[FakeExecuteResult(first=None), FakeExecuteResult(first=None)],
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.delete("/forum/threads/1")
+    finally:
+        cleanup()
+
+    assert response.status_code == 404
+    assert session.committed is False
+
+
+def test_delete_post_rejects_original_post():
+    session = FakeForumSession(
+        results=[FakeExecuteResult(scalar_one=False)],  # no earlier post in the thread
+        get_results={(ForumPost, 5): post_object()},
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.delete("/forum/threads/1/posts/5")
+    finally:
+        cleanup()
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Delete the thread to remove the original post."
+    assert session.deleted == []
+    assert session.committed is False
+
+
+def test_delete_post_updates_counters_without_loading_thread():
+    post = post_object(id=6)
     session = FakeForumSession(
         results=[
-            FakeExecuteResult(first=None),
-            FakeExecuteResult(scalar_one=1),
+            FakeExecuteResult(scalar_one=True),
+            FakeExecuteResult(rows=[NOW]),  # DELETE ... RETURNING created_at
+            FakeExecuteResult(),
         ],
-        get_results={(ForumPost, 5): post},
+        get_results={(ForumPost, 6): post},
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.delete("/forum/threads/1/posts/6")
+    finally:
+        cleanup()
+
+    assert response.status_code == 204
+    assert session.committed is True
+    assert str(session.executed[-1]).startswith("UPDATE man_review.forum_threads")
+
+
+def test_delete_my_post_adjusts_counters_by_removed_replies():
+    post = post_object(id=6)
+    session = FakeForumSession(
+        results=[
+            FakeExecuteResult(rows=[NOW - timedelta(minutes=5), NOW]),  # post + one reply
+            FakeExecuteResult(),
+        ],
+        get_results={(ForumPost, 6): post},
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.delete("/forum/threads/1/posts/6/mine")
+    finally:
+        cleanup()
+
+    assert response.status_code == 204
+    assert session.committed is True
+    delete_stmt, update_stmt = session.executed
+    delete_sql = str(delete_stmt)
+    assert delete_sql.startswith("WITH RECURSIVE subtree")
+    assert "RETURNING man_review.forum_posts.created_at" in delete_sql
+    update_sql = str(update_stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert "greatest(man_review.forum_threads.post_count - 2, 0)" in update_sql
+    assert "CASE WHEN (man_review.forum_threads.last_post_at >" in update_sql
+    assert "count(" not in update_sql
+    assert "max(" not in update_sql
+
+
+def test_update_post_only_touches_changed_series_refs():
+    kept = series_ref_object(101, "Solo Leveling").series
+    added = series_ref_object(102, "Omniscient Reader").series
+    post = post_object(id=5)
+    session = FakeForumSession(
+        results=[
+            FakeExecuteResult(rows=[kept, added]),  # _fetch_series
+            FakeExecuteResult(rows=[101, 103]),  # refs stored for the post
+            FakeExecuteResult(),  # DELETE the 103 ref
+            FakeExecuteResult(),  # INSERT the 102 ref
+            FakeExecuteResult(first=post_object(id=5, content_markdown="Edited.")),
+        ],
+        get_results={(ForumThread, 1): thread_object(), (ForumPost, 5): post},
+    )
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.patch(
+            "/forum/threads/1/posts/5",
+            json={"content_markdown": "Edited.", "series_ids": [101, 102]},
+        )
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    delete_sql = str(session.executed[2].compile(compile_kwargs={"literal_binds": True}))
+    assert delete_sql.startswith("DELETE FROM man_review.forum_series_refs")
+    assert "series_id IN (103)" in delete_sql
+    assert session.executed_params == [[{"thread_id": 1, "post_id": 5, "series_id": 102}]]
+    assert session._results == []
+
+
+def test_set_thread_lock_updates_with_returning():
+    session = FakeForumSession(
+        results=[FakeExecuteResult(first=SimpleNamespace(id=1, locked=True))],
+    )
+    cleanup = override_forum_dependencies(
+        session, user=SimpleNamespace(id=1, username="admin", role="ADMIN")
+    )
+
+    try:
+        response = client.patch("/forum/threads/1/lock", json={"locked": True})
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    assert response.json() == {"id": 1, "locked": True}
+    assert session.committed is True
+    assert "RETURNING" in str(session.executed[0])
+    assert session.refreshed == []
+
+
+def test_toggle_heart_adds_reaction_and_returns_count():
+    session = FakeForumSession(
+        results=[FakeExecuteResult(first=(1, True))],  # UPDATE ... RETURNING heart_count, hearted
     )
     cleanup = override_forum_dependencies(session)
 
@@ -267,8 +871,39 @@ def test_toggle_heart_adds_reaction_and_returns_count():
     assert response.status_code == 200
     assert response.json() == {"hearted": True, "count": 1}
     assert session.committed is True
-    assert len(session.added) == 1
-    assert isinstance(session.added[0], ForumReaction)
-    assert session.added[0].post_id == 5
-    assert session.added[0].user_id == 10
-    assert post.heart_count == 1
+    assert len(session.executed) == 1
+    assert session.added == []
+    bump = str(session.executed[0].compile(compile_kwargs={"literal_binds": True}))
+    assert bump.startswith("WITH removed AS")
+    assert "DELETE FROM man_review.forum_reactions" in bump
+    assert "INSERT INTO man_review.forum_reactions" in bump
+    assert "UPDATE man_review.forum_posts" in bump
+    assert "RETURNING man_review.forum_posts.heart_count" in bump
+
+
+def test_toggle_heart_removes_existing_reaction():
+    session = FakeForumSession(results=[FakeExecuteResult(first=(0, False))])
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.post("/forum/threads/1/posts/5/heart")
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    assert response.json() == {"hearted": False, "count": 0}
+    assert session.committed is True
+
+
+def test_toggle_heart_returns_404_for_post_outside_thread():
+    session = FakeForumSession(results=[FakeExecuteResult(first=None)])
+    cleanup = override_forum_dependencies(session)
+
+    try:
+        response = client.post("/forum/threads/2/posts/5/heart")
+    finally:
+        cleanup()
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Post not found"
+    assert session.committed is False
@@ -0,0 +1,90 @@
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from jose.exceptions import JWTClaimsError, JWTError
+
+from app.utils import google_id_token
+
+pytestmark = pytest.mark.anyio
+
+CLIENT_ID = "client-id.apps.googleusercontent.com"
+
+
+def make_signing_key(kid="key-1"):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk.update(kid=kid, use="sig")
+    return private_pem, {"keys": [public_jwk]}
+
+
+def make_id_token(private_pem, *, kid="key-1", **overrides):
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": "1234567890",
+        "email": "Reader@Gmail.com",
+        "exp": int(time.time()) + 300,
+        "iat": int(time.time()),
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture
+def google_keys(monkeypatch):
+    private_pem, jwks = make_signing_key()
+    fetches = []
+
+    async def fake_fetch():
+        fetches.append(1)
+        return jwks, 3600
+
+    monkeypatch.setattr(google_id_token, "_fetch_google_certs", fake_fetch)
+    monkeypatch.setattr(google_id_token, "_certs_cache", {"jwks": None, "expires_at": 0.0})
+    monkeypatch.setattr(google_id_token, "_claims_cache", google_id_token.TTLCache(maxsize=10, ttl=5))
+    return private_pem, fetches
+
+
+async def test_verify_google_id_token_returns_claims_and_reuses_certs(google_keys):
+    private_pem, fetches = google_keys
+
+    first = await google_id_token.verify_google_id_token(make_id_token(private_pem), CLIENT_ID)
+    second = await google_id_token.verify_google_id_token(
+        make_id_token(private_pem, sub="other"), CLIENT_ID
+    )
+
+    assert first["email"] == "Reader@Gmail.com"
+    assert second["sub"] == "other"
+    assert fetches == [1]
+
+
+async def test_verify_google_id_token_rejects_wrong_audience_and_issuer(google_keys):
+    private_pem, _fetches = google_keys
+
+    with pytest.raises(JWTClaimsError):
+        await google_id_token.verify_google_id_token(
+            make_id_token(private_pem, aud="someone-else"), CLIENT_ID
+        )
+    with pytest.raises(ValueError):
+        await google_id_token.verify_google_id_token(
+            make_id_token(private_pem, iss="https://evil.example.com"), CLIENT_ID
+        )
+
+
+async def test_verify_google_id_token_rejects_foreign_signature(google_keys):
+    other_private_pem, _other_jwks = make_signing_key()
+
+    with pytest.raises(JWTError):
+        await google_id_token.verify_google_id_token(make_id_token(other_private_pem), CLIENT_ID)
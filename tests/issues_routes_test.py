@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 from app.main import app
 from app.models.issue import IssueStatus, IssueType
 from app.routes import issues_routes
+from app.utils.keyset import keyset_cursor, parse_keyset_cursor
 
 
 client = TestClient(app)
@@ -29,6 +30,9 @@ class FakeExecuteResult:
         self._rows = rows or []
         self._first = first
 
+    def first(self):
+        return self._first
+
     def scalars(self):
         return FakeScalarResult(rows=self._rows, first=self._first)
 
@@ -40,8 +44,10 @@ class FakeIssueSession:
         self.deleted = []
         self.committed = False
         self.refreshed = []
+        self.executed = []
 
-    async def execute(self, _stmt):
+    async def execute(self, stmt):
+        self.executed.append(stmt)
         return self._results.pop(0)
 
     def add(self, item):
@@ -49,9 +55,15 @@ class FakeIssueSession:
 
     async def commit(self):
         self.committed = True
+        # INSERT ... RETURNING fills what the database generates
+        for item in self.added:
+            self._fill_server_defaults(item)
 
     async def refresh(self, item):
         self.refreshed.append(item)
+        self._fill_server_defaults(item)
+
+    def _fill_server_defaults(self, item):
         if getattr(item, "id", None) is None:
             item.id = 1
         if getattr(item, "status", None) is None:
@@ -139,6 +151,7 @@ def test_report_issue_creates_anonymous_issue_with_trimmed_fields():
     assert session.added[0].type == IssueType.BUG
     assert session.added[0].user_id is None
     assert session.added[0].user_agent == "pytest-agent"
+    assert session.refreshed == []
 
 
 def test_report_issue_rejects_invalid_issue_type():
@@ -179,7 +192,7 @@ def test_list_issues_returns_matching_issues():
 
 
 def test_update_issue_status_updates_admin_fields():
-    issue = issue_object()
+    issue = issue_object(status=IssueStatus.FIXED, admin_notes="Resolved in production.")
     session = FakeIssueSession([FakeExecuteResult(first=issue)])
     cleanup_db = override_issues_db(session)
     cleanup_admin = override_issues_admin()
@@ -196,17 +209,33 @@ def test_update_issue_status_updates_admin_fields():
     assert response.status_code == 200
     assert response.json()["status"] == "FIXED"
     assert response.json()["admin_notes"] == "Resolved in production."
-    assert issue.status == IssueStatus.FIXED
-    assert issue.admin_notes == "Resolved in production."
     assert session.committed is True
+    stmt = str(session.executed[0].compile(compile_kwargs={"literal_binds": True}))
+    assert stmt.startswith("UPDATE man_review.issues SET")
+    assert "status='FIXED'" in stmt
+    assert "RETURNING" in stmt
+
+
+def test_update_issue_status_returns_404_for_missing_issue():
+    session = FakeIssueSession([FakeExecuteResult(first=None)])
+    cleanup_db = override_issues_db(session)
+    cleanup_admin = override_issues_admin()
+
+    try:
+        response = client.patch("/issues/404/status", json={"status": "FIXED"})
+    finally:
+        cleanup_admin()
+        cleanup_db()
+
+    assert response.status_code == 404
+    assert session.committed is False
 
 
 def test_delete_issue_removes_screenshot_from_s3(monkeypatch):
     deleted_keys = []
-    issue = issue_object(
-        screenshot_url="https://cdn.example.com/issues/screenshots/report.png"
+    session = FakeIssueSession(
+        [FakeExecuteResult(first=("https://cdn.example.com/issues/screenshots/report.png",))]
     )
-    session = FakeIssueSession([FakeExecuteResult(first=issue)])
     cleanup_db = override_issues_db(session)
     cleanup_admin = override_issues_admin()
     monkeypatch.setattr(issues_routes, "delete_from_s3", deleted_keys.append)
@@ -219,5 +248,78 @@ def test_delete_issue_removes_screenshot_from_s3(monkeypatch):
 
     assert response.status_code == 204
     assert deleted_keys == ["issues/screenshots/report.png"]
-    assert session.deleted == [issue]
     assert session.committed is True
+    assert str(session.executed[0]).startswith("DELETE FROM man_review.issues")
+
+
+def test_delete_issue_returns_404_for_missing_issue(monkeypatch):
+    deleted_keys = []
+    session = FakeIssueSession([FakeExecuteResult(first=None)])
+    cleanup_db = override_issues_db(session)
+    cleanup_admin = override_issues_admin()
+    monkeypatch.setattr(issues_routes, "delete_from_s3", deleted_keys.append)
+
+    try:
+        response = client.delete("/issues/404")
+    finally:
+        cleanup_admin()
+        cleanup_db()
+
+    assert response.status_code == 404
+    assert deleted_keys == []
+    assert session.committed is False
+
+
+def test_list_issues_sets_next_cursor_header_when_more_rows_exist():
+    newer = issue_object(id=3, created_at=NOW)
+    older = issue_object(id=2, created_at=NOW)
+    oldest = issue_object(id=1, created_at=NOW)
+    session = FakeIssueSession([FakeExecuteResult(rows=[newer, older, oldest])])
+    cleanup = override_issues_db(session)
+
+    try:
+        response = client.get("/issues?page_size=2")
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [3, 2]
+    assert parse_keyset_cursor(response.headers["x-next-cursor"]) == (NOW, 2)
+
+
+def test_list_issues_with_cursor_seeks_past_previous_page():
+    session = FakeIssueSession([FakeExecuteResult(rows=[issue_object(id=1)])])
+    executed = []
+    execute = session.execute
+
+    async def record_execute(stmt):
+        executed.append(stmt)
+        return await execute(stmt)
+
+    session.execute = record_execute
+    cleanup = override_issues_db(session)
+
+    try:
+        response = client.get(f"/issues?cursor={keyset_cursor(NOW, 2)}&page_size=2")
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [1]
+    assert "x-next-cursor" not in response.headers
+    sql = str(executed[0])
+    assert "OFFSET" not in sql
+    assert "(man_review.issues.created_at, man_review.issues.id) <" in sql
+
+
+def test_list_issues_rejects_malformed_cursor():
+    session = FakeIssueSession()
+    cleanup = override_issues_db(session)
+
+    try:
+        response = client.get("/issues?cursor=not-a-cursor")
+    finally:
+        cleanup()
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
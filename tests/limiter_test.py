@@ -0,0 +1,63 @@
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from limits import parse
+from limits.strategies import SlidingWindowCounterRateLimiter
+
+from app.limiter import BoundedMemoryStorage, limiter
+from app.main import app
+from app.routes import auth
+
+
+def test_default_limiter_uses_bounded_memory_storage():
+    assert isinstance(limiter._storage, BoundedMemoryStorage)
+
+
+def test_bounded_memory_storage_evicts_oldest_keys_at_capacity():
+    storage = BoundedMemoryStorage(max_keys=2)
+
+    storage.incr("a", 60)
+    storage.incr("b", 60)
+    storage.incr("c", 60)
+
+    assert storage.get("a") == 0
+    assert storage.get("b") == 1
+    assert storage.get("c") == 1
+
+
+def test_bounded_memory_storage_clamps_non_positive_cap():
+    storage = BoundedMemoryStorage(max_keys=0)
+
+    assert storage.incr("a", 60) == 1
+    assert storage.incr("b", 60) == 1
+    assert storage.get("a") == 0
+
+
+def test_bounded_memory_storage_enforces_limits():
+    rate_limiter = SlidingWindowCounterRateLimiter(BoundedMemoryStorage(max_keys=10))
+    limit = parse("2/minute")
+
+    assert rate_limiter.hit(limit, "1.2.3.4")
+    assert rate_limiter.hit(limit, "1.2.3.4")
+    assert not rate_limiter.hit(limit, "1.2.3.4")
+
+
+def test_login_rate_limit_rejects_before_captcha_verification(monkeypatch):
+    captcha_calls = []
+
+    async def failing_captcha(*args, **kwargs):
+        captcha_calls.append(args)
+        raise HTTPException(status_code=400, detail="Captcha failed")
+
+    monkeypatch.setattr(auth, "verify_captcha", failing_captcha)
+    limiter.reset()
+    client = TestClient(app)
+    payload = {"username": "reader", "password": "pw", "captcha_token": "t"}
+
+    try:
+        statuses = [client.post("/auth/login", json=payload).status_code for _ in range(6)]
+    finally:
+        limiter.reset()
+
+    assert statuses[:5] == [400] * 5
+    assert statuses[5] == 429
+    assert len(captcha_calls) == 5
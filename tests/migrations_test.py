@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from app import migrations
+from app.migrations import SCHEMA_STATEMENTS, apply_migrations
+
+
+def test_schema_statements_convert_legacy_enum_columns_to_varchar():
+    statements = "\n".join(SCHEMA_STATEMENTS)
+
+    assert "ALTER COLUMN type TYPE VARCHAR(16) USING type::text" in statements
+    assert "ALTER COLUMN status TYPE VARCHAR(16) USING status::text" in statements
+
+
+def test_schema_statements_add_missing_check_constraints():
+    statements = "\n".join(SCHEMA_STATEMENTS)
+
+    assert "ADD CONSTRAINT ck_series_type CHECK (type IN ('MANGA', 'MANHWA', 'MANHUA'))" in statements
+    assert "ADD CONSTRAINT ck_issues_status CHECK" in statements
+
+
+class FakeMigrationConnection:
+    def __init__(self, already_applied):
+        self.already_applied = already_applied
+        self.statements = []
+        self.ran_create_all = False
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+
+    async def scalar(self, statement, params=None):
+        self.statements.append(str(statement))
+        return 1 if self.already_applied else None
+
+    async def run_sync(self, fn):
+        self.ran_create_all = True
+
+
+def test_apply_migrations_skips_when_version_already_recorded():
+    conn = FakeMigrationConnection(already_applied=True)
+
+    assert asyncio.run(apply_migrations(conn)) is False
+    assert "pg_advisory_xact_lock" in conn.statements[0]
+    assert conn.ran_create_all is False
+    assert not any("ALTER TABLE" in stmt for stmt in conn.statements)
+
+
+def test_apply_migrations_runs_ddl_and_records_version():
+    conn = FakeMigrationConnection(already_applied=False)
+
+    assert asyncio.run(apply_migrations(conn)) is True
+    assert "pg_advisory_xact_lock" in conn.statements[0]
+    assert conn.ran_create_all is True
+    assert "INSERT INTO man_review.schema_versions" in conn.statements[-1]
+
+
+def test_schema_statements_drop_duplicate_primary_key_indexes():
+    assert "DROP INDEX IF EXISTS man_review.ix_man_review_users_id" in SCHEMA_STATEMENTS
+    assert "DROP INDEX IF EXISTS man_review.ix_man_review_forum_posts_id" in SCHEMA_STATEMENTS
+
+
+def test_schema_statements_replace_post_indexes_with_keyset_covering_ones():
+    statements = " ".join(SCHEMA_STATEMENTS)
+    assert "ON man_review.forum_posts (thread_id, parent_id, created_at, id)" in statements
+    assert "DROP INDEX IF EXISTS man_review.ix_forum_posts_thread_parent_created" in SCHEMA_STATEMENTS
+
+
+def test_schema_statements_add_issues_keyset_index():
+    assert "ON man_review.issues (created_at, id)" in " ".join(SCHEMA_STATEMENTS)
+
+
+def test_schema_statements_add_covering_vote_tally_index():
+    statements = " ".join(SCHEMA_STATEMENTS)
+    assert "ON man_review.user_votes (series_id, category, user_id) INCLUDE (score)" in statements
+
+
+def test_schema_statements_add_trigram_indexes_for_title_search():
+    statements = "\n".join(SCHEMA_STATEMENTS)
+
+    assert "CREATE EXTENSION IF NOT EXISTS pg_trgm" in statements
+    assert "ON man_review.forum_threads USING gin (title gin_trgm_ops)" in statements
+    assert "ON man_review.issues USING gin (description gin_trgm_ops)" in statements
+    assert "ON man_review.series USING gin (title gin_trgm_ops)" in statements
+
+
+def test_schema_statements_backfill_user_thread_counts():
+    statements = "\n".join(SCHEMA_STATEMENTS)
+
+    assert "ADD COLUMN IF NOT EXISTS thread_count INTEGER NOT NULL DEFAULT 0" in statements
+    assert "SET thread_count = c.n" in statements
+
+
+class FailingEngine:
+    def __init__(self):
+        self.attempts = 0
+
+    def begin(self):
+        self.attempts += 1
+        raise ConnectionError("database unavailable")
+
+
+async def no_sleep(_seconds):
+    return None
+
+
+def test_run_migrations_swallows_errors_for_app_startup(monkeypatch):
+    fake_engine = FailingEngine()
+    monkeypatch.setattr(migrations, "engine", fake_engine)
+    monkeypatch.setattr(migrations.asyncio, "sleep", no_sleep)
+
+    asyncio.run(migrations.run_migrations())
+    assert fake_engine.attempts == 2
+
+
+def test_run_migrations_strict_fails_the_deploy_step(monkeypatch):
+    fake_engine = FailingEngine()
+    monkeypatch.setattr(migrations, "engine", fake_engine)
+    monkeypatch.setattr(migrations.asyncio, "sleep", no_sleep)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(migrations.run_migrations(strict=True))
+    assert fake_engine.attempts == 2
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from passlib.hash import bcrypt
+
+from app.utils import password_utils
+from app.utils.password_utils import hash_password, verify_password
+
+
+def test_hash_password_produces_argon2id_hash_that_verifies():
+    hashed = asyncio.run(hash_password("safe-password"))
+
+    assert hashed.startswith("$argon2id$")
+    assert asyncio.run(verify_password("safe-password", hashed)) == (True, False)
+
+
+def test_verify_password_rejects_wrong_password():
+    hashed = asyncio.run(hash_password("safe-password"))
+
+    assert asyncio.run(verify_password("wrong-password", hashed)) == (False, False)
+
+
+def test_verify_password_accepts_legacy_bcrypt_and_flags_rehash():
+    hashed = bcrypt.hash("safe-password")
+
+    assert asyncio.run(verify_password("safe-password", hashed)) == (True, True)
+    assert asyncio.run(verify_password("wrong-password", hashed)) == (False, False)
+
+
+def test_verify_password_rejects_empty_or_unknown_hash():
+    assert asyncio.run(verify_password("anything", "")) == (False, False)
+    assert asyncio.run(verify_password("anything", "not-a-hash")) == (False, False)
+
+
+def test_kdf_sheds_load_when_queue_is_full(monkeypatch):
+    monkeypatch.setattr(password_utils, "KDF_MAX_WAITING", 0)
+
+    async def scenario():
+        monkeypatch.setattr(password_utils, "_kdf_semaphore", asyncio.Semaphore(1))
+        await password_utils._kdf_semaphore.acquire()
+        try:
+            with pytest.raises(HTTPException) as exc_info:
+                await verify_password("safe-password", "")
+        finally:
+            password_utils._kdf_semaphore.release()
+        return exc_info.value, await verify_password("safe-password", "")
+
+    error, result = asyncio.run(scenario())
+
+    assert error.status_code == 503
+    assert result == (False, False)
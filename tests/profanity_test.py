@@ -1,5 +1,6 @@
 import pytest
 
+from app.moderation import profanity
 from app.moderation.profanity import contains_profanity, ensure_clean
 
 
@@ -18,3 +19,22 @@ def test_ensure_clean_allows_text_without_blocked_words():
 def test_ensure_clean_raises_for_text_with_blocked_word():
     with pytest.raises(ValueError, match="inappropriate language"):
         ensure_clean("This is shit.")
+
+
+def test_contains_profanity_returns_first_hit_in_text_order():
+    assert contains_profanity("what the fuck, ass") == "fuck"
+
+
+def test_contains_profanity_ignores_blocked_word_joined_by_underscore():
+    assert contains_profanity("shit_post") is None
+
+
+def test_contains_profanity_reuses_result_for_identical_text(monkeypatch):
+    text = "A long reply that was already checked once."
+    assert contains_profanity(text) is None
+
+    def fail_scan(_text):
+        raise AssertionError("identical text should not be rescanned")
+
+    monkeypatch.setattr(profanity, "_scan", fail_scan)
+    assert contains_profanity(text) is None
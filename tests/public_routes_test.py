@@ -54,15 +54,15 @@ def test_sitemap_static_returns_public_xml():
 
 
 def test_sitemap_index_includes_static_series_and_forum_sitemaps():
+    stats = SimpleNamespace(
+        total_threads=2,
+        latest_forum_activity=datetime(2026, 5, 1, tzinfo=timezone.utc),
+        total_series=1,
+        latest_series_activity="2026-05-02T00:00:00+00:00",
+    )
+
     async def fake_session():
-        yield FakeScalarSession(
-            [
-                2,
-                datetime(2026, 5, 1, tzinfo=timezone.utc),
-                1,
-                "2026-05-02T00:00:00+00:00",
-            ]
-        )
+        yield FakeExecuteSession(SimpleNamespace(one=lambda: stats))
 
     cleanup = override_dependency(get_async_session, fake_session)
     try:
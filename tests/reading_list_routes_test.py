@@ -1,10 +1,14 @@
+import asyncio
 import uuid
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
 from fastapi.testclient import TestClient
+from jose import jwt
 
 from app.main import app
 from app.routes import reading_list_routes
+from app.utils import token_utils
 
 
 client = TestClient(app)
@@ -24,10 +28,17 @@ class FakeScalarResult:
 
 
 class FakeExecuteResult:
-    def __init__(self, *, rows=None, first=None, scalar_one=None):
+    def __init__(self, *, rows=None, first=None, scalar_one=None, scalar_one_or_none=None):
         self._rows = rows or []
         self._first = first
         self._scalar_one = scalar_one
+        self._scalar_one_or_none = scalar_one_or_none
+
+    def first(self):
+        return self._first
+
+    def one(self):
+        return self._first
 
     def scalars(self):
         return FakeScalarResult(rows=self._rows, first=self._first)
@@ -35,6 +46,9 @@ class FakeExecuteResult:
     def scalar_one(self):
         return self._scalar_one
 
+    def scalar_one_or_none(self):
+        return self._scalar_one_or_none
+
 
 class FakeReadingListSession:
     def __init__(self, results):
@@ -51,9 +65,15 @@ class FakeReadingListSession:
 
     async def commit(self):
         self.committed = True
+        # INSERT ... RETURNING fills what the database generates
+        for item in self.added:
+            self._fill_server_defaults(item)
 
     async def refresh(self, item):
         self.refreshed.append(item)
+        self._fill_server_defaults(item)
+
+    def _fill_server_defaults(self, item):
         if getattr(item, "id", None) is None:
             item.id = 1
         if getattr(item, "is_public", None) is None:
@@ -115,14 +135,7 @@ def test_normalize_left_off_chapter_strips_empty_and_truncates():
 
 
 def test_create_reading_list_creates_list_for_current_user():
-    full_list = list_object(name="Weekend Reads")
-    session = FakeReadingListSession(
-        [
-            FakeExecuteResult(scalar_one=0),
-            FakeExecuteResult(first=None),
-            FakeExecuteResult(first=full_list),
-        ]
-    )
+    session = FakeReadingListSession([FakeExecuteResult(first=(0, 0))])
     cleanup = override_reading_list_dependencies(session)
 
     try:
@@ -142,10 +155,11 @@ def test_create_reading_list_creates_list_for_current_user():
     assert len(session.added) == 1
     assert session.added[0].user_id == 10
     assert session.added[0].name == "Weekend Reads"
+    assert session.refreshed == []
 
 
 def test_create_reading_list_rejects_user_list_limit():
-    session = FakeReadingListSession([FakeExecuteResult(scalar_one=2)])
+    session = FakeReadingListSession([FakeExecuteResult(first=(2, 0))])
     cleanup = override_reading_list_dependencies(session)
 
     try:
@@ -159,17 +173,25 @@ def test_create_reading_list_rejects_user_list_limit():
     assert session.committed is False
 
 
+def test_create_reading_list_rejects_duplicate_name():
+    session = FakeReadingListSession([FakeExecuteResult(first=(1, 1))])
+    cleanup = override_reading_list_dependencies(session)
+
+    try:
+        response = client.post("/reading-lists", json={"name": "Favorites"})
+    finally:
+        cleanup()
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "You already have a list with that name."
+    assert session.added == []
+
+
 def test_add_series_to_list_adds_item_when_series_exists():
-    updated_list = list_object(
-        items=[item_object(series_id=25, left_off_chapter="Chapter 9")]
-    )
     session = FakeReadingListSession(
         [
             FakeExecuteResult(first=list_object()),
-            FakeExecuteResult(scalar_one=1),
-            FakeExecuteResult(first=None),
-            FakeExecuteResult(scalar_one=0),
-            FakeExecuteResult(first=updated_list),
+            FakeExecuteResult(scalar_one=True),
         ]
     )
     cleanup = override_reading_list_dependencies(session)
@@ -194,12 +216,11 @@ def test_add_series_to_list_adds_item_when_series_exists():
 
 
 def test_add_series_to_list_rejects_full_non_admin_list():
+    full_list = list_object(items=[item_object(series_id=i) for i in range(100, 135)])
     session = FakeReadingListSession(
         [
-            FakeExecuteResult(first=list_object()),
-            FakeExecuteResult(scalar_one=1),
-            FakeExecuteResult(first=None),
-            FakeExecuteResult(scalar_one=35),
+            FakeExecuteResult(first=full_list),
+            FakeExecuteResult(scalar_one=True),
         ]
     )
     cleanup = override_reading_list_dependencies(session)
@@ -215,6 +236,60 @@ def test_add_series_to_list_rejects_full_non_admin_list():
     assert session.committed is False
 
 
+def test_remove_series_from_list_returns_list_without_reselecting():
+    rlist = list_object(items=[item_object(series_id=25), item_object(series_id=26)])
+    session = FakeReadingListSession([FakeExecuteResult(first=rlist)])
+    cleanup = override_reading_list_dependencies(session)
+
+    try:
+        response = client.delete("/reading-lists/1/items/25")
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"series_id": 26, "left_off_chapter": None}]
+    assert session.committed is True
+
+
+def test_remove_series_from_list_returns_404_for_missing_series():
+    session = FakeReadingListSession([FakeExecuteResult(first=list_object())])
+    cleanup = override_reading_list_dependencies(session)
+
+    try:
+        response = client.delete("/reading-lists/1/items/25")
+    finally:
+        cleanup()
+
+    assert response.status_code == 404
+    assert session.committed is False
+
+
+def test_delete_list_deletes_owned_list_in_one_statement():
+    session = FakeReadingListSession([FakeExecuteResult(first=(1,))])
+    cleanup = override_reading_list_dependencies(session)
+
+    try:
+        response = client.delete("/reading-lists/1")
+    finally:
+        cleanup()
+
+    assert response.status_code == 204
+    assert session.committed is True
+
+
+def test_delete_list_returns_404_for_list_owned_by_someone_else():
+    session = FakeReadingListSession([FakeExecuteResult(first=None)])
+    cleanup = override_reading_list_dependencies(session)
+
+    try:
+        response = client.delete("/reading-lists/2")
+    finally:
+        cleanup()
+
+    assert response.status_code == 404
+    assert session.committed is False
+
+
 def test_get_public_list_by_token_returns_public_list():
     public_list = list_object(
         name="Shared Reads",
@@ -234,3 +309,31 @@ def test_get_public_list_by_token_returns_public_list():
         "name": "Shared Reads",
         "items": [{"series_id": 7, "left_off_chapter": "Episode 4"}],
     }
+
+
+def test_get_current_user_serves_repeat_requests_from_viewer_cache():
+    token = jwt.encode(
+        {"id": 10, "exp": datetime.now(timezone.utc) + timedelta(minutes=5)},
+        token_utils.SECRET_KEY,
+        algorithm=token_utils.ALGORITHM,
+    )
+    token_utils._viewer_cache.clear()
+    user = SimpleNamespace(id=10, username="reader", role="GENERAL")
+    session = FakeReadingListSession(
+        [
+            FakeExecuteResult(scalar_one_or_none=user),
+            FakeExecuteResult(scalar_one_or_none=user),
+        ]
+    )
+    request = SimpleNamespace(headers={"Authorization": f"Bearer {token}"})
+
+    first = asyncio.run(reading_list_routes.get_current_user(request, session))
+    again = asyncio.run(reading_list_routes.get_current_user(request, session))
+
+    assert first == again == token_utils.CachedViewer(10, "reader", "GENERAL")
+    assert len(session._results) == 1  # only the first call hit the database
+
+    # a role change forgets the viewer, so the next request reloads it
+    token_utils.forget_cached_viewer(10)
+    asyncio.run(reading_list_routes.get_current_user(request, session))
+    assert session._results == []
@@ -0,0 +1,195 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.database import get_async_session
+from app.main import app
+from app.models.series_model import SeriesApprovalStatus
+from app.utils.token_utils import get_current_user
+
+
+client = TestClient(app)
+
+
+class FakeExecuteResult:
+    def __init__(self, *, rows=None, first=None):
+        self._rows = rows or []
+        self._first = first
+
+    def first(self):
+        return self._first
+
+    def scalars(self):
+        return self
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class FakeSeriesDetailSession:
+    def __init__(self, results):
+        self._results = list(results)
+        self.executed = []
+        self.committed = False
+
+    async def execute(self, stmt):
+        self.executed.append(stmt)
+        return self._results.pop(0)
+
+    async def commit(self):
+        self.committed = True
+
+
+def series_object(**overrides):
+    values = {
+        "id": 7,
+        "title": "Solo Leveling",
+        "genre": "Action",
+        "type": "MANHWA",
+        "author": "Chugong",
+        "artist": "Dubu",
+        "cover_url": "https://cdn.example.com/cover.webp",
+        "approval_status": SeriesApprovalStatus.APPROVED.value,
+        "submitted_by_id": None,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def override_session(session):
+    async def fake_session():
+        yield session
+
+    app.dependency_overrides[get_async_session] = fake_session
+    return lambda: app.dependency_overrides.pop(get_async_session, None)
+
+
+def override_voter(session):
+    cleanup_session = override_session(session)
+
+    async def fake_user():
+        return SimpleNamespace(id=10, username="reader", role="GENERAL")
+
+    app.dependency_overrides[get_current_user] = fake_user
+
+    def cleanup():
+        cleanup_session()
+        app.dependency_overrides.pop(get_current_user, None)
+
+    return cleanup
+
+
+def detail_object(**overrides):
+    values = {
+        "id": 3,
+        "series_id": 7,
+        "synopsis": "A hunter levels up.",
+        "series_cover_url": "https://cdn.example.com/detail.webp",
+        "story_total": 8,
+        "story_count": 1,
+        "characters_total": 0,
+        "characters_count": 0,
+        "worldbuilding_total": 0,
+        "worldbuilding_count": 0,
+        "art_total": 0,
+        "art_count": 0,
+        "drama_or_fight_total": 0,
+        "drama_or_fight_count": 0,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_get_series_detail_loads_series_detail_and_votes_in_two_queries():
+    session = FakeSeriesDetailSession(
+        [
+            FakeExecuteResult(first=(series_object(), None)),
+            FakeExecuteResult(rows=[("Story", 3), ("Art", 1)]),
+        ]
+    )
+    cleanup = override_session(session)
+
+    try:
+        response = client.get("/series-details/7")
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["title"] == "Solo Leveling"
+    assert body["synopsis"] == ""
+    assert body["vote_counts"] == {"Story": 3, "Art": 1}
+    assert body["vote_scores"] == {}
+    assert len(session.executed) == 2
+    assert "LEFT OUTER JOIN man_review.series_details" in str(session.executed[0])
+
+
+def test_get_series_detail_returns_404_for_missing_series():
+    session = FakeSeriesDetailSession([FakeExecuteResult(first=None)])
+    cleanup = override_session(session)
+
+    try:
+        response = client.get("/series-details/7")
+    finally:
+        cleanup()
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Series not found"
+
+
+def test_vote_series_detail_records_and_applies_vote_in_one_statement():
+    session = FakeSeriesDetailSession(
+        [
+            FakeExecuteResult(first=(SeriesApprovalStatus.APPROVED.value, 3)),
+            FakeExecuteResult(first=detail_object()),
+        ]
+    )
+    cleanup = override_voter(session)
+
+    try:
+        response = client.post("/series-details/7/vote", data={"category": "Story", "score": "8"})
+    finally:
+        cleanup()
+
+    assert response.status_code == 200
+    assert response.json()["story_total"] == 8
+    assert session.committed is True
+    vote = str(session.executed[1])
+    assert vote.startswith("WITH vote AS")
+    assert "ON CONFLICT (user_id, series_id, category) DO NOTHING" in vote
+    assert "UPDATE man_review.series SET vote_count" in vote
+    assert "UPDATE man_review.series_details SET story_total" in vote
+
+
+def test_vote_series_detail_rejects_repeat_vote_on_category():
+    session = FakeSeriesDetailSession(
+        [
+            FakeExecuteResult(first=(SeriesApprovalStatus.APPROVED.value, 3)),
+            FakeExecuteResult(first=None),  # INSERT hit the unique constraint
+        ]
+    )
+    cleanup = override_voter(session)
+
+    try:
+        response = client.post("/series-details/7/vote", data={"category": "Story", "score": "8"})
+    finally:
+        cleanup()
+
+    assert response.status_code == 403
+    assert response.json()["detail"] == "You already voted on this category"
+    assert session.committed is False
+
+
+def test_vote_series_detail_returns_404_without_detail():
+    session = FakeSeriesDetailSession(
+        [FakeExecuteResult(first=(SeriesApprovalStatus.APPROVED.value, None))]
+    )
+    cleanup = override_voter(session)
+
+    try:
+        response = client.post("/series-details/7/vote", data={"category": "Story", "score": "8"})
+    finally:
+        cleanup()
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Series detail not found"
@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
 import pytest
@@ -34,3 +34,73 @@ def test_create_access_token_rejects_short_secret_key(monkeypatch):
 
     with pytest.raises(RuntimeError, match="SECRET_KEY is too short"):
         token_utils.create_access_token(user)
+
+
+def test_create_access_token_reuses_token_for_same_claims(monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "test-secret-key-with-at-least-32-characters")
+    user = SimpleNamespace(id=42, username="toonfan", role="GENERAL")
+
+    first = token_utils.create_access_token(user)
+    second = token_utils.create_access_token(user)
+    promoted = token_utils.create_access_token(SimpleNamespace(id=42, username="toonfan", role="ADMIN"))
+
+    assert first == second
+    assert promoted != first
+    assert jwt.get_unverified_claims(promoted)["role"] == "ADMIN"
+
+
+def test_decode_access_token_caches_claims_and_rechecks_expiry(monkeypatch):
+    token = jwt.encode(
+        {"id": 7, "exp": datetime.now(timezone.utc) + timedelta(minutes=5)},
+        token_utils.SECRET_KEY,
+        algorithm=token_utils.ALGORITHM,
+    )
+    token_utils._decoded_token_cache.clear()
+
+    assert token_utils.decode_access_token(token)["id"] == 7
+
+    def fail_decode(*_args, **_kwargs):
+        raise AssertionError("cached token should not be decoded again")
+
+    monkeypatch.setattr(token_utils.jwt, "decode", fail_decode)
+    assert token_utils.decode_access_token(token)["id"] == 7
+
+    monkeypatch.setattr(token_utils.time, "time", lambda: 2**40)
+    assert token_utils.decode_access_token(token) is None
+
+
+def test_decode_access_token_rejects_bad_signature():
+    token = jwt.encode({"id": 7}, "some-other-secret-key-with-at-least-32-chars", algorithm="HS256")
+
+    assert token_utils.decode_access_token(token) is None
+
+
+@pytest.mark.anyio
+async def test_get_current_user_reuses_decoded_claims(monkeypatch):
+    token = jwt.encode(
+        {"id": 7, "exp": datetime.now(timezone.utc) + timedelta(minutes=5)},
+        token_utils.SECRET_KEY,
+        algorithm=token_utils.ALGORITHM,
+    )
+    token_utils._decoded_token_cache.clear()
+    user = SimpleNamespace(id=7)
+
+    class FakeSession:
+        async def get(self, model, key):
+            return user if key == 7 else None
+
+    assert await token_utils.get_current_user(token=token, session=FakeSession()) is user
+
+    def fail_decode(*_args, **_kwargs):
+        raise AssertionError("cached token should not be decoded again")
+
+    monkeypatch.setattr(token_utils.jwt, "decode", fail_decode)
+    assert await token_utils.get_current_user(token=token, session=FakeSession()) is user
+
+
+@pytest.mark.anyio
+async def test_get_current_user_rejects_invalid_token():
+    with pytest.raises(token_utils.HTTPException) as exc:
+        await token_utils.get_current_user(token="not-a-jwt", session=None)
+
+    assert exc.value.status_code == 401